@@ -0,0 +1,112 @@
+# benchmarks/bench_collisions.py
+"""
+Compara las tres formas de resolver balas contra enemigos:
+pygame.sprite.groupcollide (todos los pares, en Python), la matriz de solapamiento
+vectorizada de EntityStore y la rejilla uniforme (SpatialHash) como broadphase.
+Comprueba que las tres eliminan exactamente las mismas entidades y muestra el punto
+de cruce entre la matriz y la rejilla, que es lo que fija COLLISION_GRID_MIN_PAIRS.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_collisions
+"""
+
+import os
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import numpy as np
+import pygame
+
+from game_logic.settings import SCREEN_WIDTH, SCREEN_HEIGHT, COLLISION_GRID_MIN_PAIRS
+from game_logic.entity_store import EntityStore, KIND_BULLET, KIND_ENEMY
+
+ITERATIONS = 50
+# (balas, enemigos) por escenario: de una partida normal a una pantalla saturada
+SCENARIOS = [(8, 5), (16, 10), (32, 16), (64, 32), (128, 48), (256, 64), (512, 128), (1024, 256)]
+
+
+def make_rects(rng, n_bullets, n_enemies):
+    """Balas y enemigos repartidos por la pantalla con el tamaño real de cada tipo."""
+    bullets = [(int(rng.integers(0, SCREEN_WIDTH)), int(rng.integers(0, SCREEN_HEIGHT)), 4, 15)
+               for _ in range(n_bullets)]
+    enemies = [(int(rng.integers(0, SCREEN_WIDTH - 40)), int(rng.integers(0, SCREEN_HEIGHT - 40)), 40, 40)
+               for _ in range(n_enemies)]
+    return bullets, enemies
+
+
+def run_groupcollide(bullets, enemies):
+    """Camino original: sprites de pygame y groupcollide(bullets, enemies, True, True)."""
+    bullet_group, enemy_group = pygame.sprite.Group(), pygame.sprite.Group()
+    for group, rects in ((bullet_group, bullets), (enemy_group, enemies)):
+        for rect in rects:
+            sprite = pygame.sprite.Sprite()
+            sprite.rect = pygame.Rect(rect)
+            sprite.index = len(group)
+            group.add(sprite)
+
+    start = time.perf_counter()
+    hits = pygame.sprite.groupcollide(bullet_group, enemy_group, True, True)
+    elapsed = time.perf_counter() - start
+
+    killed_bullets = sorted(s.index for s in hits)
+    killed_enemies = sorted({s.index for hit in hits.values() for s in hit})
+    return elapsed, (killed_bullets, killed_enemies)
+
+
+def make_store(bullets, enemies, min_pairs):
+    """EntityStore con las mismas entidades; min_pairs elige el camino de collide_kinds."""
+    store = EntityStore()
+    store.grid_min_pairs = min_pairs
+    for kind, rects in ((KIND_BULLET, bullets), (KIND_ENEMY, enemies)):
+        for x, y, w, h in rects:
+            store.spawn(kind, x, y, w, h)
+    return store
+
+
+def run_store(bullets, enemies, min_pairs):
+    """Tiempo medio de collide_kinds (sin eliminar, para repetir) y resultado de una pasada."""
+    store = make_store(bullets, enemies, min_pairs)
+    store.collide_kinds(KIND_BULLET, KIND_ENEMY)
+
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        killed_bullets, killed_enemies = store.collide_kinds(KIND_BULLET, KIND_ENEMY)
+    elapsed = (time.perf_counter() - start) / ITERATIONS
+
+    # Filas de la tienda -> posición de alta dentro de cada tipo (mismo orden que los sprites)
+    bullet_rows = list(store.alive_indices(KIND_BULLET))
+    enemy_rows = list(store.alive_indices(KIND_ENEMY))
+    result = (sorted(bullet_rows.index(i) for i in killed_bullets),
+              sorted(enemy_rows.index(i) for i in killed_enemies))
+    return elapsed, result
+
+
+def main():
+    rng = np.random.default_rng(0)
+    print(f"{'balas':>6} {'enemigos':>8} {'pares':>7} {'groupcollide ms':>15} "
+          f"{'matriz ms':>10} {'rejilla ms':>10} {'iguales':>8}")
+
+    crossover = None
+    for n_bullets, n_enemies in SCENARIOS:
+        bullets, enemies = make_rects(rng, n_bullets, n_enemies)
+
+        sprite_time = min(run_groupcollide(bullets, enemies)[0] for _ in range(ITERATIONS))
+        _, expected = run_groupcollide(bullets, enemies)
+        dense_time, dense = run_store(bullets, enemies, min_pairs=np.inf)
+        grid_time, grid = run_store(bullets, enemies, min_pairs=0)
+
+        pairs = n_bullets * n_enemies
+        if crossover is None and grid_time < dense_time:
+            crossover = pairs
+
+        print(f"{n_bullets:>6} {n_enemies:>8} {pairs:>7} {sprite_time * 1000:>15.3f} "
+              f"{dense_time * 1000:>10.3f} {grid_time * 1000:>10.3f} "
+              f"{str(dense == expected and grid == expected):>8}")
+
+    print(f"\nLa rejilla es más rápida a partir de ~{crossover} pares "
+          f"(COLLISION_GRID_MIN_PAIRS = {COLLISION_GRID_MIN_PAIRS})")
+
+
+if __name__ == '__main__':
+    main()
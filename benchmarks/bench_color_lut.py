@@ -0,0 +1,70 @@
+# benchmarks/bench_color_lut.py
+"""
+Compara la máscara roja por tabla precalculada (ColorLUT) contra el camino original
+cvtColor(BGR2HSV) + dos inRange + suma.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_color_lut
+"""
+
+import os
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import cv2
+import numpy as np
+
+from game_logic.settings import (
+    CAM_RES_HD, CAM_RES_SD,
+    RED_LOWER_H1, RED_LOWER_H2, RED_UPPER_H1, RED_UPPER_H2, RED_HSV_RANGES
+)
+from game_logic.color_lut import ColorLUT
+
+ITERATIONS = 200
+
+
+def hsv_mask(frame):
+    """Camino original de process_frame."""
+    hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
+    mask1 = cv2.inRange(hsv, RED_LOWER_H1, RED_UPPER_H1)
+    mask2 = cv2.inRange(hsv, RED_LOWER_H2, RED_UPPER_H2)
+    return mask1 + mask2
+
+
+def make_frames(width, height, rng):
+    """Un frame de ruido uniforme (peor caso) y uno tipo cámara: fondo suave, ruido leve y un blob rojo."""
+    noise = rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+
+    scene = cv2.GaussianBlur(noise, (0, 0), 25)
+    scene = cv2.add(scene, rng.integers(0, 20, scene.shape, dtype=np.uint8))
+    cv2.circle(scene, (width // 3, height // 2), height // 12, (20, 20, 220), -1)
+
+    return {'ruido': noise, 'escena': scene}
+
+
+def time_ms(fn, frame):
+    fn(frame)
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        fn(frame)
+    return (time.perf_counter() - start) / ITERATIONS * 1000
+
+
+def main():
+    start = time.perf_counter()
+    lut = ColorLUT(RED_HSV_RANGES)
+    print(f"Construcción de la tabla: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    rng = np.random.default_rng(0)
+    print(f"{'resolución':>10} {'frame':>8} {'hsv ms':>8} {'lut ms':>8} {'speedup':>8} {'coincidencia':>12}")
+    for width, height in (CAM_RES_SD, CAM_RES_HD):
+        for name, frame in make_frames(width, height, rng).items():
+            hsv_ms = time_ms(hsv_mask, frame)
+            lut_ms = time_ms(lut.classify, frame)
+            agreement = np.mean(hsv_mask(frame) == lut.classify(frame)) * 100
+            print(f"{width}x{height:<5} {name:>8} {hsv_ms:8.3f} {lut_ms:8.3f} {hsv_ms / lut_ms:7.2f}x {agreement:11.2f}%")
+
+
+if __name__ == '__main__':
+    main()
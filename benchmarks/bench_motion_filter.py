@@ -0,0 +1,112 @@
+# benchmarks/bench_motion_filter.py
+"""
+Compara los filtros de movimiento del jugador (motion_filter.py) sobre una trayectoria
+sintética de la mano: reposo con temblor, vaivén lento y barridos rápidos, medida a la
+frecuencia de la cámara con ruido, latencia de detección y pérdidas del marcador.
+Para cada filtro se mide, en el momento de dibujo:
+- error medio y p95 respecto a la posición real (retraso + ruido),
+- temblor en reposo (desviación de la X dibujada mientras la mano está quieta),
+- frames sin posición (pérdidas más largas que MOTION_DROPOUT_FILL_S).
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_motion_filter
+    python -m benchmarks.bench_motion_filter --latency-ms 80 --noise-px 5 --dropout 0.1
+"""
+
+import argparse
+import math
+import os
+import random
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import numpy as np
+
+from game_logic.settings import SCREEN_WIDTH, FPS, MOTION_PREDICTION_LEAD_S
+from game_logic.motion_filter import MOTION_FILTERS, create_motion_filter
+
+DURATION_S = 30.0
+CAMERA_HZ = 30.0
+
+
+def hand_x(t):
+    """Posición real de la mano (px de pantalla) en el instante t: ciclos de 10 s."""
+    phase = t % 10.0
+    center = SCREEN_WIDTH / 2
+    if phase < 3.0:  # Quieta
+        return center
+    if phase < 7.0:  # Vaivén lento
+        return center + 0.3 * SCREEN_WIDTH * math.sin(2 * math.pi * (phase - 3.0) / 4.0)
+    # Barrido rápido de ida y vuelta
+    return center + 0.4 * SCREEN_WIDTH * math.sin(math.pi * (phase - 7.0) / 1.5)
+
+
+def is_still(t):
+    return t % 10.0 < 3.0
+
+
+def run_filter(name, args, seed):
+    """Simula cámara + bucle de dibujo con el filtro `name` y retorna sus métricas."""
+    rng = random.Random(seed)
+    motion_filter = create_motion_filter(name)
+    latency = args.latency_ms / 1000
+
+    frame_dt = 1.0 / CAMERA_HZ
+    next_capture = 0.0
+    pending = []  # (momento en que el resultado está listo, x medida, momento de captura)
+    errors, still_x = [], []
+    missing = 0
+
+    for i in range(int(DURATION_S * FPS)):
+        now = i / FPS
+
+        # 1. Capturas de la cámara: el resultado de la detección llega `latency` más tarde
+        while next_capture <= now:
+            measured = None
+            if rng.random() >= args.dropout:
+                measured = hand_x(next_capture) + rng.gauss(0.0, args.noise_px)
+            pending.append((next_capture + latency, measured, next_capture))
+            next_capture += frame_dt
+
+        # 2. Mediciones disponibles en este frame (igual que GameEngine._filter_camera_position)
+        while pending and pending[0][0] <= now:
+            _, measured, captured = pending.pop(0)
+            motion_filter.update(measured, captured)
+
+        # 3. Posición dibujada
+        x = motion_filter.predict(now + MOTION_PREDICTION_LEAD_S)
+        if x is None:
+            missing += 1
+            continue
+        errors.append(abs(x - hand_x(now)))
+        if is_still(now) and is_still(now - 0.5):
+            still_x.append(x)
+
+    errors = np.array(errors)
+    return {
+        'mean_error_px': float(errors.mean()),
+        'p95_error_px': float(np.percentile(errors, 95)),
+        'still_jitter_px': float(np.std(still_x)) if still_x else 0.0,
+        'missing_frames': missing,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de los filtros de movimiento del jugador.")
+    parser.add_argument('--latency-ms', type=float, default=50.0,
+                        help="Latencia de captura + detección (ms)")
+    parser.add_argument('--noise-px', type=float, default=3.0, help="Ruido de la detección (px)")
+    parser.add_argument('--dropout', type=float, default=0.05, help="Probabilidad de perder el marcador")
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"latencia {args.latency_ms:.0f} ms, ruido {args.noise_px:.1f} px, pérdidas {args.dropout:.0%}")
+    print(f"{'filtro':>10} {'err px':>8} {'p95 px':>8} {'temblor px':>11} {'sin pos':>8}")
+    for name in MOTION_FILTERS:
+        r = run_filter(name, args, args.seed)
+        print(f"{name:>10} {r['mean_error_px']:>8.1f} {r['p95_error_px']:>8.1f} "
+              f"{r['still_jitter_px']:>11.2f} {r['missing_frames']:>8}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+# benchmarks/bench_multi_marker.py
+"""
+MultiMarkerDetector (una clasificación de color + componentes conectadas por color) frente al
+detector de un solo marcador (MarkerDetector, contornos, sin ROI) sobre frames sintéticos con
+dos marcadores rojos y uno azul. Mide el tiempo por frame y el error de los centroides.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_multi_marker
+"""
+
+import os
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import cv2
+import numpy as np
+
+from game_logic.settings import CAM_RES_HD, CAM_RES_SD, RED_HSV_RANGES, BLUE_HSV_RANGES
+from game_logic.detection import MarkerDetector, MultiMarkerDetector
+from game_logic.synthetic_frames import SyntheticScene
+
+FRAMES = 240
+BLUE_BGR = (220, 60, 20)
+
+
+def render(scene, index):
+    """Frame con el marcador de la escena, su reflejo (segunda mano) y un marcador azul fijo."""
+    frame, _ = scene.render(index)
+    x, y = scene.marker_center(index)
+    x2 = scene.width - 1 - x
+    if abs(x2 - x) < 3 * scene.radius:
+        x2 = None  # Los dos marcadores se tocan: solo cuenta el de la escena
+    else:
+        cv2.circle(frame, (x2, y), scene.radius, (20, 20, 220), -1)
+    blue = (scene.width // 2, scene.height - 2 * scene.radius)
+    cv2.circle(frame, blue, scene.radius, BLUE_BGR, -1)
+    reds = sorted(v for v in (x, x2) if v is not None)
+    return frame, reds, blue[0]
+
+
+def time_detector(detect, scene, frames):
+    latencies = np.empty(frames)
+    results = []
+    for i in range(frames):
+        frame, reds, blue = render(scene, i)
+        start = time.perf_counter()
+        result = detect(frame)
+        latencies[i] = time.perf_counter() - start
+        results.append((result, reds, blue))
+    return latencies * 1000, results
+
+
+def main():
+    print(f"{'resolución':>10} {'detector':>24} {'p50 ms':>7} {'p95 ms':>7} {'err px':>7} {'aciertos':>8}")
+    for res_name, (width, height), levels in (('SD', CAM_RES_SD, 1), ('HD', CAM_RES_HD, 2)):
+        scene = SyntheticScene(width, height, scenario='blob')
+
+        single = MarkerDetector(roi_tracking=False, pyramid_levels=levels)
+        single.reserve(width, height)
+        ms, results = time_detector(single.detect, scene, FRAMES)
+        errors = [min(abs(x - r) for r in reds) for x, reds, _ in results if x is not None]
+        print(f"{res_name:>10} {'MarkerDetector (1)':>24} {np.percentile(ms, 50):>7.3f} "
+              f"{np.percentile(ms, 95):>7.3f} {np.mean(errors):>7.2f} {len(errors) / FRAMES:>8.1%}")
+
+        multi = MultiMarkerDetector(colors=(("rojo", RED_HSV_RANGES), ("azul", BLUE_HSV_RANGES)),
+                                    max_markers=2, pyramid_levels=levels)
+        multi.reserve(width, height)
+        ms, results = time_detector(multi.detect, scene, FRAMES)
+        errors, hits = [], 0
+        for markers, reds, blue in results:
+            found_reds = sorted(m.cx for m in markers if m.color == 0)
+            found_blue = [m.cx for m in markers if m.color == 1]
+            if len(found_reds) == len(reds) and len(found_blue) == 1:
+                hits += 1
+                errors.extend(abs(f - r) for f, r in zip(found_reds, reds))
+                errors.append(abs(found_blue[0] - blue))
+        print(f"{res_name:>10} {'MultiMarker (2 rojo+azul)':>24} {np.percentile(ms, 50):>7.3f} "
+              f"{np.percentile(ms, 95):>7.3f} {np.mean(errors):>7.2f} {hits / FRAMES:>8.1%}")
+
+
+if __name__ == '__main__':
+    main()
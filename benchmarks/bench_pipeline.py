@@ -0,0 +1,90 @@
+# benchmarks/bench_pipeline.py
+"""
+Bucle completo del juego (captura, detección, simulación, composición) sin cámara:
+GameEngine con una fuente de frames reproducible (escena sintética, vídeo o archivo .npy)
+y la ventana de OpenCV sustituida por una que no dibuja. Arranca la partida desde el menú,
+ejecuta --frames iteraciones y muestra los percentiles por etapa del StageTimer del motor.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_pipeline
+    python -m benchmarks.bench_pipeline --source raw --path sesion.npy --frames 1200
+    python -m benchmarks.bench_pipeline --runner asyncio
+"""
+
+import argparse
+import os
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import cv2
+
+from game_logic.frame_source import FRAME_SOURCES, SyntheticSource, VideoFileSource, RawFileSource, WebcamSource
+from game_logic.game_engine import GameEngine
+
+MENU_FRAMES = 10  # Iteraciones en el menú antes de pulsar ENTER (Jugar)
+
+
+def make_factory(args):
+    def factory():
+        if args.source == 'synthetic':
+            return SyntheticSource(args.scenario, fps=args.fps)
+        if args.source == 'video':
+            return VideoFileSource(args.path, fps=args.fps)
+        if args.source == 'raw':
+            return RawFileSource(args.path, fps=args.fps)
+        return WebcamSource()
+    return factory
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bucle completo del juego con una fuente de frames sin cámara.")
+    parser.add_argument('--source', choices=FRAME_SOURCES, default='synthetic')
+    parser.add_argument('--path', help="Archivo de las fuentes 'video' y 'raw'")
+    parser.add_argument('--scenario', default='blob', help="Escenario de la fuente 'synthetic'")
+    parser.add_argument('--fps', type=float, default=None,
+                        help="Ritmo de la fuente (por defecto el suyo; 0 = sin límite)")
+    parser.add_argument('--frames', type=int, default=600)
+    parser.add_argument('--runner', choices=('loop', 'asyncio'), default='loop',
+                        help="Bucle secuencial o etapas como tareas de asyncio")
+    args = parser.parse_args()
+
+    # La ventana no dibuja; ENTER tras unas iteraciones en el menú empieza la partida
+    keys = [-1] * MENU_FRAMES + [13]
+    cv2.imshow = lambda name, frame: None
+    cv2.waitKey = lambda delay=0: keys.pop(0) if keys else -1
+
+    engine = GameEngine(source_factory=make_factory(args))
+    if engine.stage_timer is None:
+        raise SystemExit("FRAME_TIMING_ENABLED está desactivado en settings")
+
+    # Los dos bucles (y el hilo de presentación) muestran cada frame con show_frame
+    handler = engine.camera_handler
+    show_frame = handler.show_frame
+    frames = [0]
+
+    def counted_show_frame(frame):
+        frames[0] += 1
+        if frames[0] >= args.frames:
+            engine.running = False
+        return show_frame(frame)
+
+    handler.show_frame = counted_show_frame
+
+    start = time.perf_counter()
+    try:
+        engine.run(runner=args.runner)
+    except SystemExit:
+        pass
+    elapsed = time.perf_counter() - start
+
+    print(f"bucle: {args.runner}, fuente: {args.source}, {frames[0]} frames en {elapsed:.2f} s ({frames[0] / elapsed:.1f} fps), "
+          f"puntuación {engine.score}")
+    print(f"{'etapa':>14} {'n':>6} {'media ms':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'máx ms':>8}")
+    for stage, s in engine.stage_timer.summary().items():
+        print(f"{stage:>14} {s['count']:>6} {s['mean_ms']:>9.3f} {s['p50_ms']:>8.3f} "
+              f"{s['p95_ms']:>8.3f} {s['p99_ms']:>8.3f} {s['max_ms']:>8.3f}")
+
+
+if __name__ == '__main__':
+    main()
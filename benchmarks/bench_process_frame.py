@@ -0,0 +1,150 @@
+# benchmarks/bench_process_frame.py
+"""
+Rendimiento y precisión de CameraHandler.process_frame sobre frames sintéticos (SyntheticScene)
+a CAM_RES_SD y CAM_RES_HD, sin cámara: marcador en movimiento, ruido, distractores rojos y
+frames vacíos. Mide frames/s y percentiles de latencia, y compara el centro detectado con
+la verdad conocida.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_process_frame --save base.json
+    python -m benchmarks.bench_process_frame --compare base.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import time
+from types import SimpleNamespace
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import cv2
+import numpy as np
+
+from game_logic.settings import (
+    CAM_RES_HD, CAM_RES_SD, SCREEN_WIDTH, CV_ROI_TRACKING, CV_USE_COLOR_LUT
+)
+from game_logic.camera import CameraHandler
+from game_logic.synthetic_frames import SyntheticScene
+
+FRAMES = 480
+WARMUP_FRAMES = 20
+
+# Error máximo (px de cámara) para contar una detección como correcta
+HIT_TOLERANCE_PX = 3
+
+
+def configure(handler, resolution):
+    """Ajusta el manejador a una resolución de cámara sin abrir la captura."""
+    handler.CAM_WIDTH, handler.CAM_HEIGHT = resolution
+    handler.detector.set_pyramid_levels(2 if resolution == CAM_RES_HD else 1)
+    handler.detector.reserve(*resolution)
+    handler.detector.reset_tracking()
+
+
+def run_scenario(handler, scene, frames):
+    """Ejecuta process_frame sobre `frames` frames de la escena y retorna sus métricas."""
+    to_cam = handler.CAM_WIDTH / SCREEN_WIDTH  # process_frame retorna px de pantalla
+
+    for i in range(WARMUP_FRAMES):
+        handler.process_frame(scene.render(i)[0])
+    handler.detector.reset_tracking()
+
+    latencies = np.empty(frames)
+    errors = []
+    misses = false_positives = 0
+    for i in range(frames):
+        frame, truth_x = scene.render(i)
+
+        start = time.perf_counter()
+        screen_x = handler.process_frame(frame)
+        latencies[i] = time.perf_counter() - start
+
+        if truth_x is None:
+            false_positives += screen_x is not None
+        elif screen_x is None:
+            misses += 1
+        else:
+            # El redondeo a px de pantalla añade como mucho un px de pantalla de error
+            errors.append(abs(screen_x * to_cam - truth_x))
+
+    errors = np.array(errors) if errors else np.zeros(0)
+    latencies_ms = latencies * 1000
+    with_marker = frames if scene.scenario != 'vacio' else 0
+    return {
+        'fps': frames / latencies.sum(),
+        'p50_ms': float(np.percentile(latencies_ms, 50)),
+        'p95_ms': float(np.percentile(latencies_ms, 95)),
+        'p99_ms': float(np.percentile(latencies_ms, 99)),
+        'mean_error_px': float(errors.mean()) if len(errors) else None,
+        'max_error_px': float(errors.max()) if len(errors) else None,
+        'hit_rate': (float(np.count_nonzero(errors <= HIT_TOLERANCE_PX + to_cam)) / with_marker
+                     if with_marker else None),
+        'misses': misses,
+        'false_positives': int(false_positives),
+    }
+
+
+def fmt(value, spec):
+    """Formatea una métrica opcional; None se muestra como '-' con el mismo ancho."""
+    if value is None:
+        return format('-', '>' + spec.split('.')[0])
+    return format(value, spec)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de process_frame con frames sintéticos.")
+    parser.add_argument('--frames', type=int, default=FRAMES)
+    parser.add_argument('--save', help="Guarda los resultados como JSON (línea base)")
+    parser.add_argument('--compare', help="JSON de una línea base anterior para comparar p50 y fps")
+    args = parser.parse_args()
+
+    engine = SimpleNamespace(score=0, running=True)
+    handler = CameraHandler(engine)
+    handler._stop_capture()  # Los frames los genera SyntheticScene
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['results']
+
+    results = {}
+    print(f"{'resolución':>10} {'escenario':>13} {'fps':>8} {'p50 ms':>7} {'p95 ms':>7} {'p99 ms':>7} "
+          f"{'err px':>7} {'max px':>7} {'aciertos':>8} {'fallos':>6} {'f.pos':>5}  {'vs base':>8}")
+    for res_name, resolution in (('SD', CAM_RES_SD), ('HD', CAM_RES_HD)):
+        configure(handler, resolution)
+        for scenario in SyntheticScene.SCENARIOS:
+            scene = SyntheticScene(*resolution, scenario=scenario)
+            key = f"{res_name}/{scenario}"
+            r = results[key] = run_scenario(handler, scene, args.frames)
+
+            change = ''
+            if baseline and key in baseline:
+                change = f"{r['p50_ms'] / baseline[key]['p50_ms']:.2f}x"
+            print(f"{res_name:>10} {scenario:>13} {r['fps']:>8.0f} {r['p50_ms']:>7.3f} {r['p95_ms']:>7.3f} "
+                  f"{r['p99_ms']:>7.3f} {fmt(r['mean_error_px'], '7.2f')} {fmt(r['max_error_px'], '7.2f')} "
+                  f"{fmt(r['hit_rate'], '8.1%')} {r['misses']:>6} {r['false_positives']:>5}  {change:>8}")
+
+    handler.release_resources()
+
+    if args.save:
+        report = {
+            'config': {
+                'frames': args.frames,
+                'roi_tracking': CV_ROI_TRACKING,
+                'color_lut': CV_USE_COLOR_LUT,
+                'opencv': cv2.__version__,
+                'numpy': np.__version__,
+                'python': platform.python_version(),
+                'machine': platform.machine(),
+            },
+            'results': results,
+        }
+        with open(args.save, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Resultados guardados en {args.save}")
+
+
+if __name__ == '__main__':
+    main()
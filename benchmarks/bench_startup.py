@@ -0,0 +1,110 @@
+# benchmarks/bench_startup.py
+"""
+Tiempo de arranque del juego, medido en procesos nuevos (importaciones en frío):
+importación de game_logic, construcción de GameEngine, primer frame en la ventana
+(el menú, aunque la cámara aún no haya entregado nada) y primer frame de la cámara.
+La ventana de OpenCV se sustituye por una que solo anota el momento de cada imshow.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_startup --runs 5 --save startup.json
+    python -m benchmarks.bench_startup --compare startup.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# Proceso hijo: arranca el juego como main.py e imprime sus marcas de tiempo en JSON
+CHILD = r'''
+import json, os, sys, time
+t0 = time.perf_counter()
+os.environ['SDL_VIDEODRIVER'] = 'dummy'
+
+import cv2
+marks = {}
+deadline = [None]
+
+def imshow(name, frame):
+    now = time.perf_counter()
+    marks.setdefault('first_frame', now)
+    handler = engine.camera_handler
+    if handler.current_frame is not None:
+        marks.setdefault('first_camera_frame', now)
+    status = getattr(handler.capture_thread, 'status', 'failed')
+    if 'first_camera_frame' in marks or status == 'failed' or now > deadline[0]:
+        engine.running = False
+
+cv2.imshow = imshow
+cv2.waitKey = lambda delay=0: -1
+
+from game_logic.game_engine import GameEngine
+marks['import'] = time.perf_counter()
+engine = GameEngine()
+marks['engine'] = time.perf_counter()
+deadline[0] = marks['engine'] + float(sys.argv[1])
+try:
+    engine.run()
+except SystemExit:
+    pass
+print('STARTUP ' + json.dumps({k: (v - t0) * 1000 for k, v in marks.items()}))
+'''
+
+STAGES = ('import', 'engine', 'first_frame', 'first_camera_frame')
+
+
+def run_once(camera_timeout):
+    """Lanza un proceso y retorna sus marcas (ms desde el inicio del intérprete) y el tiempo total."""
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, '-c', CHILD, str(camera_timeout)],
+                            capture_output=True, text=True, cwd=os.getcwd(),
+                            timeout=camera_timeout + 60)
+    wall = (time.perf_counter() - start) * 1000
+    for line in result.stdout.splitlines():
+        if line.startswith('STARTUP '):
+            marks = json.loads(line[len('STARTUP '):])
+            marks['process'] = wall
+            return marks
+    raise RuntimeError(f"El proceso de arranque falló:\n{result.stderr}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tiempo de arranque (importación y primer frame).")
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--camera-timeout', type=float, default=5.0,
+                        help="Segundos máximos esperando el primer frame de la cámara")
+    parser.add_argument('--save', help="Guarda las medianas como JSON")
+    parser.add_argument('--compare', help="JSON guardado anteriormente para comparar")
+    args = parser.parse_args()
+
+    runs = [run_once(args.camera_timeout) for _ in range(args.runs)]
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['median_ms']
+
+    medians = {}
+    print(f"{'etapa':>20} {'mediana ms':>11} {'mín ms':>8} {'máx ms':>8}  {'vs base':>8}")
+    for stage in STAGES + ('process',):
+        values = [run[stage] for run in runs if stage in run]
+        if not values:
+            print(f"{stage:>20} {'-':>11}")
+            continue
+        medians[stage] = statistics.median(values)
+        change = ''
+        if baseline and stage in baseline:
+            change = f"{medians[stage] / baseline[stage]:.2f}x"
+        print(f"{stage:>20} {medians[stage]:>11.1f} {min(values):>8.1f} {max(values):>8.1f}  {change:>8}")
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({'runs': args.runs, 'median_ms': medians, 'samples': runs}, f, indent=2)
+        print(f"Resultados guardados en {args.save}")
+
+
+if __name__ == '__main__':
+    main()
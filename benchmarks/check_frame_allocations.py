@@ -0,0 +1,98 @@
+# benchmarks/check_frame_allocations.py
+"""
+Verifica que el camino por frame de la cámara y del menú (captura -> detección -> composición)
+no asigne búferes del tamaño de un frame. Usa tracemalloc, que registra las asignaciones
+de NumPy y de los arrays que devuelve OpenCV.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.check_frame_allocations
+
+Termina con código 1 si algún frame asigna más de MAX_BYTES_PER_FRAME.
+"""
+
+import os
+import sys
+import tracemalloc
+from types import SimpleNamespace
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import cv2
+import numpy as np
+
+from game_logic.camera import CameraHandler
+from game_logic.menu import GameMenu
+
+WARMUP_FRAMES = 20
+MEASURED_FRAMES = 200
+
+# Contornos, momentos y tuplas pequeñas siguen asignando memoria; un frame HD ocupa 2.7 MB.
+MAX_BYTES_PER_FRAME = 64 * 1024
+
+
+def make_frames(width, height, count=8):
+    """Frames sintéticos con un blob rojo que se desplaza horizontalmente."""
+    rng = np.random.default_rng(0)
+    frames = []
+    for i in range(count):
+        frame = rng.integers(40, 90, (height, width, 3), dtype=np.uint8)
+        center_x = width // 4 + i * width // (2 * count)
+        cv2.circle(frame, (center_x, height // 2), height // 12, (20, 20, 220), -1)
+        frames.append(frame)
+    return frames
+
+
+def measure(handler, frames, render_list, count):
+    """Ejecuta `count` frames y retorna el pico de memoria asignada por frame (bytes)."""
+    mailbox = handler.mailbox
+    worst = 0
+    for i in range(count):
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+
+        # Lo mismo que hace el hilo de captura, seguido del trabajo del bucle principal
+        frame = cv2.flip(frames[i % len(frames)], 1, dst=mailbox.writable())
+        mailbox.put(frame, 0.0)
+        handler.get_position()
+        handler.compose_frame(render_list)
+
+        _, peak = tracemalloc.get_traced_memory()
+        worst = max(worst, peak - before)
+    return worst
+
+
+def main():
+    engine = SimpleNamespace(score=0, running=True)
+    engine.menu = GameMenu(engine)
+
+    handler = CameraHandler(engine)
+    handler._stop_capture()  # Los frames se inyectan a mano en el buzón
+
+    frames = make_frames(handler.CAM_WIDTH, handler.CAM_HEIGHT)
+    render_list = (
+        np.array([(100 + 60 * i, 200, 40, 40) for i in range(10)], dtype=np.int32),
+        np.array([(255, 0, 0)] * 10, dtype=np.uint8),
+    )
+
+    results = {}
+    tracemalloc.start()
+    for state in ("MENU", "OPTIONS", "GAME_OVER", "PLAYING"):
+        engine.menu.current_state = state
+        measure(handler, frames, render_list, WARMUP_FRAMES)
+        results[state] = measure(handler, frames, render_list, MEASURED_FRAMES)
+    tracemalloc.stop()
+
+    frame_bytes = handler.CAM_WIDTH * handler.CAM_HEIGHT * 3
+    print(f"Cámara {handler.CAM_WIDTH}x{handler.CAM_HEIGHT} (frame = {frame_bytes} bytes)")
+    failed = False
+    for state, worst in results.items():
+        status = "OK" if worst <= MAX_BYTES_PER_FRAME else "FALLO"
+        failed = failed or worst > MAX_BYTES_PER_FRAME
+        print(f"{state:>10}: pico por frame {worst:>9} bytes  [{status}]")
+
+    handler.release_resources()
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,219 @@
+# game_logic/async_runner.py
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pygame
+
+from .settings import (
+    SIM_HZ, ASYNC_CAPTURE_HZ, ASYNC_EVENTS_HZ, ASYNC_PRESENT_HZ,
+    ASYNC_DETECTION_QUEUE, ASYNC_SHUTDOWN_TIMEOUT_S
+)
+from .telemetry import telemetry
+
+
+class _Rate:
+    """Ritmo fijo de una tarea: espera hasta el siguiente periodo sin ráfagas para recuperar retraso."""
+
+    def __init__(self, hz):
+        self.period = 1.0 / hz
+        self._next_time = None
+
+    async def wait(self):
+        now = time.perf_counter()
+        if self._next_time is not None and now < self._next_time:
+            await asyncio.sleep(self._next_time - now)
+            now = self._next_time
+        else:
+            await asyncio.sleep(0)  # Con retraso también se cede el turno a las demás tareas
+        self._next_time = now + self.period
+
+
+def _put_latest(queue, item):
+    """Encola sin esperar; si la cola está llena descarta el elemento más antiguo. Retorna el descartado."""
+    dropped = None
+    if queue.full():
+        dropped = queue.get_nowait()
+    queue.put_nowait(item)
+    return dropped
+
+
+class AsyncGameRunner:
+    """
+    Alternativa a GameEngine._run_loop (ENGINE_RUNNER = "asyncio"): cada etapa del bucle es una
+    tarea de asyncio con su propio ritmo, de modo que una etapa lenta no frena a las demás.
+
+        eventos      pygame.event.pump/get a ASYNC_EVENTS_HZ (Pygame exige el hilo principal)
+        captura      toma el último frame del buzón a ASYNC_CAPTURE_HZ y lo pasa a la detección
+        detección    process_frame en un ejecutor de un hilo, frame a frame desde su cola
+        simulación   filtro de movimiento + ticks de paso fijo a SIM_HZ; publica la lista de dibujo
+        ventana      composición, y imshow/waitKey en otro ejecutor de un hilo (o en el hilo de
+                     presentación si CV_PRESENTER_THREAD), a ASYNC_PRESENT_HZ
+
+    Las tareas se comunican por colas acotadas que descartan lo más antiguo: la detección
+    recibe copias de los frames (el buzón recicla su búfer de lectura en la siguiente consulta)
+    y la ventana solo la última lista de dibujo. Todo el estado del juego se toca desde el hilo
+    del bucle; los ejecutores solo ejecutan las llamadas bloqueantes de OpenCV. Con el proceso
+    de detección (CV_DETECTION_WORKER) la tarea de captura envía los frames directamente, ya
+    que enviarlos no bloquea.
+
+    La ventana se maneja siempre desde el mismo hilo del ejecutor (HighGUI no admite
+    alternar hilos; en macOS solo funciona desde el hilo principal, ahí usar "loop").
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.handler = engine.camera_handler
+        self.timer = engine.stage_timer
+        self._detect_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='detection')
+        self._window_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='window')
+        self._free_buffers = []   # Copias de frames libres para la cola de detección
+        self._detect_seconds = 0.0  # Duración de la última detección (para el regulador de calidad)
+        self.frames_dropped = 0     # Frames descartados en la cola de detección
+        self.detections_stale = 0   # Detecciones descartadas por un cambio de cámara
+
+    def run(self):
+        """Ejecuta las tareas hasta que el motor se detiene y espera a los ejecutores."""
+        try:
+            asyncio.run(self._main())
+        finally:
+            # Las llamadas ya en curso (una detección, un imshow) terminan; las pendientes se cancelan
+            self._detect_executor.shutdown(wait=True, cancel_futures=True)
+            self._window_executor.shutdown(wait=True, cancel_futures=True)
+            telemetry.info('engine.stats', "Bucle asyncio: {dropped} frames descartados antes de la "
+                           "detección, {stale} detecciones descartadas por cambio de cámara",
+                           dropped=self.frames_dropped, stale=self.detections_stale)
+
+    async def _main(self):
+        self._detections = asyncio.Queue(ASYNC_DETECTION_QUEUE)
+        self._renders = asyncio.Queue(1)
+
+        tasks = [asyncio.create_task(coro, name=name) for name, coro in (
+            ('eventos', self._events_task()),
+            ('captura', self._capture_task()),
+            ('deteccion', self._detection_task()),
+            ('simulacion', self._simulation_task()),
+            ('ventana', self._present_task()),
+        )]
+        try:
+            # Las tareas terminan cuando el motor deja de correr ('q', QUIT, menú) o si una falla
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            self.engine.running = False
+            for task in tasks:
+                task.cancel()
+            await asyncio.wait(tasks, timeout=ASYNC_SHUTDOWN_TIMEOUT_S)
+
+        for task in done:
+            if not task.cancelled() and task.exception() is not None:
+                raise task.exception()
+
+    def _record(self, stage, start):
+        if self.timer is not None:
+            self.timer.record(stage, time.perf_counter() - start)
+
+    # ----------------------------------------------------
+    # TAREAS
+    # ----------------------------------------------------
+
+    async def _events_task(self):
+        rate = _Rate(ASYNC_EVENTS_HZ)
+        while self.engine.running:
+            await rate.wait()
+            start = time.perf_counter()
+            pygame.event.pump()
+            self.engine._handle_pygame_events()
+            self._record('eventos', start)
+
+    async def _capture_task(self):
+        handler = self.handler
+        rate = _Rate(ASYNC_CAPTURE_HZ)
+        while self.engine.running:
+            await rate.wait()
+            start = time.perf_counter()
+            taken = handler.take_frame()
+            if taken is None:
+                continue
+
+            if handler.detects_in_worker:
+                handler.detect_frame(*taken)
+            else:
+                frame, _, capture_time = taken
+                buffer = self._frame_buffer(frame)
+                np.copyto(buffer, frame)
+                # take_frame ya instaló la captura del frame: su buzón es el actual
+                dropped = _put_latest(self._detections, (buffer, capture_time, handler.mailbox))
+                if dropped is not None:
+                    self._free_buffers.append(dropped[0])
+                    self.frames_dropped += 1
+            self._record('captura', start)
+
+    def _frame_buffer(self, frame):
+        """Copia libre del tamaño del frame (solo se asignan de nuevo al cambiar de resolución)."""
+        while self._free_buffers:
+            buffer = self._free_buffers.pop()
+            if buffer.shape == frame.shape:
+                return buffer
+        return np.empty_like(frame)
+
+    async def _detection_task(self):
+        handler = self.handler
+        loop = asyncio.get_running_loop()
+        while self.engine.running:
+            buffer, capture_time, mailbox = await self._detections.get()
+            start = time.perf_counter()
+            try:
+                screen_x = await loop.run_in_executor(self._detect_executor, handler.process_frame, buffer)
+            finally:
+                self._free_buffers.append(buffer)
+            self._detect_seconds = time.perf_counter() - start
+            self._record('process_frame', start)
+
+            if not handler.apply_detection(screen_x, capture_time, mailbox):
+                self.detections_stale += 1
+
+    async def _simulation_task(self):
+        engine = self.engine
+        rate = _Rate(SIM_HZ)
+        while engine.running:
+            await rate.wait()
+            start = time.perf_counter()
+            player_x = engine._filter_camera_position(self.handler.last_position)
+            engine._process_camera_data(player_x)
+
+            alpha = engine._advance_simulation(engine.time_source())
+            self._record('simulacion', start)
+
+            start = time.perf_counter()
+            _put_latest(self._renders, engine.get_render_list(alpha))
+            self._record('render_list', start)
+
+    async def _present_task(self):
+        engine, handler = self.engine, self.handler
+        loop = asyncio.get_running_loop()
+        rate = _Rate(ASYNC_PRESENT_HZ)
+        while engine.running:
+            await rate.wait()
+            render_list = await self._renders.get()
+
+            start = time.perf_counter()
+            if handler.use_presenter:
+                # El hilo de presentación es dueño de la ventana: draw_window solo compone y entrega
+                key = handler.draw_window(render_list)
+            else:
+                frame = handler.compose_frame(render_list)
+                self._record('overlay', start)
+                key = None
+                if frame is not None:
+                    # El frame compuesto es del pool de la cámara; no se vuelve a componer hasta que
+                    # termine imshow, así que el ejecutor puede leerlo sin copia
+                    key = await loop.run_in_executor(self._window_executor, handler.show_frame, frame)
+                handler.handle_key(key)
+            busy = time.perf_counter() - start
+
+            engine._handle_window_keys(key)
+
+            # Las etapas corren en paralelo: el regulador de calidad atiende a la más lenta
+            handler.report_frame_time(max(busy, self._detect_seconds))
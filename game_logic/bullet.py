@@ -1,68 +1,49 @@
 # game_logic/bullet.py
 
-import pygame
-# CRÍTICO: Importar todas las constantes necesarias: 
-# - RED y YELLOW (Colores)
-# - BULLET_SPEED (Velocidad de movimiento)
-# - SCREEN_HEIGHT (Límite para eliminar balas que salen por abajo)
-from .settings import YELLOW, BULLET_SPEED, SCREEN_HEIGHT, RED 
+# CRÍTICO: Importar todas las constantes necesarias:
+# - BULLET_SPEED (Velocidad de movimiento) y SIM_SPEED_SCALE (px por tick a SIM_HZ)
+# El movimiento y la eliminación al salir de pantalla los hace EntityStore.step()
+from .settings import BULLET_SPEED, SIM_SPEED_SCALE
+from .entity_store import StoreEntity, KIND_BULLET, KIND_ENEMY_BULLET
 
 # =================================================================
 # 1. Clase Bullet (DISPARO DEL JUGADOR)
 # =================================================================
-class Bullet(pygame.sprite.Sprite):
-    
+class Bullet(StoreEntity):
+    """Manejador de un disparo del jugador dentro del EntityStore. Se mueve hacia arriba."""
+
+    KIND = KIND_BULLET
+
     def __init__(self, x, y):
-        # Llama al constructor de Pygame Sprite
-        super().__init__()
-        
-        # 1. Componente de Visualización
-        self.image = pygame.Surface([4, 15]) 
-        self.image.fill(YELLOW)             # Color Amarillo
-        
-        # 2. Componente de Colisión y Posición
-        self.rect = self.image.get_rect()
-        self.rect.centerx = x
-        self.rect.bottom = y # Inicia desde abajo del jugador
-        
-        # 3. Movimiento
-        self.speed = BULLET_SPEED
+        # 1. Componente de Colisión y Movimiento (4x15, hacia arriba: resta en 'y')
+        super().__init__(4, 15, vy=-BULLET_SPEED * SIM_SPEED_SCALE)
 
-    def update(self):
-        """Mueve el disparo del jugador hacia arriba y lo elimina si sale de la pantalla."""
-        # Mover hacia arriba (resta en 'y')
-        self.rect.y -= self.speed 
-        
-        # Eliminar si sale por el borde superior
-        if self.rect.bottom < 0:
-            self.kill()
+        # 2. Posición
+        self.place(x, y)
+
+    def place(self, x, y):
+        """Posición inicial (también al reutilizarla desde el EntityPool)."""
+        self._rect.centerx = x
+        self._rect.bottom = y # Inicia desde abajo del jugador
 
 
 # =================================================================
 # 2. Clase EnemyBullet (DISPARO DEL ENEMIGO) - Añadida desde HEAD
 # =================================================================
-class EnemyBullet(pygame.sprite.Sprite):
-    
+class EnemyBullet(StoreEntity):
+    """Manejador de un disparo enemigo dentro del EntityStore. Se mueve hacia abajo."""
+
+    KIND = KIND_ENEMY_BULLET
+
     def __init__(self, x, y):
-        super().__init__()
-        
-        # 1. Componente de Visualización
-        self.image = pygame.Surface([4, 10]) # Ligeramente más pequeña que la del jugador
-        self.image.fill(RED)                # Color Rojo
-        
-        # 2. Componente de Colisión y Posición
-        self.rect = self.image.get_rect()
-        self.rect.centerx = x
-        self.rect.top = y # Posición inicial: sale del 'bottom' del enemigo
-        
-        # 3. Movimiento
-        self.speed = BULLET_SPEED # Usamos la misma velocidad por simplicidad
-    
-    def update(self):
-        """Mueve el disparo del enemigo hacia abajo y lo elimina si sale de la pantalla."""
-        # Mover hacia abajo (suma en 'y')
-        self.rect.y += self.speed
-        
-        # Eliminar si sale por el borde inferior
-        if self.rect.top > SCREEN_HEIGHT:
-            self.kill()
\ No newline at end of file
+        # 1. Componente de Colisión y Movimiento (ligeramente más pequeña que la del jugador)
+        # Usamos la misma velocidad por simplicidad
+        super().__init__(4, 10, vy=BULLET_SPEED * SIM_SPEED_SCALE)
+
+        # 2. Posición inicial: sale del 'bottom' del enemigo
+        self.place(x, y)
+
+    def place(self, x, y):
+        """Posición inicial (también al reutilizarla desde el EntityPool)."""
+        self._rect.centerx = x
+        self._rect.top = y
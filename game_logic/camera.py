@@ -1,21 +1,58 @@
 # game_logic/camera.py
 
+import threading
+import time
+
 import cv2
 import numpy as np
 
 # Importación de constantes
 from .settings import (
     CAM_BASE_WIDTH, CAM_BASE_HEIGHT, CAM_OPTIONS, # <-- Nuevas constantes de configuración
-    RED_LOWER_H1, RED_LOWER_H2, 
-    RED_UPPER_H1, RED_UPPER_H2, 
-    SCREEN_WIDTH, SCREEN_HEIGHT # SCREEN_WIDTH/HEIGHT son las globales iniciales
+    CAM_DETECTION_LEVELS, CAM_BASE_DETECTION_LEVELS,
+    SCREEN_WIDTH, SCREEN_HEIGHT, # SCREEN_WIDTH/HEIGHT son las globales iniciales
+    CAM_SWAP_TIMEOUT_S, CV_DETECTION_WORKER,
+    FRAME_TIMING_HUD, FRAME_TIMING_HUD_REFRESH, QUALITY_GOVERNOR_ENABLED, CV_MULTI_MARKER,
+    CV_PRESENTER_THREAD
 )
+from .capture import LatestFrameMailbox, CaptureThread
+from .detection import MarkerDetector, MultiMarkerDetector
+from .frame_pool import FramePool
+from .frame_source import create_frame_source
+from .presenter import PresenterThread
+from .quality_governor import QualityGovernor
+from .telemetry import telemetry
+
+# Momentos de captura recordados para los frames en vuelo hacia el proceso de detección
+FRAME_TIME_SLOTS = 8
+
+class _PendingCapture:
+    """Captura nueva que se está abriendo en segundo plano (cambio de resolución en caliente)."""
+
+    def __init__(self, thread, mailbox, frame_pool, cam_size, pyramid_levels):
+        self.thread = thread
+        self.mailbox = mailbox
+        self.frame_pool = frame_pool
+        self.cam_size = cam_size
+        self.pyramid_levels = pyramid_levels
+        self.started = time.perf_counter()
+
 
 class CameraHandler:
     
-    def __init__(self, game_engine):
+    def __init__(self, game_engine, source_factory=None):
+        """
+        source_factory: función sin argumentos que crea la FrameSource de cada captura
+        (por defecto create_frame_source, según FRAME_SOURCE en settings).
+        """
         self.game_engine = game_engine 
-        self.cap = None
+        self.source_factory = source_factory or create_frame_source
+        self.capture_thread = None
+        self.mailbox = None
+
+        # Captura que sustituirá a la actual en cuanto entregue su primer frame
+        self._pending_capture = None
+        self._screen_size = (SCREEN_WIDTH, SCREEN_HEIGHT)
         
         # 1. Variables de instancia para las dimensiones de la cámara
         self.CAM_WIDTH = CAM_BASE_WIDTH 
@@ -26,6 +63,56 @@ class CameraHandler:
         
         self.current_frame = None
 
+        # Búferes de frame preasignados (se dimensionan en reconfigure_camera)
+        self.frame_pool = None
+
+        # Hilo dueño de la ventana (se crea con el primer frame a mostrar; ver draw_window)
+        self.use_presenter = CV_PRESENTER_THREAD
+        self.presenter = None
+
+        # Detector del marcador rojo (con seguimiento por ROI)
+        self.detector = MarkerDetector()
+
+        # Modo multimarcador (opcional): todos los marcadores en una pasada; el jugador sigue
+        # al mayor del primer color y la lista completa queda en `markers` (px de cámara)
+        self.multi_detector = MultiMarkerDetector() if CV_MULTI_MARKER else None
+        self.markers = []
+
+        # Proceso de detección opcional (se crea con el primer frame, cuando se conoce su tamaño)
+        self.use_detection_worker = CV_DETECTION_WORKER
+        self.detection_worker = None
+
+        # Con el bucle asyncio la detección corre en otro hilo: este cerrojo evita cambiar los
+        # niveles o el seguimiento del detector a mitad de una detección (sin contención en el
+        # bucle normal)
+        self._detector_lock = threading.Lock()
+
+        # Último frame procesado (para no repetir la detección sobre el mismo frame)
+        self._last_seq = 0
+        self._last_screen_x = None
+
+        # Última medición para el filtro de movimiento: contador de mediciones nuevas y
+        # momento de captura de su frame (perf_counter). Los momentos de los frames enviados
+        # al proceso de detección se guardan por seq porque su resultado llega más tarde.
+        self.measurement_count = 0
+        self.measurement_time = None
+        self._frame_times = [(0, None)] * FRAME_TIME_SLOTS
+
+        # Tiempos por etapa (StageTimer del motor, si lo tiene) y HUD opcional con sus percentiles
+        self.stage_timer = getattr(game_engine, 'stage_timer', None)
+
+        # Regulador de calidad: escala y frecuencia de la detección y resolución de captura
+        # según el tiempo de trabajo por frame (ver report_frame_time)
+        self.quality_governor = QualityGovernor() if QUALITY_GOVERNOR_ENABLED else None
+        self.detection_stride = 1  # Detectar en uno de cada N frames nuevos
+        self._stride_count = 0
+
+        # Grabación de la sesión (SessionRecorder del motor, si lo tiene)
+        self.session_recorder = getattr(game_engine, 'session_recorder', None)
+        self.show_timing_hud = FRAME_TIMING_HUD
+        self._hud_lines = []
+        self._hud_age = FRAME_TIMING_HUD_REFRESH
+
         # 2. Configuración inicial de la cámara, usando la resolución de pantalla inicial
         # Esto calcula CAM_WIDTH/HEIGHT y abre la captura.
         self.reconfigure_camera(SCREEN_WIDTH, SCREEN_HEIGHT)
@@ -37,122 +124,533 @@ class CameraHandler:
 
     def reconfigure_camera(self, new_screen_width, new_screen_height):
         """
-        Calcula las nuevas dimensiones internas de la cámara según la resolución de pantalla,
-        ajusta los factores de escala y reinicia la captura de video.
+        Calcula las nuevas dimensiones internas de la cámara según la resolución de pantalla
+        y abre una captura nueva en segundo plano, sin bloquear el bucle del juego.
+        La captura actual sigue entregando frames; el cambio (dimensiones, búferes, detector)
+        se hace de una vez cuando la nueva entrega su primer frame (ver _poll_pending_capture).
+        La primera vez no hay captura anterior y se instala directamente.
         """
         # 1. Obtener la nueva resolución de la cámara (CAM_WIDTH, CAM_HEIGHT)
         screen_size_tuple = (new_screen_width, new_screen_height)
         
         # Buscar el mapeo en CAM_OPTIONS. Si no se encuentra, usar los valores base.
         new_cam_size = CAM_OPTIONS.get(screen_size_tuple, (CAM_BASE_WIDTH, CAM_BASE_HEIGHT))
-        
-        self.CAM_WIDTH = new_cam_size[0]
-        self.CAM_HEIGHT = new_cam_size[1]
-        
-        # 2. Reiniciar la captura de video con las nuevas dimensiones
-        if self.cap and self.cap.isOpened():
-            self.cap.release()
-            
-        self.cap = cv2.VideoCapture(0)
-        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.CAM_WIDTH)
-        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.CAM_HEIGHT)
-        
-        # 3. Actualizar los factores de escala (Conversión de CAM -> SCREEN)
-        self.SCALE_FACTOR_X = self.CAM_WIDTH / new_screen_width
-        self.SCALE_FACTOR_Y = self.CAM_HEIGHT / new_screen_height
 
-        print(f"Cámara reconfigurada a: {self.CAM_WIDTH}x{self.CAM_HEIGHT}")
+        # Niveles de pirámide de la detección para esta entrada de CAM_OPTIONS
+        pyramid_levels = CAM_DETECTION_LEVELS.get(screen_size_tuple, CAM_BASE_DETECTION_LEVELS)
+
+        # El regulador de calidad parte del escalón más alto para esta pantalla
+        self.detection_stride = 1
+        if self.quality_governor is not None:
+            self.quality_governor.reset(new_cam_size, pyramid_levels)
+
+        # 2. Los sprites ya usan la pantalla nueva: los factores de escala se recalculan con la
+        # cámara que esté entregando frames en cada momento (la anterior hasta el cambio).
+        self._screen_size = screen_size_tuple
+        self._open_capture(new_cam_size, pyramid_levels)
+
+    def _open_capture(self, new_cam_size, pyramid_levels):
+        """
+        Abre una captura a new_cam_size con sus propios búferes (captura en triple búfer y
+        composición). Se instala ya si no hay captura; si no, queda pendiente.
+        """
+        # Un cambio anterior que aún no entregó frames queda sustituido por este
+        self._cancel_pending_capture()
+
+        frame_pool = FramePool(*new_cam_size, present_buffers=3 if self.use_presenter else 0)
+        recorder = None
+        if self.session_recorder is not None:
+            recorder = self.session_recorder.frame_recorder(*new_cam_size)
+        mailbox = LatestFrameMailbox(frame_pool.capture)
+        thread = CaptureThread(self.source_factory(), new_cam_size[0], new_cam_size[1], mailbox,
+                               raw_buffer=frame_pool.raw, stage_timer=self.stage_timer,
+                               predecessor=self.capture_thread, recorder=recorder)
+        thread.start()
+        pending = _PendingCapture(thread, mailbox, frame_pool, new_cam_size, pyramid_levels)
+
+        if self.capture_thread is None:
+            self._install_capture(pending)
+        else:
+            self._pending_capture = pending
+            self._update_scale_factors()
+            telemetry.info('camera.config', "Abriendo cámara a {width}x{height} en segundo plano",
+                           width=new_cam_size[0], height=new_cam_size[1])
+
+    def _update_scale_factors(self):
+        """Factores de conversión CAM -> SCREEN con la cámara activa y la pantalla actual."""
+        screen_width, screen_height = self._screen_size
+        self.SCALE_FACTOR_X = self.CAM_WIDTH / screen_width
+        self.SCALE_FACTOR_Y = self.CAM_HEIGHT / screen_height
+
+    def _install_capture(self, pending):
+        """Cambia de golpe a la captura nueva: dimensiones, búferes, detector y factores de escala."""
+        previous = self.capture_thread
+        self._pending_capture = None
+
+        self.CAM_WIDTH, self.CAM_HEIGHT = pending.cam_size
+        self._set_detection_levels(pending.pyramid_levels)
+        self._stop_detection_worker()
+
+        self.frame_pool = pending.frame_pool
+        self.mailbox = pending.mailbox
+        if self.presenter is not None:
+            self.presenter.set_buffers(self.frame_pool.present)
+        self.capture_thread = pending.thread
+
+        self.current_frame = None
+        self._last_seq = 0
+        self._last_screen_x = None
+        self.markers = []
+        with self._detector_lock:
+            self.detector.reset_tracking()
+        self._update_scale_factors()
+
+        # La captura anterior libera la cámara en su propio hilo
+        if previous is not None:
+            previous.stop(wait=False)
+
+        telemetry.info('camera.config', "Cámara reconfigurada a: {width}x{height} (pirámide: {levels} niveles)",
+                       width=self.CAM_WIDTH, height=self.CAM_HEIGHT, levels=self.detector.pyramid_levels)
+
+    def _poll_pending_capture(self):
+        """
+        Llamado en cada frame: instala la captura pendiente en cuanto tiene un frame,
+        o la descarta si falló o tarda más de CAM_SWAP_TIMEOUT_S (se sigue con la actual).
+        Si la captura actual ya no está viva (la nueva la detuvo para liberar el dispositivo),
+        no hay nada que mantener: se reabre a la resolución actual, reintentando cada
+        CAM_SWAP_TIMEOUT_S hasta que entregue frames.
+        """
+        pending = self._pending_capture
+        if pending is None:
+            return
+
+        if pending.mailbox.frames_captured > 0:
+            self._install_capture(pending)
+            return
+
+        current = self.capture_thread
+        current_alive = (current is not None and current.is_alive() and
+                         not pending.thread.stopped_predecessor)
+        failed = pending.thread.status == 'failed'
+        expired = time.perf_counter() - pending.started > CAM_SWAP_TIMEOUT_S
+        # Sin captura viva se espera siempre al plazo: una apertura fallida no se reintenta en cada frame
+        if not (expired or (failed and current_alive)):
+            return
+
+        self._cancel_pending_capture()
+        self._sync_quality_with_capture()
+        current_size = f"{self.CAM_WIDTH}x{self.CAM_HEIGHT}"
+        if current_alive:
+            telemetry.warning('camera.config', "La cámara a {width}x{height} no entregó frames; se mantiene {current}",
+                              width=pending.cam_size[0], height=pending.cam_size[1], current=current_size)
+        else:
+            telemetry.warning('camera.config', "La cámara a {width}x{height} no entregó frames y la captura a "
+                              "{current} ya está detenida; se reabre a {current}",
+                              width=pending.cam_size[0], height=pending.cam_size[1], current=current_size)
+            self._open_capture((self.CAM_WIDTH, self.CAM_HEIGHT), self.detector.pyramid_levels)
+
+    def _sync_quality_with_capture(self):
+        """
+        Tras cancelar un cambio de resolución, el regulador vuelve al escalón de la cámara que
+        sigue instalada; si no, cada nuevo descenso reintentaría abrir la resolución fallida.
+        """
+        governor = self.quality_governor
+        cam_size = (self.CAM_WIDTH, self.CAM_HEIGHT)
+        if governor is None or governor.current.cam_size == cam_size:
+            return
+        if not governor.revert(cam_size):
+            # El cambio lo pidió la pantalla (reconfigure_camera): escalonado para la cámara real
+            governor.reset(cam_size, self.detector.pyramid_levels)
+        self.apply_quality(governor.current)
+
+    def report_frame_time(self, seconds):
+        """
+        Tiempo de trabajo del último frame (sin la espera del reloj), para el regulador de calidad.
+        Mientras se abre una cámara nueva las muestras no son representativas y se descartan.
+        """
+        governor = self.quality_governor
+        if governor is None:
+            return
+        if self._pending_capture is not None:
+            governor.hold()
+            return
+        level = governor.observe(seconds)
+        if level is not None:
+            self.apply_quality(level)
+
+    def apply_quality(self, level):
+        """Aplica un escalón de calidad (QualityLevel) sin detener el juego."""
+        self.detection_stride = level.stride
+
+        if level.cam_size != (self.CAM_WIDTH, self.CAM_HEIGHT):
+            # La captura nueva se instala con sus niveles de pirámide (cambio en caliente)
+            self._open_capture(level.cam_size, level.pyramid_levels)
+        elif level.pyramid_levels != self.detector.pyramid_levels:
+            self._set_detection_levels(level.pyramid_levels)
+            # El proceso de detección se vuelve a crear con los niveles nuevos
+            self._stop_detection_worker()
+
+    def _cancel_pending_capture(self):
+        if self._pending_capture is not None:
+            self._pending_capture.thread.stop(wait=False)
+            self._pending_capture = None
 
     # ----------------------------------------------------
     # MÉTODOS DE PROCESAMIENTO
     # ----------------------------------------------------
 
+    def _cam_to_screen_x(self, center_x_cam):
+        """Convierte un centro X en px de cámara a coordenadas de PANTALLA de Pygame."""
+        if center_x_cam is None:
+            return None
+        return int(center_x_cam * SCREEN_WIDTH / self.CAM_WIDTH)
+
+    def _set_detection_levels(self, levels):
+        """Niveles de pirámide de los detectores, con sus búferes para la resolución actual."""
+        with self._detector_lock:
+            for detector in (self.detector, self.multi_detector):
+                if detector is not None:
+                    detector.set_pyramid_levels(levels)
+                    detector.reserve(self.CAM_WIDTH, self.CAM_HEIGHT)
+
     def process_frame(self, frame):
         """Detecta el objeto de color rojo y devuelve su centro X en coordenadas de PANTALLA de Pygame."""
-        hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
-        
-        mask1 = cv2.inRange(hsv, RED_LOWER_H1, RED_UPPER_H1)
-        mask2 = cv2.inRange(hsv, RED_LOWER_H2, RED_UPPER_H2)
-        mask = mask1 + mask2
-        
-        contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-        
-        if contours:
-            largest_contour = max(contours, key=cv2.contourArea)
-            area = cv2.contourArea(largest_contour)
-            
-            if area > 100: 
-                M = cv2.moments(largest_contour)
-                if M["m00"] != 0:
-                    center_x_cam = int(M["m10"] / M["m00"])
-                    
-                    current_screen_width = self.game_engine.screen.get_width()
-                    
-                    screen_x = int(center_x_cam * SCREEN_WIDTH / self.CAM_WIDTH) 
-                    return screen_x 
-                    
+        with self._detector_lock:
+            if self.multi_detector is not None:
+                return self.process_markers(frame)
+            return self._cam_to_screen_x(self.detector.detect(frame))
+
+    def process_markers(self, frame):
+        """
+        Modo multimarcador: guarda todos los marcadores del frame en `markers` y devuelve la X de
+        PANTALLA del mayor del primer color (el que mueve al jugador), o None.
+        """
+        self.markers = self.multi_detector.detect(frame)
+        for marker in self.markers:
+            if marker.color == 0:
+                return self._cam_to_screen_x(marker.cx)
         return None
 
-    def get_position(self):
-        """Captura un solo frame, lo procesa y devuelve la posición X. No maneja el dibujo ni la entrada."""
-        if not self.cap or not self.cap.isOpened(): # Comprobación de seguridad
+    def _set_measurement(self, screen_x, capture_time):
+        """Registra una detección nueva (o su ausencia) y el momento de captura de su frame."""
+        self._last_screen_x = screen_x
+        self.measurement_time = capture_time
+        self.measurement_count += 1
+
+    def _worker_result(self, result):
+        """Aplica un resultado (seq, centro X) del proceso de detección."""
+        seq, center_x_cam = result
+        slot_seq, capture_time = self._frame_times[seq % FRAME_TIME_SLOTS]
+        if slot_seq != seq:
+            capture_time = None  # Resultado demasiado antiguo: sin momento de captura fiable
+        self._set_measurement(self._cam_to_screen_x(center_x_cam), capture_time)
+
+    def _process_frame_in_worker(self, frame, seq, capture_time):
+        """
+        Envía el frame al proceso de detección y recoge el último resultado disponible.
+        El resultado puede corresponder a un frame anterior (seq) y se conserva hasta que llegue otro.
+        """
+        if self.detection_worker is None or self.detection_worker.frame_shape != frame.shape:
+            self._stop_detection_worker()
+            # Importación diferida: multiprocessing y shared_memory solo hacen falta con el proceso
+            from .detection_worker import DetectionWorker
+            self.detection_worker = DetectionWorker(
+                frame.shape,
+                roi_tracking=self.detector.roi_tracking,
+                pyramid_levels=self.detector.pyramid_levels,
+            )
+
+        self._frame_times[seq % FRAME_TIME_SLOTS] = (seq, capture_time)
+        self.detection_worker.submit(frame, seq)
+
+        result = self.detection_worker.poll()
+        if result is not None:
+            self._worker_result(result)
+        return self._last_screen_x
+
+    @property
+    def detects_in_worker(self):
+        """True si la detección va al proceso separado (el modo multimarcador siempre es local)."""
+        return self.use_detection_worker and self.multi_detector is None
+
+    def take_frame(self):
+        """
+        Primera mitad de get_position(): toma el frame más reciente del hilo de captura (sin
+        bloquear) y lo deja como frame actual. Retorna (frame, seq, capture_time) si hay que
+        detectar sobre él, o None (no hay frame nuevo o el stride de calidad lo salta).
+        """
+        # Cambio de resolución en curso: pasar a la captura nueva si ya entregó su primer frame
+        self._poll_pending_capture()
+
+        if self.mailbox is None: # Comprobación de seguridad
              return None
 
-        ret, frame = self.cap.read() 
-        if not ret:
+        frame, seq, capture_time = self.mailbox.get()
+        if frame is None:
             return None
-        
-        frame = cv2.flip(frame, 1) 
-        self.current_frame = frame.copy()
 
-        screen_x = self.process_frame(frame)
-        
-        return screen_x
+        if seq == self._last_seq:
+            if self.detection_worker is not None:
+                result = self.detection_worker.poll()
+                if result is not None:
+                    self._worker_result(result)
+            return None
 
-    def draw_window(self, sprites_data):
-        """Aplica el overlay de sprites/menú al frame actual y lo muestra con CV2."""
-        if self.current_frame is None:
-            return
+        # El hilo de captura ya entrega el frame volteado y nunca lo modifica después de publicarlo,
+        # así que no hace falta copiarlo.
+        self.current_frame = frame
+        self._last_seq = seq
+
+        # Con detection_stride > 1 (regulador de calidad) solo se detecta en uno de cada N frames;
+        # en los demás se muestra el frame y el filtro de movimiento predice la posición
+        self._stride_count += 1
+        if self._stride_count < self.detection_stride:
+            return None
+        self._stride_count = 0
+        return frame, seq, capture_time
+
+    def detect_frame(self, frame, seq, capture_time):
+        """Segunda mitad de get_position(): detecta sobre el frame tomado y registra la medición."""
+        if self.detects_in_worker:
+            return self._process_frame_in_worker(frame, seq, capture_time)
+
+        start = time.perf_counter()
+        self._set_measurement(self.process_frame(frame), capture_time)
+        if self.stage_timer is not None:
+            self.stage_timer.record('process_frame', time.perf_counter() - start)
+        return self._last_screen_x
 
-        # Ajuste de tamaño de la ventana de CV2 si es necesario (No es estrictamente necesario,
-        # pero asegura que la ventana de CV2 muestre la resolución correcta)
-        frame_to_display = self.current_frame.copy()
+    def apply_detection(self, screen_x, capture_time, mailbox):
+        """
+        Registra una detección hecha fuera de detect_frame (en otro hilo) sobre un frame del
+        buzón `mailbox`. Se descarta si entre tanto se instaló otra captura. Retorna True si se aplicó.
+        """
+        if mailbox is not self.mailbox:
+            return False
+        self._set_measurement(screen_x, capture_time)
+        return True
+
+    @property
+    def last_position(self):
+        """X de PANTALLA de la última detección (None si no se vio el marcador)."""
+        return self._last_screen_x
+
+    def get_position(self):
+        """
+        Toma el frame más reciente del hilo de captura (sin bloquear), lo procesa y devuelve la posición X.
+        Si no llegó un frame nuevo desde la última llamada, reutiliza el último resultado.
+        No maneja el dibujo ni la entrada.
+        """
+        taken = self.take_frame()
+        if taken is not None:
+            self.detect_frame(*taken)
+        return self._last_screen_x
+
+    def get_capture_stats(self):
+        """Retorna los contadores de frames capturados, descartados y reutilizados."""
+        if self.mailbox is None:
+            return {'captured': 0, 'dropped': 0, 'reused': 0}
+        return {
+            'captured': self.mailbox.frames_captured,
+            'dropped': self.mailbox.frames_dropped,
+            'reused': self.mailbox.frames_reused,
+        }
+
+    def get_detection_stats(self):
+        """Retorna los contadores del seguimiento por ROI (aciertos, fallos y búsquedas completas)."""
+        return self.detector.get_stats()
+
+    def compose_frame(self, render_list, out=None):
+        """
+        Copia el frame actual al búfer de composición y le aplica el overlay de sprites/menú.
+        Mientras la cámara no entrega su primer frame se compone sobre un fondo negro con el
+        estado de la cámara, así el menú aparece sin esperar a que se abra.
+        `render_list` es (rects, colors) tal como lo entrega GameEngine.get_render_list().
+        `out`: búfer de destino en lugar del del pool (se ignora si es None o de otro tamaño).
+        Retorna el frame compuesto (válido hasta la siguiente llamada) o None.
+        """
+        if self.frame_pool is None:
+            return None
+
+        # El frame actual se conserva limpio (puede reutilizarse si no llega uno nuevo);
+        # se copia al búfer de composición, que solo se reasigna si la cámara cambió de tamaño.
+        reference = self.frame_pool.display if self.current_frame is None else self.current_frame
+        frame_to_display = self.frame_pool.display if out is None else out
+        if frame_to_display is None or frame_to_display.shape != reference.shape:
+            frame_to_display = np.empty_like(reference)
+            if out is None:
+                self.frame_pool.display = frame_to_display
+
+        if self.current_frame is None:
+            self._draw_camera_placeholder(frame_to_display)
+        else:
+            np.copyto(frame_to_display, self.current_frame)
         
         # 1. Lógica para dibujar Sprites del Juego
         if self.game_engine.menu.is_playing():
-            for data in sprites_data:
-                rect = data['rect']
-                color = data['color']
-                
-                # Conversión de coordenadas Pygame a coordenadas de Cámara (CV)
-                
-                cam_x1 = int(rect.left * self.SCALE_FACTOR_X)
-                cam_y1 = int(rect.top * self.SCALE_FACTOR_Y)
-                cam_x2 = int(rect.right * self.SCALE_FACTOR_X)
-                cam_y2 = int(rect.bottom * self.SCALE_FACTOR_Y)
-
-                color_bgr = (color[2], color[1], color[0]) 
-
-                cv2.rectangle(frame_to_display, (cam_x1, cam_y1), (cam_x2, cam_y2), color_bgr, 2)
+            self._draw_render_list(frame_to_display, render_list)
         
         # 2. Dibujar Menús (GAME_OVER, MENU, OPTIONS)
         if not self.game_engine.menu.is_playing():
             # El menú necesita saber el tamaño de la ventana de CV2 para dibujar su contenido.
             # Le pasamos el tamaño actual de la cámara como argumento.
             self.game_engine.menu.draw(frame_to_display, self.CAM_WIDTH, self.CAM_HEIGHT)
-            
-        cv2.imshow('Space Invaders Origami - Camara', frame_to_display)
-        
-        # 3. Manejo de entrada
+
+        # 3. HUD de tiempos por etapa (opcional)
+        if self.show_timing_hud and self.stage_timer is not None:
+            self._draw_timing_hud(frame_to_display)
+
+        return frame_to_display
+
+    def _draw_camera_placeholder(self, frame):
+        """Fondo negro con el estado de la cámara (abriéndose o no disponible)."""
+        frame.fill(0)
+        status = self.capture_thread.status if self.capture_thread is not None else 'failed'
+        text = "Abriendo camara..." if status in ('opening', 'open') else "Camara no disponible"
+        cv2.putText(frame, text, (10, frame.shape[0] - 15), cv2.FONT_HERSHEY_SIMPLEX,
+                    0.6, (200, 200, 200), 1)
+
+    def _draw_timing_hud(self, frame):
+        """
+        Escribe p50/p95/p99 (ms) de cada etapa en la esquina superior izquierda.
+        Los percentiles se recalculan cada FRAME_TIMING_HUD_REFRESH frames; entre medias
+        se reutilizan las líneas de texto.
+        """
+        self._hud_age += 1
+        if self._hud_age >= FRAME_TIMING_HUD_REFRESH:
+            self._hud_age = 0
+            self._hud_lines = [
+                f"{stage:<13}{s['p50_ms']:6.2f}{s['p95_ms']:7.2f}{s['p99_ms']:7.2f}"
+                for stage, s in self.stage_timer.summary().items()
+            ]
+            self._hud_lines.insert(0, f"{'ms':<13}{'p50':>6}{'p95':>7}{'p99':>7}")
+
+        for i, line in enumerate(self._hud_lines):
+            origin = (10, 20 + 18 * i)
+            cv2.putText(frame, line, origin, cv2.FONT_HERSHEY_PLAIN, 1.0, (0, 0, 0), 3)
+            cv2.putText(frame, line, origin, cv2.FONT_HERSHEY_PLAIN, 1.0, (0, 255, 0), 1)
+
+    def _draw_render_list(self, frame, render_list):
+        """
+        Dibuja los rectángulos de los sprites en lote: la conversión Pygame -> Cámara
+        se hace en una sola operación vectorizada y se emite un cv2.polylines por color.
+        (polylines con las 4 esquinas produce los mismos píxeles que cv2.rectangle).
+        """
+        rects, colors = render_list
+        if len(rects) == 0:
+            return
+
+        # Conversión de coordenadas Pygame a coordenadas de Cámara (CV)
+        scale = np.array([self.SCALE_FACTOR_X, self.SCALE_FACTOR_Y])
+        top_left = (rects[:, :2] * scale).astype(np.int32)
+        bottom_right = ((rects[:, :2] + rects[:, 2:]) * scale).astype(np.int32)
+
+        quads = np.empty((len(rects), 4, 2), dtype=np.int32)
+        quads[:, 0] = top_left
+        quads[:, 1, 0] = bottom_right[:, 0]
+        quads[:, 1, 1] = top_left[:, 1]
+        quads[:, 2] = bottom_right
+        quads[:, 3, 0] = top_left[:, 0]
+        quads[:, 3, 1] = bottom_right[:, 1]
+
+        unique_colors, color_index = np.unique(colors, axis=0, return_inverse=True)
+        for i, color in enumerate(unique_colors):
+            color_bgr = (int(color[2]), int(color[1]), int(color[0]))
+            cv2.polylines(frame, quads[color_index.reshape(-1) == i], True, color_bgr, 2)
+
+    def draw_window(self, render_list):
+        """
+        Aplica el overlay de sprites/menú al frame actual y lo muestra con CV2.
+        'q' termina el juego y 't' muestra/oculta el HUD de tiempos.
+        Retorna la tecla pulsada (-1 si ninguna) o None si aún no se mostró ningún frame.
+
+        Con el hilo de presentación (CV_PRESENTER_THREAD) el frame se compone en su buzón y se
+        entrega sin esperar a la ventana; las teclas llegan después por poll_keys().
+        """
+        presenter = self.presenter
+        if presenter is None and self.use_presenter and self.frame_pool is not None:
+            presenter = self.presenter = PresenterThread(self.show_frame, self.frame_pool.present)
+            presenter.start()
+
+        timer = self.stage_timer
+        start = time.perf_counter()
+        out = presenter.writable() if presenter is not None else None
+        frame_to_display = self.compose_frame(render_list, out=out)
+        if frame_to_display is None:
+            return
+        if timer is not None:
+            timer.record('overlay', time.perf_counter() - start)
+
+        if presenter is not None:
+            presenter.submit(frame_to_display)
+            return -1 if presenter.frames_shown else None
+
+        key = self.show_frame(frame_to_display)
+        self.handle_key(key)
+        return key
+
+    def poll_keys(self):
+        """Teclas que devolvió la ventana del hilo de presentación desde la última llamada ('q' y 't' ya aplicadas)."""
+        if self.presenter is None:
+            return []
+        keys = self.presenter.poll_keys()
+        for key in keys:
+            self.handle_key(key)
+        return keys
+
+    def show_frame(self, frame):
+        """Muestra un frame compuesto en la ventana de CV2 y retorna la tecla pulsada (-1 si ninguna)."""
+        start = time.perf_counter()
+        cv2.imshow('Space Invaders Origami - Camara', frame)
         key = cv2.waitKey(1)
-        
+        if self.stage_timer is not None:
+            self.stage_timer.record('imshow', time.perf_counter() - start)
+        return key
+
+    def handle_key(self, key):
+        """Teclas propias de la ventana: 'q' termina el juego y 't' alterna el HUD de tiempos."""
         if key == ord('q'):
              self.game_engine.running = False
-        return key
+        elif key == ord('t'):
+            self.show_timing_hud = not self.show_timing_hud
+            self._hud_age = FRAME_TIMING_HUD_REFRESH
 
     
+    def _stop_capture(self):
+        """Detiene el hilo de captura actual (y el pendiente, si lo hay) y libera la cámara."""
+        if self._pending_capture is not None:
+            self._pending_capture.thread.stop()
+            self._pending_capture = None
+        if self.capture_thread is not None:
+            self.capture_thread.stop()
+            self.capture_thread = None
+
+    def _stop_detection_worker(self):
+        """Detiene el proceso de detección (si existe) y libera su memoria compartida."""
+        if self.detection_worker is not None:
+            self.detection_worker.stop()
+            self.detection_worker = None
+
     def release_resources(self):
         """Llamado al final para liberar la cámara."""
-        if self.cap:
-             self.cap.release()
-        cv2.destroyAllWindows()
\ No newline at end of file
+        if self.presenter is not None:
+            # El hilo de presentación cierra la ventana él mismo
+            self.presenter.stop()
+            self.presenter = None
+        self._stop_capture()
+        self._stop_detection_worker()
+
+        stats = self.get_capture_stats()
+        telemetry.info('camera.stats', "Frames capturados: {captured}, descartados: {dropped}, reutilizados: {reused}",
+                       **stats)
+
+        stats = self.get_detection_stats()
+        telemetry.info('camera.stats', "ROI aciertos: {roi_hits}, fallos: {roi_misses}, búsquedas completas: {roi_fallbacks}",
+                       **stats)
+
+        if self.quality_governor is not None:
+            telemetry.info('camera.stats', "Calidad final: {level}/{last}, {changes} cambios",
+                           **self.quality_governor.get_stats())
+
+        if not self.use_presenter:
+            cv2.destroyAllWindows()
@@ -0,0 +1,187 @@
+# game_logic/capture.py
+
+import threading
+import time
+
+import cv2
+import numpy as np
+
+from .telemetry import telemetry
+
+
+class LatestFrameMailbox:
+    """
+    Buzón de un solo frame entre el hilo de captura y el bucle del juego.
+    El productor siempre sobrescribe (los frames viejos se descartan) y el
+    consumidor siempre lee el más reciente sin bloquearse.
+
+    Internamente es un triple búfer: el productor escribe en `writable()`, `put()` lo
+    intercambia con el pendiente y `get()` intercambia el pendiente con el de lectura.
+    Así el productor nunca escribe sobre el frame que el consumidor está usando y,
+    con búferes preasignados, no se asigna memoria por frame.
+    """
+
+    def __init__(self, buffers=()):
+        self._lock = threading.Lock()
+        self._slots = list(buffers) + [None] * (3 - len(buffers))
+        self._write = 0
+        self._pending = 1
+        self._read = 2
+        self._timestamp = 0.0
+        self._seq = 0            # Número de secuencia del último frame publicado
+        self._last_read_seq = 0  # Último número de secuencia entregado al consumidor
+
+        # Contadores de diagnóstico
+        self.frames_captured = 0
+        self.frames_dropped = 0  # Frames sobrescritos antes de ser leídos
+        self.frames_reused = 0   # Lecturas que no encontraron un frame nuevo
+
+    def writable(self):
+        """Búfer libre donde el productor puede escribir el próximo frame (puede ser None)."""
+        return self._slots[self._write]
+
+    def put(self, frame, timestamp):
+        """Publica un frame nuevo, descartando el anterior si nadie lo leyó."""
+        with self._lock:
+            if self._seq > self._last_read_seq:
+                self.frames_dropped += 1
+            self._slots[self._write] = frame
+            self._write, self._pending = self._pending, self._write
+            self._timestamp = timestamp
+            self._seq += 1
+            self.frames_captured += 1
+
+    def get(self):
+        """Retorna (frame, seq, timestamp) del frame más reciente. Nunca bloquea."""
+        with self._lock:
+            if self._seq == self._last_read_seq:
+                if self._seq > 0:
+                    self.frames_reused += 1
+            else:
+                self._read, self._pending = self._pending, self._read
+                self._last_read_seq = self._seq
+            frame = self._slots[self._read] if self._seq > 0 else None
+            return frame, self._seq, self._timestamp
+
+
+class CaptureThread(threading.Thread):
+    """
+    Hilo en segundo plano dueño de la fuente de frames (FrameSource: cámara, vídeo, escena
+    sintética o archivo). Lee frames continuamente, los voltea si la fuente lo pide (efecto
+    espejo) y los publica en el buzón.
+
+    Con `recorder` (FrameRecorder) cada frame se escribe directamente en el archivo de la
+    grabación y esa vista es la que se publica; al llenarse se vuelve a los búferes normales.
+
+    Con `predecessor` (el hilo de la captura anterior) la cámara nueva se abre mientras la
+    anterior sigue entregando frames. Si el dispositivo no admite dos aperturas a la vez,
+    este hilo detiene al anterior y reintenta; en ningún caso espera el hilo principal.
+    """
+
+    def __init__(self, source, width, height, mailbox, raw_buffer=None, stage_timer=None,
+                 predecessor=None, recorder=None):
+        super().__init__(name="CaptureThread", daemon=True)
+        self.source = source
+        self.width = width
+        self.height = height
+        self.mailbox = mailbox
+        self._raw = raw_buffer  # Destino reutilizable de la lectura antes del volteo
+        self.stage_timer = stage_timer  # StageTimer opcional: registra la etapa 'cap.read'
+        self._stop_event = threading.Event()
+        self.status = 'opening'  # 'opening' -> 'open' | 'failed'; 'stopped' al terminar
+        self.predecessor = predecessor
+        self.stopped_predecessor = False  # True si tuvo que detener la captura anterior para abrir el dispositivo
+        self.recorder = recorder
+        if recorder is not None:
+            recorder.writer = self  # Solo este hilo cierra el archivo mientras esté vivo
+        self._recorded = None  # FrameRecorder ya lleno: sus vistas pueden seguir en el buzón
+
+    def run(self):
+        try:
+            self._capture()
+        finally:
+            if self.recorder is not None:
+                self.recorder.close()
+
+    def _destination(self):
+        """Búfer donde escribir el próximo frame: el siguiente hueco de la grabación o el del buzón."""
+        recorder = self.recorder
+        if recorder is not None:
+            slot = recorder.slot()
+            if slot is not None:
+                return slot
+            self._stop_recording("grabación llena")
+
+        dst = self.mailbox.writable()
+        if self._recorded is not None and dst is not None and self._recorded.owns(dst):
+            # Nunca sobrescribir un frame grabado: búfer propio (solo en los primeros frames tras parar)
+            dst = np.empty_like(dst)
+        return dst
+
+    def _stop_recording(self, reason):
+        telemetry.warning('capture.recorder', "Grabación detenida ({reason}) tras {count} frames",
+                          reason=reason, count=self.recorder.count)
+        self._recorded = self.recorder
+        self.recorder = None
+        self._recorded.close()
+
+    def _capture(self):
+        source = self.source
+        opened = source.open(self.width, self.height)
+        if not opened and self.predecessor is not None and self.predecessor.is_alive():
+            # El dispositivo sigue ocupado por la captura anterior: liberarlo y reintentar
+            source.release()
+            self.stopped_predecessor = True
+            self.predecessor.stop()
+            opened = source.open(self.width, self.height)
+        self.predecessor = None
+
+        if not opened:
+            self.status = 'failed'
+            telemetry.warning('capture.open', "No se pudo abrir la fuente de frames: {source}",
+                              source=source.describe())
+            source.release()
+            return
+        self.status = 'open'
+
+        timer = self.stage_timer
+        mirror = source.mirror
+        while not self._stop_event.is_set():
+            # Sin volteo la fuente escribe directamente en el búfer que se publicará
+            dst = self._destination()
+            start = time.perf_counter()
+            ret, raw = source.read(self._raw if mirror else dst)
+            if timer is not None:
+                timer.record('cap.read', time.perf_counter() - start)
+            if not ret:
+                # Evita un bucle activo si la fuente deja de entregar frames
+                time.sleep(0.005)
+                continue
+
+            if mirror:
+                # Si la cámara entrega otro tamaño, OpenCV asigna un búfer nuevo una sola vez
+                # y a partir de ahí se reutiliza.
+                self._raw = raw
+                frame = cv2.flip(raw, 1, dst=dst)
+            else:
+                frame = raw
+
+            timestamp = time.perf_counter()
+            if self.recorder is not None:
+                if frame is dst:
+                    self.recorder.commit(timestamp)
+                else:
+                    self._stop_recording("la fuente entrega otro tamaño")
+            self.mailbox.put(frame, timestamp)
+
+        source.release()
+        self.status = 'stopped'
+
+    def stop(self, timeout=1.0, wait=True):
+        """
+        Detiene el hilo. Con wait=True espera a que libere la cámara; con wait=False solo
+        lo pide (el hilo libera la cámara por su cuenta al terminar la lectura en curso).
+        """
+        self._stop_event.set()
+        if wait and self.is_alive() and threading.current_thread() is not self:
+            self.join(timeout)
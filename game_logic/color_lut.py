@@ -0,0 +1,110 @@
+# game_logic/color_lut.py
+
+import cv2
+import numpy as np
+
+# Caché de tablas ya construidas, indexada por los rangos HSV.
+# Así la tabla solo se reconstruye cuando cambian los rangos.
+_LUT_CACHE = {}
+
+
+class ColorLUT:
+    """
+    Clasificador de color precalculado: BGR -> máscara (0/255) en una sola búsqueda vectorizada.
+
+    El frame se empaqueta a BGR565 con cv2.cvtColor (5 bits B, 6 bits G, 5 bits R = un índice
+    de 16 bits por píxel) y la máscara sale de una tabla de 65536 entradas (64 KB, cabe en caché).
+    La tabla se guarda como imagen de 256x256 (fila = byte alto, columna = byte bajo) y la
+    búsqueda es un cv2.remap con vecino más cercano: a diferencia de np.take, no convierte los
+    índices a intp y admite búferes de salida.
+    La tabla se construye una sola vez clasificando el centro de cada celda con la misma
+    conversión HSV + inRange que usa el camino original.
+    """
+
+    def __init__(self, hsv_ranges):
+        self.hsv_ranges = tuple((tuple(lower), tuple(upper)) for lower, upper in hsv_ranges)
+        self.table = self._build_table(self.hsv_ranges)
+
+    @staticmethod
+    def _cell_hsv():
+        """HSV del centro de cada una de las 65536 celdas BGR565, como imagen de 256x256."""
+        codes = np.arange(1 << 16, dtype=np.uint32)
+
+        # Decodificación BGR565 de OpenCV: bits 0-4 = B, 5-10 = G, 11-15 = R
+        colors = np.empty((256, 256, 3), dtype=np.uint8)
+        colors[..., 0] = (((codes & 0x1F) << 3) | 4).reshape(256, 256)
+        colors[..., 1] = ((((codes >> 5) & 0x3F) << 2) | 2).reshape(256, 256)
+        colors[..., 2] = ((((codes >> 11) & 0x1F) << 3) | 4).reshape(256, 256)
+
+        return cv2.cvtColor(colors, cv2.COLOR_BGR2HSV)
+
+    @classmethod
+    def _build_table(cls, hsv_ranges):
+        """Clasifica los 65536 colores BGR565 (centro de cada celda) con el camino HSV de referencia."""
+        hsv = cls._cell_hsv()
+        table = np.zeros((256, 256), dtype=np.uint8)
+        for lower, upper in hsv_ranges:
+            table |= cv2.inRange(hsv, lower, upper)
+
+        return table
+
+    def classify(self, region, out=None, packed=None, coords=None):
+        """
+        Retorna la máscara binaria (uint8, 0/255) de la región BGR.
+        `out` (h, w) uint8, `packed` (h, w, 2) uint8 y `coords` (h, w, 2) int16 son búferes
+        opcionales para no asignar memoria.
+        """
+        packed = cv2.cvtColor(region, cv2.COLOR_BGR2BGR565, dst=packed)
+
+        # Bytes (bajo, alto) del código 565 -> coordenadas (x, y) en la tabla
+        if coords is None:
+            coords = packed.astype(np.int16)
+        else:
+            np.copyto(coords, packed, casting='unsafe')
+
+        return cv2.remap(self.table, coords, None, cv2.INTER_NEAREST, dst=out)
+
+
+class ColorClassLUT(ColorLUT):
+    """
+    Variante con varios colores: la tabla da el índice del color de cada píxel
+    (0 = ninguno, k = k-ésimo color de `color_ranges`, empezando en 1; si un color encaja en
+    varios, gana el primero). Una sola búsqueda clasifica el frame para todos los colores.
+    """
+
+    def __init__(self, color_ranges):
+        self.color_ranges = tuple(tuple((tuple(lower), tuple(upper)) for lower, upper in hsv_ranges)
+                                  for hsv_ranges in color_ranges)
+        self.table = self._build_class_table(self.color_ranges)
+
+    @classmethod
+    def _build_class_table(cls, color_ranges):
+        hsv = cls._cell_hsv()
+        table = np.zeros((256, 256), dtype=np.uint8)
+        for index, hsv_ranges in enumerate(color_ranges, start=1):
+            mask = np.zeros((256, 256), dtype=np.uint8)
+            for lower, upper in hsv_ranges:
+                mask |= cv2.inRange(hsv, lower, upper)
+            table[(mask != 0) & (table == 0)] = index
+        return table
+
+
+def get_color_class_lut(color_ranges):
+    """Retorna el ColorClassLUT para estos colores, construyéndolo solo la primera vez."""
+    key = ('classes',) + tuple(tuple((tuple(lower), tuple(upper)) for lower, upper in hsv_ranges)
+                               for hsv_ranges in color_ranges)
+    lut = _LUT_CACHE.get(key)
+    if lut is None:
+        lut = ColorClassLUT(key[1:])
+        _LUT_CACHE[key] = lut
+    return lut
+
+
+def get_color_lut(hsv_ranges):
+    """Retorna el ColorLUT para estos rangos, construyéndolo solo la primera vez."""
+    key = tuple((tuple(lower), tuple(upper)) for lower, upper in hsv_ranges)
+    lut = _LUT_CACHE.get(key)
+    if lut is None:
+        lut = ColorLUT(key)
+        _LUT_CACHE[key] = lut
+    return lut
@@ -0,0 +1,353 @@
+# game_logic/detection.py
+
+from collections import namedtuple
+
+import cv2
+import numpy as np
+
+# Importación de constantes
+from .settings import (
+    RED_HSV_RANGES, CV_USE_COLOR_LUT,
+    CV_MIN_CONTOUR_AREA,
+    CV_ROI_TRACKING, CV_ROI_MIN_HALF_SIZE, CV_ROI_BLOB_MARGIN, CV_ROI_MOTION_GAIN,
+    CAM_BASE_DETECTION_LEVELS, CV_MARKER_COLORS, CV_MAX_MARKERS
+)
+from .color_lut import get_color_lut, get_color_class_lut
+from .frame_pool import ScratchBuffer
+
+
+class MarkerDetector:
+    """
+    Detector del marcador rojo. Trabaja en coordenadas de CÁMARA.
+    En modo seguimiento (ROI) solo busca en una ventana alrededor del último centro,
+    dimensionada según el tamaño del blob y el movimiento reciente; si pierde el
+    marcador vuelve a buscar en el frame completo.
+    Con pyramid_levels > 0 segmenta primero una versión reducida (pyrDown) de la región
+    y refina el centro a resolución completa solo dentro del rectángulo del blob.
+    """
+
+    def __init__(self, roi_tracking=CV_ROI_TRACKING, pyramid_levels=CAM_BASE_DETECTION_LEVELS,
+                 hsv_ranges=RED_HSV_RANGES, use_color_lut=CV_USE_COLOR_LUT):
+        self.roi_tracking = roi_tracking
+        self.pyramid_levels = pyramid_levels
+
+        # Rangos HSV del marcador y su tabla precalculada (si está activada)
+        self.set_color_ranges(hsv_ranges, use_color_lut)
+
+        # Búferes reutilizables para máscaras, HSV y niveles de pirámide
+        self._mask_buffer = ScratchBuffer()
+        self._aux_buffer = ScratchBuffer()   # BGR565 empaquetado o segunda máscara
+        self._hsv_buffer = ScratchBuffer()
+        self._coords_buffer = ScratchBuffer(np.int16)  # Coordenadas de búsqueda en la tabla de color
+        self._pyramid_buffers = []
+
+        # Contadores del modo seguimiento
+        self.roi_hits = 0       # Marcador encontrado dentro de la ROI
+        self.roi_misses = 0     # La ROI no contenía el marcador completo
+        self.roi_fallbacks = 0  # Búsquedas en el frame completo
+
+        self.reset_tracking()
+
+    def set_color_ranges(self, hsv_ranges, use_color_lut=CV_USE_COLOR_LUT):
+        """Cambia los rangos HSV del marcador. La tabla solo se construye si los rangos son nuevos."""
+        self.hsv_ranges = hsv_ranges
+        self.color_lut = get_color_lut(hsv_ranges) if use_color_lut else None
+
+    def set_pyramid_levels(self, levels):
+        """Cambia el número de niveles de pirámide (0 = sin reducción)."""
+        self.pyramid_levels = max(0, int(levels))
+
+    def reserve(self, width, height):
+        """Preasigna los búferes para frames de width x height (evita crecer durante el juego)."""
+        pixels = width * height
+        self._mask_buffer.reserve(pixels)
+        self._aux_buffer.reserve(pixels * 2)
+        if self.color_lut is None:
+            self._hsv_buffer.reserve(pixels * 3)
+        else:
+            self._coords_buffer.reserve(pixels * 2)
+        for level in range(1, self.pyramid_levels + 1):
+            width, height = (width + 1) // 2, (height + 1) // 2
+            self._pyramid_level_buffer(level).reserve(width * height * 3)
+
+    def _pyramid_level_buffer(self, level):
+        while len(self._pyramid_buffers) < level:
+            self._pyramid_buffers.append(ScratchBuffer())
+        return self._pyramid_buffers[level - 1]
+
+    def reset_tracking(self):
+        """Olvida la última posición conocida (p. ej. al cambiar la resolución)."""
+        self._track = None  # (cx, cy, half_w, half_h) del último blob, en px de cámara
+        self._motion_x = 0.0
+        self._motion_y = 0.0
+
+    # ----------------------------------------------------
+    # SEGMENTACIÓN
+    # ----------------------------------------------------
+
+    def _segment(self, region):
+        """
+        Construye la máscara binaria del color rojo para una región BGR.
+        La máscara es una vista del búfer reutilizable: solo es válida hasta la siguiente llamada.
+        """
+        height, width = region.shape[:2]
+        mask = self._mask_buffer.view((height, width))
+
+        if self.color_lut is not None:
+            return self.color_lut.classify(region, out=mask,
+                                           packed=self._aux_buffer.view((height, width, 2)),
+                                           coords=self._coords_buffer.view((height, width, 2)))
+
+        hsv = cv2.cvtColor(region, cv2.COLOR_BGR2HSV, dst=self._hsv_buffer.view((height, width, 3)))
+
+        cv2.inRange(hsv, *self.hsv_ranges[0], dst=mask)
+        if len(self.hsv_ranges) > 1:
+            extra = self._aux_buffer.view((height, width))
+            for lower, upper in self.hsv_ranges[1:]:
+                cv2.inRange(hsv, lower, upper, dst=extra)
+                cv2.bitwise_or(mask, extra, dst=mask)
+        return mask
+
+    def _find_marker_full(self, region, min_area=CV_MIN_CONTOUR_AREA):
+        """
+        Busca el contorno rojo más grande de la región a resolución completa.
+        Retorna (cx, cy, x, y, w, h) en coordenadas de la región, o None.
+        """
+        mask = self._segment(region)
+        contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+
+        if not contours:
+            return None
+
+        # m00 de los momentos del contorno es su área: no hace falta volver a calcularla
+        largest_contour = max(contours, key=cv2.contourArea)
+        M = cv2.moments(largest_contour)
+        if M["m00"] <= min_area:
+            return None
+
+        x, y, w, h = cv2.boundingRect(largest_contour)
+        return M["m10"] / M["m00"], M["m01"] / M["m00"], x, y, w, h
+
+    def _find_marker(self, region):
+        """
+        Busca el marcador de forma gruesa-a-fina según pyramid_levels.
+        Retorna (cx, cy, x, y, w, h) en coordenadas de la región, o None.
+        """
+        if self.pyramid_levels <= 0:
+            return self._find_marker_full(region)
+
+        # 1. Segmentación gruesa sobre la región reducida
+        small = region
+        for level in range(1, self.pyramid_levels + 1):
+            height, width = small.shape[:2]
+            dst = self._pyramid_level_buffer(level).view(((height + 1) // 2, (width + 1) // 2, 3))
+            small = cv2.pyrDown(small, dst=dst)
+
+        scale = 1 << self.pyramid_levels
+        coarse = self._find_marker_full(small, CV_MIN_CONTOUR_AREA / (scale * scale))
+        if coarse is None:
+            return None
+
+        # 2. Refinamiento a resolución completa solo dentro del rectángulo del blob
+        # (con un píxel grueso de margen para compensar el suavizado de pyrDown)
+        _, _, x, y, w, h = coarse
+        region_height, region_width = region.shape[:2]
+        bx0 = max(0, (x - 1) * scale)
+        by0 = max(0, (y - 1) * scale)
+        bx1 = min(region_width, (x + w + 1) * scale)
+        by1 = min(region_height, (y + h + 1) * scale)
+
+        fine = self._find_marker_full(region[by0:by1, bx0:bx1])
+        if fine is None:
+            return None
+
+        cx, cy, x, y, w, h = fine
+        return cx + bx0, cy + by0, x + bx0, y + by0, w, h
+
+    # ----------------------------------------------------
+    # SEGUIMIENTO
+    # ----------------------------------------------------
+
+    def _roi_bounds(self, frame_width, frame_height):
+        """Calcula la ventana de búsqueda alrededor de la posición predicha."""
+        cx, cy, half_w, half_h = self._track
+
+        # Predicción simple: el marcador sigue moviéndose como en los últimos frames
+        pred_x = cx + self._motion_x
+        pred_y = cy + self._motion_y
+
+        rx = max(CV_ROI_MIN_HALF_SIZE, half_w * CV_ROI_BLOB_MARGIN + abs(self._motion_x) * CV_ROI_MOTION_GAIN)
+        ry = max(CV_ROI_MIN_HALF_SIZE, half_h * CV_ROI_BLOB_MARGIN + abs(self._motion_y) * CV_ROI_MOTION_GAIN)
+
+        x0 = max(0, int(pred_x - rx))
+        y0 = max(0, int(pred_y - ry))
+        x1 = min(frame_width, int(pred_x + rx) + 1)
+        y1 = min(frame_height, int(pred_y + ry) + 1)
+        return x0, y0, x1, y1
+
+    def _update_track(self, cx, cy, w, h):
+        """Actualiza la posición conocida y el movimiento reciente (media exponencial)."""
+        if self._track is not None:
+            self._motion_x = 0.5 * self._motion_x + 0.5 * (cx - self._track[0])
+            self._motion_y = 0.5 * self._motion_y + 0.5 * (cy - self._track[1])
+        self._track = (cx, cy, w / 2, h / 2)
+
+    def detect(self, frame):
+        """Retorna el centro X (px de cámara) del marcador rojo, o None si no se encuentra."""
+        frame_height, frame_width = frame.shape[:2]
+
+        # 1. Búsqueda local alrededor de la última posición
+        if self.roi_tracking and self._track is not None:
+            x0, y0, x1, y1 = self._roi_bounds(frame_width, frame_height)
+            found = self._find_marker(frame[y0:y1, x0:x1])
+
+            if found is not None:
+                cx, cy, x, y, w, h = found
+                # Si el blob toca un borde interior de la ROI puede estar recortado:
+                # su centro no es fiable y se repite la búsqueda completa.
+                touches_edge = ((x == 0 and x0 > 0) or (y == 0 and y0 > 0) or
+                                (x + w >= x1 - x0 and x1 < frame_width) or
+                                (y + h >= y1 - y0 and y1 < frame_height))
+                if not touches_edge:
+                    self.roi_hits += 1
+                    self._update_track(cx + x0, cy + y0, w, h)
+                    return int(cx + x0)
+
+            self.roi_misses += 1
+
+        # 2. Búsqueda en el frame completo (sin seguimiento o marcador perdido)
+        if self.roi_tracking:
+            self.roi_fallbacks += 1
+
+        found = self._find_marker(frame)
+        if found is None:
+            self.reset_tracking()
+            return None
+
+        cx, cy, _, _, w, h = found
+        self._update_track(cx, cy, w, h)
+        return int(cx)
+
+    def get_stats(self):
+        """Retorna los contadores de aciertos, fallos y búsquedas completas del modo ROI."""
+        return {
+            'roi_hits': self.roi_hits,
+            'roi_misses': self.roi_misses,
+            'roi_fallbacks': self.roi_fallbacks,
+        }
+
+
+# Un marcador detectado, en px de cámara: índice de su color en la lista de colores,
+# centroide, área (px) y rectángulo
+Marker = namedtuple('Marker', 'color cx cy area x y w h')
+
+
+class MultiMarkerDetector:
+    """
+    Varios marcadores de uno o más colores en una sola pasada por frame:
+    1. (opcional) reducción con pyrDown según pyramid_levels;
+    2. una clasificación de color para todos los colores a la vez (tabla ColorClassLUT,
+       o HSV + inRange por color sin la tabla);
+    3. por color, connectedComponentsWithStats sobre su máscara: área, rectángulo y
+       centroide de cada blob salen del mismo recorrido, sin contornos ni momentos.
+    detect() retorna hasta max_markers marcadores por color, de mayor a menor área.
+    Con pirámide las coordenadas se escalan a la resolución completa (precisión de
+    medio píxel reducido); no hay seguimiento por ROI.
+    """
+
+    def __init__(self, colors=CV_MARKER_COLORS, max_markers=CV_MAX_MARKERS,
+                 pyramid_levels=CAM_BASE_DETECTION_LEVELS, use_color_lut=CV_USE_COLOR_LUT,
+                 min_area=CV_MIN_CONTOUR_AREA):
+        self.color_names = [name for name, _ in colors]
+        self.color_ranges = [hsv_ranges for _, hsv_ranges in colors]
+        self.max_markers = max_markers
+        self.pyramid_levels = pyramid_levels
+        self.min_area = min_area
+        self.color_lut = get_color_class_lut(self.color_ranges) if use_color_lut else None
+
+        self._class_buffer = ScratchBuffer()
+        self._mask_buffer = ScratchBuffer()
+        self._aux_buffer = ScratchBuffer()   # BGR565 empaquetado o máscara de un rango
+        self._hsv_buffer = ScratchBuffer()
+        self._coords_buffer = ScratchBuffer(np.int16)
+        self._labels_buffer = ScratchBuffer(np.int32)
+        self._pyramid_buffers = []
+
+    def set_pyramid_levels(self, levels):
+        """Cambia el número de niveles de pirámide (0 = sin reducción)."""
+        self.pyramid_levels = max(0, int(levels))
+
+    def reserve(self, width, height):
+        """Preasigna los búferes para frames de width x height."""
+        for level in range(1, self.pyramid_levels + 1):
+            width, height = (width + 1) // 2, (height + 1) // 2
+            self._pyramid_level_buffer(level).reserve(width * height * 3)
+        pixels = width * height
+        for buffer in (self._class_buffer, self._mask_buffer, self._labels_buffer):
+            buffer.reserve(pixels)
+        self._aux_buffer.reserve(pixels * 2)
+        if self.color_lut is None:
+            self._hsv_buffer.reserve(pixels * 3)
+        else:
+            self._coords_buffer.reserve(pixels * 2)
+
+    def _pyramid_level_buffer(self, level):
+        while len(self._pyramid_buffers) < level:
+            self._pyramid_buffers.append(ScratchBuffer())
+        return self._pyramid_buffers[level - 1]
+
+    def _color_masks(self, region):
+        """Genera (índice de color, máscara) para cada color; la máscara se reutiliza entre colores."""
+        height, width = region.shape[:2]
+        mask = self._mask_buffer.view((height, width))
+
+        if self.color_lut is not None:
+            classes = self.color_lut.classify(region, out=self._class_buffer.view((height, width)),
+                                              packed=self._aux_buffer.view((height, width, 2)),
+                                              coords=self._coords_buffer.view((height, width, 2)))
+            for index in range(len(self.color_ranges)):
+                yield index, cv2.compare(classes, index + 1, cv2.CMP_EQ, dst=mask)
+            return
+
+        hsv = cv2.cvtColor(region, cv2.COLOR_BGR2HSV, dst=self._hsv_buffer.view((height, width, 3)))
+        extra = self._aux_buffer.view((height, width))
+        for index, hsv_ranges in enumerate(self.color_ranges):
+            cv2.inRange(hsv, *hsv_ranges[0], dst=mask)
+            for lower, upper in hsv_ranges[1:]:
+                cv2.inRange(hsv, lower, upper, dst=extra)
+                cv2.bitwise_or(mask, extra, dst=mask)
+            yield index, mask
+
+    def detect(self, frame):
+        """Retorna la lista de Marker encontrados (por color, de mayor a menor área)."""
+        small = frame
+        for level in range(1, self.pyramid_levels + 1):
+            height, width = small.shape[:2]
+            dst = self._pyramid_level_buffer(level).view(((height + 1) // 2, (width + 1) // 2, 3))
+            small = cv2.pyrDown(small, dst=dst)
+
+        scale = 1 << self.pyramid_levels
+        min_area = self.min_area / (scale * scale)
+        labels = self._labels_buffer.view(small.shape[:2])
+
+        markers = []
+        for index, mask in self._color_masks(small):
+            count, _, stats, centroids = cv2.connectedComponentsWithStats(
+                mask, labels=labels, connectivity=8, ltype=cv2.CV_32S)
+            if count <= 1:
+                continue
+
+            # Etiqueta 0 = fondo
+            areas = stats[1:, cv2.CC_STAT_AREA]
+            candidates = np.flatnonzero(areas > min_area)
+            if len(candidates) == 0:
+                continue
+            best = candidates[np.argsort(areas[candidates])[::-1][:self.max_markers]] + 1
+
+            for label in best:
+                x, y, w, h, area = stats[label]
+                cx, cy = centroids[label]
+                markers.append(Marker(index, (cx + 0.5) * scale - 0.5, (cy + 0.5) * scale - 0.5,
+                                      int(area) * scale * scale, int(x) * scale, int(y) * scale,
+                                      int(w) * scale, int(h) * scale))
+        return markers
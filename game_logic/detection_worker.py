@@ -0,0 +1,117 @@
+# game_logic/detection_worker.py
+
+import multiprocessing as mp
+import queue
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .settings import CV_WORKER_RING_SLOTS
+
+
+def _worker_main(shm_name, slots, frame_shape, requests, results, detector_kwargs):
+    """
+    Punto de entrada del proceso de detección.
+    Lee frames del anillo en memoria compartida y devuelve solo (seq, centro_x_cam).
+    """
+    # Import local: el proceso hijo solo necesita el detector
+    from .detection import MarkerDetector
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    frames = np.ndarray((slots,) + frame_shape, dtype=np.uint8, buffer=shm.buf)
+    detector = MarkerDetector(**detector_kwargs)
+
+    try:
+        while True:
+            message = requests.get()
+            if message is None:  # Señal de parada
+                break
+
+            seq, slot = message
+            results.put((seq, detector.detect(frames[slot])))
+    finally:
+        del frames
+        shm.close()
+
+
+class DetectionWorker:
+    """
+    Ejecuta MarkerDetector en un proceso separado.
+    Los frames viajan por un anillo de búferes en memoria compartida (sin pickle);
+    por las colas solo pasan (seq, slot) hacia el proceso y (seq, centro_x) de vuelta.
+    """
+
+    def __init__(self, frame_shape, slots=CV_WORKER_RING_SLOTS, **detector_kwargs):
+        self.frame_shape = tuple(frame_shape)
+        self.slots = slots
+
+        frame_bytes = int(np.prod(self.frame_shape))
+        self.shm = shared_memory.SharedMemory(create=True, size=frame_bytes * slots)
+        self.frames = np.ndarray((slots,) + self.frame_shape, dtype=np.uint8, buffer=self.shm.buf)
+
+        # 'spawn' evita heredar el estado de cv2/pygame del proceso principal
+        ctx = mp.get_context('spawn')
+        self.requests = ctx.Queue()
+        self.results = ctx.Queue()
+        self.process = ctx.Process(
+            target=_worker_main,
+            args=(self.shm.name, slots, self.frame_shape, self.requests, self.results, detector_kwargs),
+            name="DetectionWorker",
+            daemon=True,
+        )
+        self.process.start()
+
+        self._next_slot = 0
+        self._in_flight = 0
+
+        # Contadores de diagnóstico
+        self.frames_submitted = 0
+        self.frames_skipped = 0  # Frames no enviados porque todos los búferes estaban ocupados
+
+    def submit(self, frame, seq):
+        """
+        Copia el frame al siguiente búfer libre del anillo y lo encola.
+        Retorna False (y descarta el frame) si el proceso aún no liberó ningún búfer.
+        """
+        if self._in_flight >= self.slots:
+            self.frames_skipped += 1
+            return False
+
+        # Los resultados llegan en orden, así que el búfer más antiguo ya fue liberado
+        slot = self._next_slot
+        np.copyto(self.frames[slot], frame)
+        self.requests.put((seq, slot))
+
+        self._next_slot = (slot + 1) % self.slots
+        self._in_flight += 1
+        self.frames_submitted += 1
+        return True
+
+    def poll(self):
+        """Retorna el resultado más reciente (seq, centro_x_cam) sin bloquear, o None si no hay nuevos."""
+        latest = None
+        while True:
+            try:
+                latest = self.results.get_nowait()
+            except queue.Empty:
+                return latest
+            self._in_flight -= 1
+
+    def stop(self, timeout=1.0):
+        """Detiene el proceso y libera la memoria compartida."""
+        if self.process.is_alive():
+            self.requests.put(None)
+            self.process.join(timeout)
+            if self.process.is_alive():
+                self.process.terminate()
+                self.process.join(timeout)
+                # Nadie leerá lo que quede en las colas: que su hilo alimentador no bloquee la salida
+                self.requests.cancel_join_thread()
+                self.results.cancel_join_thread()
+
+        self.requests.close()
+        self.results.close()
+
+        del self.frames
+        self.shm.close()
+        self.shm.unlink()
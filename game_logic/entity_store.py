@@ -0,0 +1,547 @@
+# game_logic/entity_store.py
+
+import numpy as np
+import pygame
+
+from .settings import (
+    SCREEN_HEIGHT, ENTITY_STORE_CAPACITY,
+    COLLISION_GRID_CELL_SIZE, COLLISION_GRID_MIN_PAIRS
+)
+from .spatial_hash import SpatialHash
+
+# Tipos de entidad (columna `kind`)
+KIND_BULLET = 0        # Disparo del jugador
+KIND_ENEMY_BULLET = 1  # Disparo del enemigo
+KIND_ENEMY = 2
+
+
+# =================================================================
+# 1. Almacén estructura-de-arrays
+# =================================================================
+class EntityStore:
+    """
+    Almacén de balas y enemigos en columnas de NumPy (posición, posición del tick anterior,
+    velocidad, tamaño, salud, último disparo, tipo y bandera de vida).
+    Todas las entidades avanzan y se eliminan con unas pocas operaciones vectorizadas por tick.
+    Las filas muertas se reutilizan (lista libre), así los índices son estables mientras la
+    entidad vive; `generation` invalida los manejadores de filas recicladas.
+    Los manejadores de los tipos con un EntityPool registrado vuelven a su pool al morir.
+    """
+
+    COLUMNS = (
+        ('x', np.float64), ('y', np.float64),
+        ('prev_x', np.float64), ('prev_y', np.float64),  # Posición antes del último step() (interpolación)
+        ('vx', np.float64), ('vy', np.float64),
+        ('w', np.int32), ('h', np.int32),
+        ('health', np.int32),
+        ('last_shot', np.int64),
+        ('kind', np.int8),
+        ('alive', np.bool_),
+        ('generation', np.uint32),
+        ('serial', np.int64),  # Orden de alta (equivale al orden de inserción de un pygame Group)
+    )
+
+    def __init__(self, capacity=ENTITY_STORE_CAPACITY):
+        self.capacity = 0
+        self.count = 0   # Filas usadas alguna vez (las siguientes están sin estrenar)
+        self._free = []  # Filas muertas disponibles para reutilizar
+        self._next_serial = 0
+
+        # Broadphase para las colisiones entre tipos cuando hay muchas entidades
+        self.spatial_hash = SpatialHash(COLLISION_GRID_CELL_SIZE)
+        self.grid_min_pairs = COLLISION_GRID_MIN_PAIRS
+
+        for name, dtype in self.COLUMNS:
+            setattr(self, name, np.zeros(0, dtype=dtype))
+        self.handles = np.empty(0, dtype=object)  # Manejador (Bullet/Enemy...) de cada fila, si existe
+        self.pools = {}  # tipo -> EntityPool que recicla sus manejadores
+
+        self._grow(capacity)
+
+    def _grow(self, new_capacity):
+        """Amplía todas las columnas conservando el contenido."""
+        for name, dtype in self.COLUMNS:
+            column = np.zeros(new_capacity, dtype=dtype)
+            column[:self.capacity] = getattr(self, name)
+            setattr(self, name, column)
+
+        handles = np.empty(new_capacity, dtype=object)
+        handles[:self.capacity] = self.handles
+        self.handles = handles
+
+        self.capacity = new_capacity
+
+    # ----------------------------------------------------
+    # ALTAS Y BAJAS
+    # ----------------------------------------------------
+
+    def spawn(self, kind, x, y, w, h, vx=0, vy=0, health=0, last_shot=0):
+        """Crea una entidad y retorna el índice de su fila."""
+        if self._free:
+            index = self._free.pop()
+        else:
+            if self.count == self.capacity:
+                self._grow(self.capacity * 2)
+            index = self.count
+            self.count += 1
+
+        self.x[index] = self.prev_x[index] = x
+        self.y[index] = self.prev_y[index] = y
+        self.vx[index] = vx
+        self.vy[index] = vy
+        self.w[index] = w
+        self.h[index] = h
+        self.health[index] = health
+        self.last_shot[index] = last_shot
+        self.kind[index] = kind
+        self.alive[index] = True
+        self.serial[index] = self._next_serial
+        self._next_serial += 1
+        return index
+
+    def attach(self, entity):
+        """Da de alta un manejador desligado (Bullet, Enemy...). No hace nada si ya vive aquí."""
+        if entity.alive() and entity._store is self:
+            return
+        entity._bind(self, self.spawn(entity.KIND, *entity._spawn_values()))
+
+    def kill(self, indices):
+        """Elimina una o varias filas (índice o array de índices)."""
+        indices = np.atleast_1d(indices)
+        indices = indices[self.alive[indices]]
+        if len(indices) == 0:
+            return
+
+        self.alive[indices] = False
+        self.generation[indices] += 1
+        self._free.extend(indices.tolist())
+
+        # Devolver los manejadores a su pool (si el tipo tiene uno) antes de soltarlos
+        released = self.handles[indices]
+        self.handles[indices] = None
+        if self.pools:
+            for entity in released:
+                if entity is not None and entity.KIND in self.pools:
+                    self.pools[entity.KIND].release(entity)
+
+    def clear(self, kind=None):
+        """Elimina todas las entidades (o solo las de un tipo)."""
+        self.kill(self.alive_indices(kind))
+
+    # ----------------------------------------------------
+    # CONSULTAS
+    # ----------------------------------------------------
+
+    def alive_mask(self, kind=None):
+        mask = self.alive[:self.count]
+        if kind is not None:
+            mask = mask & (self.kind[:self.count] == kind)
+        return mask
+
+    def alive_indices(self, kind=None):
+        return np.flatnonzero(self.alive_mask(kind))
+
+    def count_alive(self, kind=None):
+        return int(np.count_nonzero(self.alive_mask(kind)))
+
+    def rects(self, kind=None, indices=None, alpha=1.0):
+        """
+        Retorna (N, 4) int32 con [x, y, ancho, alto] de las entidades vivas (o de `indices`).
+        Con alpha < 1 la posición se interpola entre el tick anterior (0) y el actual (1).
+        """
+        if indices is None:
+            indices = self.alive_indices(kind)
+        rects = np.empty((len(indices), 4), dtype=np.int32)
+        if alpha >= 1.0:
+            rects[:, 0] = self.x[indices]
+            rects[:, 1] = self.y[indices]
+        else:
+            prev_x, prev_y = self.prev_x[indices], self.prev_y[indices]
+            rects[:, 0] = prev_x + (self.x[indices] - prev_x) * alpha
+            rects[:, 1] = prev_y + (self.y[indices] - prev_y) * alpha
+        rects[:, 2] = self.w[indices]
+        rects[:, 3] = self.h[indices]
+        return rects
+
+    def update_digest(self, digest):
+        """Añade al hash (hashlib) las columnas de estado de las entidades vivas, en orden de alta."""
+        indices = self.alive_indices()
+        indices = indices[np.argsort(self.serial[indices])]
+        for name in ('x', 'y', 'vx', 'vy', 'w', 'h', 'health', 'last_shot', 'kind'):
+            digest.update(getattr(self, name)[indices].tobytes())
+
+    def handle(self, index):
+        """Retorna el manejador de la fila, creándolo si la entidad se dio de alta sin uno."""
+        entity = self.handles[index]
+        if entity is None:
+            cls = StoreEntity.KIND_CLASSES[int(self.kind[index])]
+            entity = cls.__new__(cls)
+            StoreEntity.__init__(entity, int(self.w[index]), int(self.h[index]),
+                                 self.vx[index], self.vy[index],
+                                 int(self.health[index]), int(self.last_shot[index]))
+            entity._bind(self, index)
+        return entity
+
+    # ----------------------------------------------------
+    # SIMULACIÓN
+    # ----------------------------------------------------
+
+    def step(self):
+        """Avanza todas las entidades un tick y elimina las que salieron de la pantalla."""
+        n = self.count
+        self.prev_x[:n] = self.x[:n]
+        self.prev_y[:n] = self.y[:n]
+        self.x[:n] += self.vx[:n]
+        self.y[:n] += self.vy[:n]
+
+        # Balas del jugador: salen por arriba. Enemigos y balas enemigas: salen por abajo.
+        kind = self.kind[:n]
+        y = self.y[:n]
+        out = np.where(kind == KIND_BULLET, y + self.h[:n] < 0, y > SCREEN_HEIGHT)
+        self.kill(np.flatnonzero(out & self.alive[:n]))
+
+    def collide_rect(self, rect, kind):
+        """Índices de las entidades vivas de `kind` que se solapan con `rect` (misma regla que pygame.Rect.colliderect)."""
+        indices = self.alive_indices(kind)
+        left, top, width, height = rect
+        hit = ((self.x[indices] < left + width) & (self.x[indices] + self.w[indices] > left) &
+               (self.y[indices] < top + height) & (self.y[indices] + self.h[indices] > top))
+        return indices[hit]
+
+    def collide_kinds(self, kind_a, kind_b):
+        """
+        Colisión entre dos tipos con la semántica de pygame.sprite.groupcollide(a, b, True, True).
+        groupcollide recorre `a` en orden de inserción y elimina sobre la marcha, así que una
+        entidad de `a` solo muere si toca alguna de `b` que siga viva en su turno: cada entidad
+        de `b` la elimina la primera (en orden de alta) de `a` que la toca.
+
+        Con pocas entidades se prueban todos los pares de una vez; a partir de
+        grid_min_pairs pares posibles se usa la rejilla (SpatialHash) y la prueba exacta
+        solo se hace sobre los candidatos que comparten celda.
+        Retorna (índices de kind_a eliminados, índices de kind_b eliminados).
+        """
+        a = self.alive_indices(kind_a)
+        b = self.alive_indices(kind_b)
+        if len(a) == 0 or len(b) == 0:
+            return a[:0], b[:0]
+
+        if len(a) * len(b) >= self.grid_min_pairs:
+            pos_a, pos_b = self._grid_overlaps(a, b)
+        else:
+            pos_a, pos_b = np.nonzero(self._overlap_matrix(a, b))
+
+        return self._resolve_overlaps(a, b, pos_a, pos_b)
+
+    def _overlap_matrix(self, a, b):
+        """Matriz (len(a), len(b)) de solapamiento con la regla de pygame.Rect.colliderect."""
+        ax, ay, aw, ah = self.x[a, None], self.y[a, None], self.w[a, None], self.h[a, None]
+        bx, by, bw, bh = self.x[b], self.y[b], self.w[b], self.h[b]
+        return (ax < bx + bw) & (ax + aw > bx) & (ay < by + bh) & (ay + ah > by)
+
+    def _grid_overlaps(self, a, b):
+        """Pares (posición en a, posición en b) que se solapan, usando la rejilla como broadphase."""
+        self.spatial_hash.build(self.x[b], self.y[b], self.w[b], self.h[b])
+        pos_a, pos_b = self.spatial_hash.query_pairs(self.x[a], self.y[a], self.w[a], self.h[a])
+
+        ia, ib = a[pos_a], b[pos_b]
+        hit = ((self.x[ia] < self.x[ib] + self.w[ib]) & (self.x[ia] + self.w[ia] > self.x[ib]) &
+               (self.y[ia] < self.y[ib] + self.h[ib]) & (self.y[ia] + self.h[ia] > self.y[ib]))
+        return pos_a[hit], pos_b[hit]
+
+    def _resolve_overlaps(self, a, b, pos_a, pos_b):
+        """Aplica el orden de groupcollide a los pares solapados (posiciones en `a` y `b`)."""
+        if len(pos_a) == 0:
+            return a[:0], b[:0]
+
+        # Para cada entidad de `b`, la primera de `a` en orden de alta que la toca
+        order = np.lexsort((self.serial[a[pos_a]], pos_b))
+        _, first = np.unique(pos_b[order], return_index=True)
+
+        return np.unique(a[pos_a[order[first]]]), np.unique(b[pos_b])
+
+
+# =================================================================
+# 2. Manejadores de entidad (interfaz tipo Sprite sobre una fila)
+# =================================================================
+class _EntityRect(pygame.Rect):
+    """
+    Rect de una entidad viva que escribe cada cambio en las columnas del almacén, así el
+    idioma de los sprites (entity.rect.x += n, entity.rect.bottom = ..., rect.move_ip(...))
+    sigue funcionando. Es un cambio dentro del tick: a diferencia del setter `rect` no anula
+    la interpolación. Las copias (copy(), move(), ...) no están ligadas y no escriben.
+    """
+
+    __slots__ = ('_entity',)
+
+    def __init__(self, entity, *args):
+        super().__init__(*args)
+        object.__setattr__(self, '_entity', entity)
+
+    def _write_back(self):
+        entity = getattr(self, '_entity', None)  # Las copias que crea pygame no tienen entidad
+        if entity is None or not entity.alive():
+            return
+        i = entity._index
+        s = entity._store
+        s.x[i], s.y[i], s.w[i], s.h[i] = self
+
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        self._write_back()
+
+
+def _write_through(name):
+    method = getattr(pygame.Rect, name)
+
+    def in_place(self, *args, **kwargs):
+        result = method(self, *args, **kwargs)
+        self._write_back()
+        return result
+
+    in_place.__name__ = name
+    return in_place
+
+
+# Métodos que modifican el Rect en el sitio (los que existan en la versión de pygame)
+for _name in ('move_ip', 'inflate_ip', 'scale_by_ip', 'clamp_ip', 'union_ip', 'unionall_ip',
+              'update', 'normalize'):
+    if hasattr(pygame.Rect, _name):
+        setattr(_EntityRect, _name, _write_through(_name))
+
+
+class StoreEntity:
+    """
+    Manejador ligero de una fila del EntityStore con la interfaz de Sprite que usa el juego
+    (rect, alive, kill). Antes de darse de alta guarda sus valores iniciales en un Rect propio.
+    """
+
+    KIND = None
+    KIND_CLASSES = {}  # tipo -> clase, para crear manejadores de filas sin uno
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.KIND is not None:
+            StoreEntity.KIND_CLASSES[cls.KIND] = cls
+
+    def __init__(self, width, height, vx=0, vy=0, health=0, last_shot=0):
+        self._store = None
+        self._index = None
+        self._generation = None
+
+        # Valores iniciales mientras la entidad está desligada
+        self._rect = pygame.Rect(0, 0, width, height)
+        self._vx = vx
+        self._vy = vy
+        self._health = health
+        self._last_shot = last_shot
+
+    def _spawn_values(self):
+        return (self._rect.x, self._rect.y, self._rect.width, self._rect.height,
+                self._vx, self._vy, self._health, self._last_shot)
+
+    def _bind(self, store, index):
+        self._store = store
+        self._index = index
+        self._generation = store.generation[index]
+        store.handles[index] = self
+
+    def alive(self):
+        store = self._store
+        return (store is not None and store.alive[self._index]
+                and store.generation[self._index] == self._generation)
+
+    def kill(self):
+        if self.alive():
+            self._store.kill(self._index)
+
+    # --- Atributos respaldados por columnas ---
+
+    @property
+    def rect(self):
+        """Rect de la fila; sus cambios se escriben en el almacén (ver _EntityRect)."""
+        if not self.alive():
+            return self._rect
+        i = self._index
+        s = self._store
+        return _EntityRect(self, int(s.x[i]), int(s.y[i]), int(s.w[i]), int(s.h[i]))
+
+    @rect.setter
+    def rect(self, value):
+        if not self.alive():
+            self._rect = pygame.Rect(value)
+            return
+        i = self._index
+        s = self._store
+        s.x[i], s.y[i], s.w[i], s.h[i] = value
+        s.prev_x[i], s.prev_y[i] = s.x[i], s.y[i]  # Un salto no se interpola
+
+    @property
+    def speed(self):
+        return abs(self._store.vy[self._index]) if self.alive() else abs(self._vy)
+
+    @property
+    def health(self):
+        return int(self._store.health[self._index]) if self.alive() else self._health
+
+    @health.setter
+    def health(self, value):
+        if self.alive():
+            self._store.health[self._index] = value
+        else:
+            self._health = value
+
+    @property
+    def last_shot(self):
+        return int(self._store.last_shot[self._index]) if self.alive() else self._last_shot
+
+    @last_shot.setter
+    def last_shot(self, value):
+        if self.alive():
+            self._store.last_shot[self._index] = value
+        else:
+            self._last_shot = value
+
+
+# =================================================================
+# 3. Adaptadores con la interfaz de pygame.sprite.Group
+# =================================================================
+class EntityGroup:
+    """
+    Vista de un tipo de entidad del almacén con la interfaz de pygame.sprite.Group
+    que usan GameEngine y GameMenu (add, empty, len, iteración).
+    """
+
+    def __init__(self, store, kind):
+        self.store = store
+        self.kind = kind
+
+    def add(self, *entities):
+        for entity in entities:
+            self.store.attach(entity)
+
+    def empty(self):
+        self.store.clear(self.kind)
+
+    def update(self, *args):
+        """El movimiento lo hace EntityStore.step() para todas las entidades a la vez."""
+
+    def sprites(self):
+        return [self.store.handle(i) for i in self.store.alive_indices(self.kind)]
+
+    def rects(self):
+        return self.store.rects(self.kind)
+
+    def __iter__(self):
+        return iter(self.sprites())
+
+    def __len__(self):
+        return self.store.count_alive(self.kind)
+
+    def __bool__(self):
+        return len(self) > 0
+
+
+class WorldGroup:
+    """
+    Reemplazo de all_sprites: combina los sprites normales de pygame (el jugador)
+    con todas las entidades del almacén. update() avanza ambos.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self._sprites = pygame.sprite.Group()
+
+    def add(self, *items):
+        for item in items:
+            if isinstance(item, StoreEntity):
+                self.store.attach(item)
+            else:
+                self._sprites.add(item)
+
+    def empty(self):
+        self._sprites.empty()
+        self.store.clear()
+
+    def update(self, *args):
+        self._sprites.update(*args)
+        self.store.step()
+
+    def sprites(self):
+        return self._sprites.sprites() + [self.store.handle(i) for i in self.store.alive_indices()]
+
+    def __iter__(self):
+        return iter(self.sprites())
+
+    def __len__(self):
+        return len(self._sprites) + self.store.count_alive()
+
+    def __bool__(self):
+        return len(self) > 0
+
+
+# =================================================================
+# 4. Pool de manejadores (balas)
+# =================================================================
+class EntityPool:
+    """
+    Pool acotado de manejadores de un tipo de entidad (p. ej. Bullet).
+    acquire() reutiliza un manejador muerto en lugar de crear uno nuevo y lo da de alta en el
+    almacén; al morir (impacto, salida de pantalla o vaciado del grupo) el almacén lo devuelve
+    con release(). Como mucho `capacity` entidades del tipo pueden estar vivas a la vez:
+    por encima de eso acquire() retorna None y el disparo se descarta.
+
+    La clase debe implementar place(*args), que recoloca un manejador desligado.
+    Una referencia guardada a una entidad muerta puede volver a la vida como otra entidad.
+    """
+
+    def __init__(self, store, entity_class, capacity):
+        self.store = store
+        self.entity_class = entity_class
+        self.kind = entity_class.KIND
+        self.capacity = capacity
+        self._free = []  # Manejadores muertos listos para reutilizar
+
+        # Métricas de reutilización
+        self.created = 0    # Manejadores construidos (pool vacío)
+        self.reused = 0     # Manejadores sacados del pool
+        self.released = 0   # Manejadores devueltos al pool
+        self.rejected = 0   # acquire() sin hueco (límite de entidades vivas)
+        self.peak_live = 0  # Máximo de entidades vivas del tipo
+
+        store.pools[self.kind] = self
+
+    def acquire(self, *args):
+        """Retorna una entidad viva colocada con place(*args), o None si el pool está lleno."""
+        live = self.store.count_alive(self.kind)
+        if live >= self.capacity:
+            self.rejected += 1
+            return None
+
+        if self._free:
+            entity = self._free.pop()
+            entity.place(*args)
+            self.reused += 1
+        else:
+            entity = self.entity_class(*args)
+            self.created += 1
+
+        self.store.attach(entity)
+        self.peak_live = max(self.peak_live, live + 1)
+        return entity
+
+    def release(self, entity):
+        """Recibe un manejador que acaba de morir. Lo llama EntityStore.kill()."""
+        self.released += 1
+        if len(self._free) < self.capacity:
+            self._free.append(entity)
+
+    def get_stats(self):
+        """Métricas del pool: construidos, reutilizados, devueltos, rechazados, pico de vivos y libres."""
+        return {
+            'created': self.created,
+            'reused': self.reused,
+            'released': self.released,
+            'rejected': self.rejected,
+            'peak_live': self.peak_live,
+            'free': len(self._free),
+        }
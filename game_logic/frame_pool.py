@@ -0,0 +1,51 @@
+# game_logic/frame_pool.py
+
+import numpy as np
+
+
+class ScratchBuffer:
+    """
+    Búfer plano reutilizable. Entrega vistas contiguas de cualquier forma que quepa,
+    así las regiones de tamaño variable (ROI, pirámide) no asignan memoria en cada frame.
+    Solo crece cuando se pide una forma más grande que la reservada.
+    """
+
+    def __init__(self, dtype=np.uint8, size=0):
+        self.dtype = dtype
+        self._flat = np.empty(size, dtype=dtype)
+
+    def reserve(self, size):
+        """Garantiza capacidad para al menos `size` elementos."""
+        if size > self._flat.size:
+            self._flat = np.empty(size, dtype=self.dtype)
+
+    def view(self, shape):
+        """Retorna una vista contigua con la forma pedida (contenido indefinido)."""
+        size = 1
+        for dim in shape:
+            size *= dim
+        self.reserve(size)
+        return self._flat[:size].reshape(shape)
+
+
+class FramePool:
+    """
+    Búferes de frame preasignados para una resolución de cámara.
+    Se crea en CameraHandler.reconfigure_camera y se reutiliza con las salidas dst= de OpenCV.
+    """
+
+    def __init__(self, width, height, capture_buffers=3, present_buffers=0):
+        self.shape = (height, width, 3)
+
+        # Destino de la lectura de la fuente antes del volteo (solo lo usa el hilo de captura)
+        self.raw = np.empty(self.shape, dtype=np.uint8)
+
+        # Frames volteados: triple búfer compartido entre el hilo de captura y el bucle del juego
+        self.capture = [np.empty(self.shape, dtype=np.uint8) for _ in range(capture_buffers)]
+
+        # Frame compuesto (overlay de sprites/menú) que se muestra en la ventana
+        self.display = np.empty(self.shape, dtype=np.uint8)
+
+        # Frames compuestos para el hilo de presentación: triple búfer entre el bucle del juego
+        # y la ventana (display no sirve: el bucle lo reescribe mientras el hilo lo muestra)
+        self.present = [np.empty(self.shape, dtype=np.uint8) for _ in range(present_buffers)]
@@ -0,0 +1,268 @@
+# game_logic/frame_source.py
+
+import os
+import time
+
+import cv2
+import numpy as np
+
+from .settings import (
+    CAM_DEVICE_INDEX, FRAME_SOURCE, FRAME_SOURCE_PATH, FRAME_SOURCE_FPS,
+    FRAME_SOURCE_LOOP, SYNTHETIC_SCENARIO
+)
+
+
+class FrameSource:
+    """
+    Origen de los frames BGR que lee el hilo de captura (CaptureThread).
+    El resto de CameraHandler y GameEngine no sabe qué fuente está activa.
+
+        open(width, height)  prepara la fuente para entregar frames de ese tamaño; retorna bool
+        read(out)            (ok, frame): escribe el siguiente frame en `out` si puede
+                             (si no, retorna otro array, como cv2.VideoCapture.read)
+        release()            libera el dispositivo o el archivo
+
+    `mirror` indica si el hilo de captura debe voltear el frame (efecto espejo): solo las
+    imágenes directas de una cámara. Las fuentes sin ritmo propio (archivos, escena sintética)
+    entregan `fps` frames por segundo; con fps = 0 van tan rápido como se lean.
+    """
+
+    mirror = False
+    native_fps = 30.0  # Ritmo con fps=None
+
+    def __init__(self, fps=None):
+        self.fps = self.native_fps if fps is None else fps
+        self._next_time = None
+
+    def open(self, width, height):
+        raise NotImplementedError
+
+    def read(self, out):
+        raise NotImplementedError
+
+    def release(self):
+        pass
+
+    def describe(self):
+        return type(self).__name__
+
+    def _pace(self):
+        """Espera hasta el momento del siguiente frame según `fps`."""
+        if not self.fps:
+            return
+        now = time.perf_counter()
+        if self._next_time is not None and now < self._next_time:
+            time.sleep(self._next_time - now)
+            now = self._next_time
+        # Si la lectura va con retraso no se intenta recuperar (no hay ráfagas)
+        self._next_time = now + 1.0 / self.fps
+
+
+class WebcamSource(FrameSource):
+    """Cámara a través de cv2.VideoCapture; el propio dispositivo marca el ritmo."""
+
+    mirror = True
+
+    def __init__(self, device_index=CAM_DEVICE_INDEX):
+        super().__init__(fps=0)
+        self.device_index = device_index
+        self.cap = None
+
+    def open(self, width, height):
+        self.cap = cv2.VideoCapture(self.device_index)
+        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        return self.cap.isOpened()
+
+    def read(self, out):
+        return self.cap.read(out)
+
+    def release(self):
+        if self.cap is not None:
+            self.cap.release()
+
+    def describe(self):
+        return f"cámara {self.device_index}"
+
+
+class VideoFileSource(FrameSource):
+    """
+    Archivo de vídeo leído con cv2.VideoCapture, reescalado al tamaño pedido si hace falta.
+    Se voltea como la cámara (un vídeo grabado con la webcam no está en espejo).
+    Con fps=None respeta los fps del archivo; con loop vuelve al principio al terminar.
+    """
+
+    mirror = True
+
+    def __init__(self, path, fps=None, loop=True):
+        super().__init__(fps)
+        self.path = path
+        self.loop = loop
+        self._use_native_fps = fps is None
+        self.cap = None
+        self._size = None
+        self._decoded = None  # Búfer de decodificación cuando el tamaño no coincide
+
+    def open(self, width, height):
+        self.cap = cv2.VideoCapture(self.path)
+        if not self.cap.isOpened():
+            return False
+        self._size = (width, height)
+        if self._use_native_fps:
+            self.fps = self.cap.get(cv2.CAP_PROP_FPS) or self.native_fps
+        return True
+
+    def read(self, out):
+        self._pace()
+        ret, frame = self.cap.read(self._decoded)
+        if not ret and self.loop:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self.cap.read(self._decoded)
+        if not ret:
+            return False, None
+
+        self._decoded = frame
+        if (frame.shape[1], frame.shape[0]) == self._size:
+            np.copyto(out, frame)
+        else:
+            cv2.resize(frame, self._size, dst=out, interpolation=cv2.INTER_AREA)
+        return True, out
+
+    def release(self):
+        if self.cap is not None:
+            self.cap.release()
+
+    def describe(self):
+        return f"vídeo {self.path}"
+
+
+class SyntheticSource(FrameSource):
+    """Escena generada (SyntheticScene) al tamaño pedido: marcador con posición conocida, sin cámara."""
+
+    def __init__(self, scenario=SYNTHETIC_SCENARIO, fps=None, seed=0):
+        super().__init__(fps)
+        self.scenario = scenario
+        self.seed = seed
+        self.scene = None
+        self.index = 0
+
+    def open(self, width, height):
+        # Importación diferida: solo hace falta con esta fuente
+        from .synthetic_frames import SyntheticScene
+        self.scene = SyntheticScene(width, height, scenario=self.scenario, seed=self.seed)
+        self.index = 0
+        return True
+
+    def read(self, out):
+        self._pace()
+        frame, _ = self.scene.render(self.index, out=out)
+        self.index += 1
+        return True, frame
+
+    def describe(self):
+        return f"escena sintética '{self.scenario}'"
+
+
+class RawFileSource(FrameSource):
+    """
+    Frames BGR sin comprimir de un archivo .npy (N, alto, ancho, 3) uint8, leído con
+    np.load(mmap_mode='r'): el sistema operativo pagina el archivo y solo se copia cada
+    frame al búfer de captura. Los frames ya están como se verían en pantalla (sin espejo).
+
+    Si es una grabación de SessionRecorder (<prefijo>.frames.npy) y existe <prefijo>.times.npy,
+    con fps=None se reproduce al ritmo en que se capturó.
+    """
+
+    def __init__(self, path, fps=None, loop=True):
+        super().__init__(fps)
+        self.path = path
+        self.loop = loop
+        self._use_recorded_times = fps is None
+        self.times = None
+        self._time_base = None  # Momento (perf_counter) que corresponde a times[0]
+        self.frames = None
+        self.count = 0
+        self.index = 0
+        self._size = None
+
+    def open(self, width, height):
+        try:
+            frames = np.load(self.path, mmap_mode='r')
+        except (OSError, ValueError):
+            return False
+        if frames.ndim != 4 or frames.shape[3] != 3 or frames.dtype != np.uint8 or len(frames) == 0:
+            return False
+        self.frames = frames
+        self.count = len(frames)
+        self.index = 0
+        self._size = (width, height)
+        self._load_times()
+        return True
+
+    def _load_times(self):
+        """Momentos de captura de una grabación; limitan `count` a los frames realmente grabados."""
+        suffix = '.frames.npy'
+        if not self.path.endswith(suffix):
+            return
+        times_path = self.path[:-len(suffix)] + '.times.npy'
+        if not os.path.exists(times_path):
+            return
+        times = np.load(times_path)
+        unwritten = np.flatnonzero(times[:self.count] == 0)
+        if len(unwritten):
+            self.count = int(unwritten[0])  # Archivo sin recortar: los huecos vacíos tienen momento 0
+        if self._use_recorded_times and self.count > 1:
+            self.times = times[:self.count]
+
+    def _pace_recorded(self):
+        """Espera hasta que, desde el primer frame, pase lo mismo que en la grabación."""
+        offset = self.times[self.index] - self.times[0]
+        now = time.perf_counter()
+        if self.index == 0 or self._time_base is None:
+            self._time_base = now
+        elif self._time_base + offset > now:
+            time.sleep(self._time_base + offset - now)
+
+    def read(self, out):
+        if self.index >= self.count:
+            if not self.loop or self.count == 0:
+                return False, None
+            self.index = 0
+        if self.times is not None:
+            self._pace_recorded()
+        else:
+            self._pace()
+
+        frame = self.frames[self.index]
+        self.index += 1
+        if (frame.shape[1], frame.shape[0]) == self._size:
+            np.copyto(out, frame)
+        else:
+            cv2.resize(frame, self._size, dst=out, interpolation=cv2.INTER_AREA)
+        return True, out
+
+    def release(self):
+        self.frames = None  # Cierra el mapeo cuando no quedan vistas
+
+    def describe(self):
+        return f"archivo {self.path}"
+
+
+FRAME_SOURCES = ('webcam', 'video', 'synthetic', 'raw')
+
+
+def create_frame_source(kind=FRAME_SOURCE, path=FRAME_SOURCE_PATH):
+    """
+    Crea la fuente configurada en settings (FRAME_SOURCE y compañía).
+    Se crea una nueva por cada captura (cada cambio de resolución abre la suya).
+    """
+    if kind == 'webcam':
+        return WebcamSource(CAM_DEVICE_INDEX)
+    if kind == 'synthetic':
+        return SyntheticSource(SYNTHETIC_SCENARIO, fps=FRAME_SOURCE_FPS)
+    if kind in ('video', 'raw'):
+        if not path:
+            raise ValueError(f"La fuente '{kind}' necesita FRAME_SOURCE_PATH")
+        source_class = VideoFileSource if kind == 'video' else RawFileSource
+        return source_class(path, fps=FRAME_SOURCE_FPS, loop=FRAME_SOURCE_LOOP)
+    raise ValueError(f"Fuente de frames desconocida: {kind}")
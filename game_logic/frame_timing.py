@@ -0,0 +1,111 @@
+# game_logic/frame_timing.py
+
+import csv
+import json
+import time
+
+import numpy as np
+
+
+class _StageRing:
+    """Últimas `size` duraciones (segundos) de una etapa en un array circular preasignado."""
+
+    __slots__ = ('samples', 'pos', 'count')
+
+    def __init__(self, size):
+        self.samples = np.zeros(size, dtype=np.float64)
+        self.pos = 0
+        self.count = 0  # Muestras registradas en total (puede superar `size`)
+
+    def add(self, seconds):
+        self.samples[self.pos] = seconds
+        self.pos = (self.pos + 1) % len(self.samples)
+        self.count += 1
+
+    def values(self):
+        """Copia de las muestras válidas (como mucho `size`), de la más antigua a la más reciente."""
+        if self.count < len(self.samples):
+            return self.samples[:self.count].copy()
+        return np.roll(self.samples, -self.pos)
+
+
+class StageTimer:
+    """
+    Tiempos por etapa del bucle principal en búferes circulares de tamaño fijo.
+    Registrar una muestra es una llamada a perf_counter y una escritura en un array,
+    así que puede quedarse activo durante la partida. Los percentiles se calculan solo
+    al pedir un resumen.
+
+    Dos formas de medir:
+        lap(etapa)            tiempo desde la marca anterior (etapas consecutivas del bucle)
+        record(etapa, segs)   duración medida por quien llama (p. ej. dentro de la cámara o del hilo de captura)
+    """
+
+    FRAME_STAGE = 'frame'  # Duración total de cada iteración del bucle
+
+    def __init__(self, window=512):
+        self.window = window
+        self._rings = {}
+        self._last = None
+        self._frame_start = None
+
+    def record(self, stage, seconds):
+        ring = self._rings.get(stage)
+        if ring is None:
+            ring = self._rings[stage] = _StageRing(self.window)
+        ring.add(seconds)
+
+    def start_frame(self):
+        """Marca el inicio de una iteración del bucle (y cierra la anterior)."""
+        now = time.perf_counter()
+        if self._frame_start is not None:
+            self.record(self.FRAME_STAGE, now - self._frame_start)
+        self._frame_start = self._last = now
+
+    def lap(self, stage):
+        """Registra el tiempo transcurrido desde la marca anterior como la etapa `stage`."""
+        now = time.perf_counter()
+        if self._last is not None:
+            self.record(stage, now - self._last)
+        self._last = now
+
+    def stages(self):
+        return list(self._rings)
+
+    def summary(self):
+        """{etapa: {count, mean_ms, p50_ms, p95_ms, p99_ms, max_ms}} sobre la ventana actual."""
+        result = {}
+        for stage, ring in list(self._rings.items()):
+            values = ring.values() * 1000
+            if len(values) == 0:
+                continue
+            p50, p95, p99 = np.percentile(values, (50, 95, 99))
+            result[stage] = {
+                'count': ring.count,
+                'mean_ms': float(values.mean()),
+                'p50_ms': float(p50),
+                'p95_ms': float(p95),
+                'p99_ms': float(p99),
+                'max_ms': float(values.max()),
+            }
+        return result
+
+    def dump(self, path_prefix):
+        """
+        Escribe `<path_prefix>.json` (resumen por etapa) y `<path_prefix>.csv`
+        (muestras de la ventana: etapa, orden, ms). Retorna las dos rutas.
+        """
+        json_path = f"{path_prefix}.json"
+        csv_path = f"{path_prefix}.csv"
+
+        with open(json_path, 'w') as f:
+            json.dump({'window': self.window, 'stages': self.summary()}, f, indent=2)
+
+        with open(csv_path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(('stage', 'sample', 'ms'))
+            for stage, ring in list(self._rings.items()):
+                for i, value in enumerate(ring.values() * 1000):
+                    writer.writerow((stage, i, f"{value:.4f}"))
+
+        return json_path, csv_path
@@ -2,62 +2,122 @@
 
 import pygame
 import sys
+import hashlib
 import os
 import random
+import time
+import numpy as np
 
 # Importaciones del Proyecto
 from .settings import *
 from .player import Player
 from .camera import CameraHandler
 from .enemy import Enemy
-from .bullet import Bullet
+from .bullet import Bullet, EnemyBullet
 from .menu import GameMenu
+from .frame_timing import StageTimer
+from .motion_filter import create_motion_filter
+from .session_recorder import SessionRecorder
+from .telemetry import telemetry
+from .entity_store import (
+    EntityStore, EntityGroup, WorldGroup, EntityPool,
+    KIND_BULLET, KIND_ENEMY_BULLET, KIND_ENEMY
+)
 
 
 class GameEngine:
     # Implementación del patrón Singleton
     _instance = None
 
-    def __new__(cls):
+    def __new__(cls, headless=False, **kwargs):
+        # Un motor sin cámara ni ventana (repeticiones) no sustituye a la instancia única
+        if headless:
+            return super(GameEngine, cls).__new__(cls)
         if cls._instance is None:
             cls._instance = super(GameEngine, cls).__new__(cls)
         return cls._instance
 
-    def __init__(self):
+    def __init__(self, headless=False, seed=None, time_source=None, source_factory=None):
+        """
+        headless: sin cámara ni pantalla; la simulación se avanza desde fuera (ver replay.py).
+        seed: semilla del generador de enemigos (None = aleatoria).
+        time_source: reloj en segundos para el acumulador de run() (por defecto time.perf_counter).
+        source_factory: crea la fuente de frames de cada captura (por defecto según FRAME_SOURCE).
+        """
         if not hasattr(self, 'initialized'):
             # 1. Configuración de Entorno
-            pygame.init()
-            # Inicializamos la pantalla. Aunque no se dibuje, es necesario para que Pygame capture eventos.
-            self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SHOWN)
+            self.headless = headless
+            # Semilla explícita siempre, para que una sesión grabada pueda repetirse
+            self.seed = random.randrange(2 ** 32) if seed is None else seed
+            self.rng = random.Random(self.seed)
+            self.time_source = time_source or time.perf_counter
+            self.start_time = time.perf_counter()
+            self.first_frame_shown = False
+            if headless:
+                self.screen = None
+            else:
+                # Solo el subsistema de video/eventos: el juego no usa audio ni joystick,
+                # y pygame.init() los arrancaría igualmente (lento en algunos equipos).
+                pygame.display.init()
+                # Inicializamos la pantalla. Aunque no se dibuje, es necesario para que Pygame capture eventos.
+                self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SHOWN)
             self.clock = pygame.time.Clock()
             self.running = True
             self.initialized = True
             self.score = 0
 
             # 5. CREACIÓN DE SPRITES Y GRUPOS
-            self.all_sprites = pygame.sprite.Group()
-            self.enemies = pygame.sprite.Group()
-            self.bullets = pygame.sprite.Group()
-
-            # Control de Disparo
-            self.last_shot = pygame.time.get_ticks()
+            # Balas y enemigos viven en columnas de NumPy (EntityStore); los grupos son adaptadores
+            # con la interfaz de pygame.sprite.Group sobre cada tipo de entidad.
+            self.entities = EntityStore()
+            self.all_sprites = WorldGroup(self.entities)
+            self.enemies = EntityGroup(self.entities, KIND_ENEMY)
+            self.bullets = EntityGroup(self.entities, KIND_BULLET)
+            self.enemy_bullets = EntityGroup(self.entities, KIND_ENEMY_BULLET)
+
+            # Pools acotados: las balas muertas se reutilizan en el siguiente disparo
+            self.bullet_pool = EntityPool(self.entities, Bullet, BULLET_POOL_SIZE)
+            self.enemy_bullet_pool = EntityPool(self.entities, EnemyBullet, ENEMY_BULLET_POOL_SIZE)
+
+            # Simulación de paso fijo: reloj propio (ms de simulación) y acumulador de tiempo real
+            self.sim_dt = 1.0 / SIM_HZ
+            self.sim_time_ms = 0.0
+            self.sim_accumulator = 0.0
+            self.sim_ticks = 0
+            self.sim_time_dropped = 0.0  # Segundos descartados por superar SIM_MAX_CATCHUP_STEPS
+            self._last_loop_time = None
+
+            # Control de Disparo (en tiempo de simulación)
+            self.last_shot = 0
             self.shoot_delay = BULLET_PLAYER_COOLDOWN
 
             # Crea la nave del jugador
             self.player = Player()
             self.all_sprites.add(self.player)
 
+            # Tiempos por etapa del bucle (los comparte el manejador de cámara y su hilo de captura)
+            self.stage_timer = StageTimer(FRAME_TIMING_WINDOW) if FRAME_TIMING_ENABLED else None
+
+            # Filtro/predictor entre la detección y el jugador (MOTION_FILTER)
+            self.motion_filter = create_motion_filter()
+            self._measurement_count = 0
+
+            # Grabación opcional de la sesión (frames los escribe el hilo de captura)
+            self.session_recorder = None
+            if RECORDER_ENABLED and not headless:
+                self.session_recorder = SessionRecorder(seed=self.seed)
+
             # 6. CREACIÓN DEL MANEJADOR DE CÁMARA
-            self.camera_handler = CameraHandler(self)
+            self.camera_handler = None if headless else CameraHandler(self, source_factory)
 
             # 7. CREACIÓN DEL SISTEMA DE MENÚ
             self.menu = GameMenu(self)
 
     def _spawn_enemy(self):
         """Método auxiliar para crear y añadir un enemigo con posición aleatoria."""
-        enemy_x = random.randrange(0, SCREEN_WIDTH)
-        enemy_y = random.randrange(40, SCREEN_HEIGHT // 4)
-        enemy = Enemy(enemy_x, enemy_y)
+        enemy_x = self.rng.randrange(0, SCREEN_WIDTH)
+        enemy_y = self.rng.randrange(40, SCREEN_HEIGHT // 4)
+        enemy = Enemy(enemy_x, enemy_y, now=self.sim_time_ms)
         self.all_sprites.add(enemy)
         self.enemies.add(enemy)
 
@@ -91,17 +151,30 @@ class GameEngine:
         # Asegúrate de que el bottom esté exactamente en el límite.
         self.player.rect.bottom = SCREEN_HEIGHT
      
-        print(f"Pantalla cambiada a: {new_width}x{new_height}")
+        telemetry.info('engine.screen', "Pantalla cambiada a: {width}x{height}",
+                       width=new_width, height=new_height)
 
     # --- MÉTODOS DEL BUCLE PRINCIPAL ---
 
     def _handle_input(self):
         """Gestiona la lógica de Disparo Automático."""
         if self.menu.is_playing():
-            now = pygame.time.get_ticks()
+            now = self.sim_time_ms
             if now - self.last_shot > self.shoot_delay:
                 self.last_shot = now
-                self.player.shoot(self.all_sprites, self.bullets)
+                self.player.shoot(self.bullet_pool)
+
+    def _filter_camera_position(self, raw_x):
+        """
+        Pasa cada medición nueva de la cámara por el filtro de movimiento (con el momento de
+        captura de su frame) y retorna la X predicha para el momento de dibujo. Durante una
+        pérdida corta del marcador la predicción sigue; después retorna None.
+        """
+        handler = self.camera_handler
+        if handler.measurement_count != self._measurement_count:
+            self._measurement_count = handler.measurement_count
+            self.motion_filter.update(raw_x, handler.measurement_time)
+        return self.motion_filter.predict(time.perf_counter() + MOTION_PREDICTION_LEAD_S)
 
     def _process_camera_data(self, player_x):
         """Llama a la cámara para obtener la posición y actualiza al jugador."""
@@ -114,99 +187,244 @@ class GameEngine:
         if not self.menu.is_playing():
             return
 
+        timer = self.stage_timer
+        start = time.perf_counter()
+
         self.all_sprites.update()
         
         #here bugs for presentecion
         self.player.rect.bottom = SCREEN_HEIGHT
         
-        print(f"Posición final del jugador: Y={self.player.rect.bottom}, X={self.player.rect.centerx}")
+        telemetry.debug('engine.player', "Posición final del jugador: Y={y}, X={x}", every=0.5,
+                        y=self.player.rect.bottom, x=self.player.rect.centerx)
+
+        if timer is not None:
+            collisions_start = time.perf_counter()
+            timer.record('update', collisions_start - start)
 
-        # Colisiones
-        hits = pygame.sprite.spritecollide(self.player, self.enemies, False)
-        if hits:
+        # Colisiones (vectorizadas sobre el almacén de entidades)
+        hits = self.entities.collide_rect(self.player.rect, KIND_ENEMY)
+        if len(hits):
             self.menu.game_over()
 
-        hits = pygame.sprite.groupcollide(self.bullets, self.enemies, True, True)
-        if hits:
+        # Equivalente a groupcollide(bullets, enemies, True, True)
+        hit_bullets, hit_enemies = self.entities.collide_kinds(KIND_BULLET, KIND_ENEMY)
+        if len(hit_bullets):
+            self.entities.kill(hit_bullets)
+            self.entities.kill(hit_enemies)
             self.score += 10
             self._spawn_enemy()
 
-    def run(self):
-        """Método principal: implementa el bucle de juego y controla el flujo."""
-        print("Iniciando motor de juego (Lógica Pygame OK). Abriendo cámara...")
+        if timer is not None:
+            timer.record('colisiones', time.perf_counter() - collisions_start)
+
+    def _simulation_step(self):
+        """Un tick de simulación de duración fija (1 / SIM_HZ)."""
+        if self.session_recorder is not None:
+            # Entrada del tick (X del jugador) y estado del generador antes de aplicarlo
+            self.session_recorder.record_tick(self.sim_ticks, self.sim_time_ms, self.menu.is_playing(),
+                                              self.player.rect.centerx, hash(self.rng.getstate()))
+        self.sim_time_ms += 1000.0 / SIM_HZ
+        self.sim_ticks += 1
+        self._handle_input()
+        self._update_game_state()
+
+    def _advance_simulation(self, now):
+        """
+        Acumulador de paso fijo: ejecuta tantos ticks como tiempo real haya pasado desde el
+        frame anterior (como mucho SIM_MAX_CATCHUP_STEPS) y retorna la fracción de tick
+        sobrante (0..1) para interpolar el dibujo. Fuera de la partida no acumula tiempo.
+        """
+        if self._last_loop_time is None:
+            self._last_loop_time = now
+        elapsed = now - self._last_loop_time
+        self._last_loop_time = now
+
+        if not self.menu.is_playing():
+            self.sim_accumulator = 0.0
+            return 1.0
+
+        self.sim_accumulator += elapsed
+        steps = 0
+        while self.sim_accumulator >= self.sim_dt and steps < SIM_MAX_CATCHUP_STEPS:
+            self._simulation_step()
+            self.sim_accumulator -= self.sim_dt
+            steps += 1
+            if not self.menu.is_playing():  # GAME OVER durante la recuperación
+                self.sim_accumulator = 0.0
+                return 1.0
+
+        # Un retraso mayor (p. ej. al cambiar de cámara) se descarta en lugar de acelerar el juego
+        if self.sim_accumulator >= self.sim_dt:
+            remainder = self.sim_accumulator % self.sim_dt
+            self.sim_time_dropped += self.sim_accumulator - remainder
+            self.sim_accumulator = remainder
+
+        if not SIM_RENDER_INTERPOLATION:
+            return 1.0
+        return self.sim_accumulator / self.sim_dt
+
+    def run(self, runner=ENGINE_RUNNER):
+        """
+        Método principal: implementa el bucle de juego y controla el flujo.
+        runner: "loop" (bucle secuencial) o "asyncio" (etapas como tareas, ver async_runner.py).
+        """
+        telemetry.info('engine.start', "Iniciando motor de juego (Lógica Pygame OK). Abriendo cámara...")
 
         if not self.initialized:
             self.__init__()
 
+        if runner == "asyncio":
+            # Importación diferida: asyncio y los ejecutores solo hacen falta con este modo
+            from .async_runner import AsyncGameRunner
+            AsyncGameRunner(self).run()
+        elif runner == "loop":
+            self._run_loop()
+        else:
+            raise ValueError(f"Modo de bucle desconocido: {runner}")
+
+        self._shutdown()
+
+    def _run_loop(self):
+        """Bucle secuencial: eventos, cámara, simulación y ventana en cada iteración."""
+        # Marcas de tiempo por etapa (no hacen nada si la instrumentación está desactivada)
+        timer = self.stage_timer
+        start_frame = timer.start_frame if timer is not None else (lambda: None)
+        lap = timer.lap if timer is not None else (lambda stage: None)
+
         while self.running:
+            start_frame()
+
             # 1. Captura de eventos Pygame (QUIT) y manejo de tiempo
             # Mantenemos pump() aquí para asegurar que Pygame esté activo.
             pygame.event.pump()
             self.clock.tick(FPS)
+            lap('espera')
+            busy_start = time.perf_counter()
 
-            # Procesar eventos Pygame normales (solo necesitamos QUIT)
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.running = False
-
-                # Intentamos pasar los eventos a Pygame Menu por si acaso funciona en el sistema del usuario
-                # (Aunque la entrada de CV2 es la que usamos para la navegación forzada)
-                menu_action = self.menu.handle_input(event)
-                if menu_action == "QUIT":
-                    self.running = False
+            self._handle_pygame_events()
+            lap('eventos')
 
             # 2. Lógica del Juego (Solo si estamos jugando)
-            player_x = self.camera_handler.get_position()
+            player_x = self._filter_camera_position(self.camera_handler.get_position())
             self._process_camera_data(player_x) 
             
             # Movemos la nave solo si estamos jugando.
             if self.menu.is_playing() and self.player: 
                  self.player.set_position_from_camera(player_x)
+            lap('camara')
                  
-            self._handle_input()
-            self._update_game_state()
+            # Ticks de simulación pendientes; alpha es la fracción de tick para interpolar el dibujo
+            alpha = self._advance_simulation(self.time_source())
+            lap('simulacion')
 
             # 3. DIBUJO Y OBTENCIÓN DE LA TECLA CV2 (CRÍTICO)
-            sprites_data = self.get_sprites_data()
+            render_list = self.get_render_list(alpha)
+            lap('render_list')
 
             # Una sola llamada: dibuja la ventana y obtiene la tecla pulsada.
-            key_cv2 = self.camera_handler.draw_window(sprites_data)
+            key_cv2 = self.camera_handler.draw_window(render_list)
+            lap('ventana')
+
+            # Tiempo de trabajo del frame (sin la espera del reloj) para el regulador de calidad
+            self.camera_handler.report_frame_time(time.perf_counter() - busy_start)
 
             # 4. Procesamiento de la Tecla CV2 (Navegación Forzada)
-            # Usamos el valor de la tecla CV2 para simular la entrada del menú.
-            if not self.menu.is_playing():
-                # Mapeo de ASCII (CV2) a Eventos de Pygame para el menú
-                # 119='w' (Arriba), 115='s' (Abajo), 13=ENTER (Seleccionar), 27=ESCAPE (Volver)
-                if key_cv2 == ord('w'):
-                    self.menu.handle_input_cv2_shim(pygame.K_w)
-                elif key_cv2 == ord('s'):
-                    self.menu.handle_input_cv2_shim(pygame.K_s)
-                elif key_cv2 == 13:
-                    self.menu.handle_input_cv2_shim(pygame.K_RETURN)
-                elif key_cv2 == 27:
-                    self.menu.handle_input_cv2_shim(pygame.K_ESCAPE)
-
-        # Limpieza final (FUERA DEL BUCLE)
+            self._handle_window_keys(key_cv2)
+
+    def _handle_pygame_events(self):
+        """Procesa los eventos Pygame pendientes (solo necesitamos QUIT)."""
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                self.running = False
+
+            # Intentamos pasar los eventos a Pygame Menu por si acaso funciona en el sistema del usuario
+            # (Aunque la entrada de CV2 es la que usamos para la navegación forzada)
+            menu_action = self.menu.handle_input(event)
+            if menu_action == "QUIT":
+                self.running = False
+
+    def _handle_window_keys(self, key_cv2):
+        """
+        Tecla devuelta por draw_window y, con el hilo de presentación, las que llegaron por su
+        cola desde el frame anterior (la ventana no se espera en el bucle).
+        """
+        self._handle_cv2_key(key_cv2)
+        for key in self.camera_handler.poll_keys():
+            self._handle_cv2_key(key)
+
+    def _handle_cv2_key(self, key_cv2):
+        """
+        Tecla devuelta por la ventana de CV2 tras mostrar un frame (None si no se mostró):
+        fuera de la partida se traduce a la entrada del menú.
+        """
+        if not self.first_frame_shown and key_cv2 is not None:
+            self.first_frame_shown = True
+            telemetry.info('engine.start', "Primer frame en pantalla a los {ms:.0f} ms",
+                           ms=(time.perf_counter() - self.start_time) * 1000)
+
+        # Usamos el valor de la tecla CV2 para simular la entrada del menú.
+        if not self.menu.is_playing():
+            # Mapeo de ASCII (CV2) a Eventos de Pygame para el menú
+            # 119='w' (Arriba), 115='s' (Abajo), 13=ENTER (Seleccionar), 27=ESCAPE (Volver)
+            if key_cv2 == ord('w'):
+                self.menu.handle_input_cv2_shim(pygame.K_w)
+            elif key_cv2 == ord('s'):
+                self.menu.handle_input_cv2_shim(pygame.K_s)
+            elif key_cv2 == 13:
+                self.menu.handle_input_cv2_shim(pygame.K_RETURN)
+            elif key_cv2 == 27:
+                self.menu.handle_input_cv2_shim(pygame.K_ESCAPE)
+
+    def _shutdown(self):
+        """Limpieza final (fuera del bucle): estadísticas, cámara, grabación y salida."""
+        timer = self.stage_timer
+        telemetry.info('engine.stats', "Simulación: {ticks} ticks a {hz} Hz, {dropped:.2f} s descartados por retraso",
+                       ticks=self.sim_ticks, hz=SIM_HZ, dropped=self.sim_time_dropped)
+        for name, pool in (("Balas", self.bullet_pool), ("Balas enemigas", self.enemy_bullet_pool)):
+            telemetry.info('engine.stats', "{name}: creadas {created}, reutilizadas {reused}, "
+                           "rechazadas {rejected}, pico vivas {peak_live}", name=name, **pool.get_stats())
         self.camera_handler.release_resources()
+        if self.session_recorder is not None:
+            self.session_recorder.close()
+        if timer is not None and FRAME_TIMING_DUMP_PATH:
+            json_path, csv_path = timer.dump(FRAME_TIMING_DUMP_PATH)
+            telemetry.info('engine.stats', "Tiempos por etapa guardados en {json_path} y {csv_path}",
+                           json_path=json_path, csv_path=csv_path)
+        telemetry.close()
         pygame.quit()
         sys.exit()
 
-    def get_sprites_data(self):
-        """Retorna la posición de todos los sprites activos para el overlay de la cámara."""
-        data = []
-        for sprite in self.all_sprites:
-            # ... (Lógica de color y recolección de datos sin cambios)
-            if isinstance(sprite, Player):
-                color = (0, 0, 255)  # BLUE
-            elif isinstance(sprite, Enemy):
-                color = (255, 0, 0)  # RED
-            elif isinstance(sprite, Bullet):
-                color = (255, 255, 0)  # YELLOW
-            else:
-                color = (0, 0, 0)  # BLACK
-
-            data.append({
-                'rect': sprite.rect,
-                'color': color
-            })
-        return data
\ No newline at end of file
+    def state_hash(self):
+        """
+        Huella (hex) del estado de la simulación: tick, puntuación, estado del menú, jugador
+        y columnas de las entidades vivas. Dos ejecuciones con la misma semilla y las mismas
+        posiciones deben dar la misma secuencia de huellas.
+        """
+        digest = hashlib.blake2b(digest_size=8)
+        header = (self.sim_ticks, self.score, *self.player.rect)
+        digest.update(np.array(header, dtype=np.int64).tobytes())
+        digest.update(self.menu.current_state.encode())
+        self.entities.update_digest(digest)
+        return digest.hexdigest()
+
+    def get_render_list(self, alpha=1.0):
+        """
+        Retorna la lista de dibujo del overlay de la cámara como arrays de NumPy:
+        rects (N, 4) int32 con [x, y, ancho, alto] en px de pantalla y colors (N, 3) uint8 RGB.
+        Los rects de balas y enemigos salen directamente de las columnas del almacén,
+        interpolados con `alpha` entre los dos últimos ticks. El jugador sigue a la cámara
+        en cada frame y no se interpola.
+        """
+        batches = (
+            (np.array([self.player.rect], dtype=np.int32), BLUE),
+            (self.entities.rects(KIND_ENEMY, alpha=alpha), RED),
+            (self.entities.rects(KIND_BULLET, alpha=alpha), YELLOW),
+            (self.entities.rects(KIND_ENEMY_BULLET, alpha=alpha), RED),
+        )
+
+        rects = [group_rects for group_rects, _ in batches]
+        colors = [np.broadcast_to(np.array(color, dtype=np.uint8), (len(group_rects), 3))
+                  for group_rects, color in batches]
+
+        return np.concatenate(rects), np.concatenate(colors)
@@ -12,6 +12,7 @@ from .settings import (SCREEN_WIDTH, SCREEN_HEIGHT,
 # Importación de clases de sprites (CRÍTICO: Necesario para reset_game_state)
 from .player import Player
 from .enemy import Enemy
+from .telemetry import telemetry
 
 
 class GameMenu:
@@ -19,6 +20,12 @@ class GameMenu:
     Sistema de menú para el juego Space Invaders Origami.
     Maneja la interfaz de usuario y los estados del juego (MENU, OPTIONS, PLAYING, GAME_OVER).
     """
+
+    # Peso del frame de cámara bajo el fondo semi-transparente de cada pantalla
+    LAYER_ALPHA = {"MENU": 0.3, "OPTIONS": 0.3, "GAME_OVER": 0.2}
+
+    # Máximo de capas en caché (una por estado y opción seleccionada)
+    LAYER_CACHE_SIZE = 16
     
     def __init__(self, game_engine):
         self.game = game_engine
@@ -35,31 +42,76 @@ class GameMenu:
         self.font = cv2.FONT_HERSHEY_SIMPLEX
         self.font_scale = 1.0
         self.thickness = 2
-        
+
+        # Capas pre-renderizadas de cada pantalla: {(estado, opción, puntuación): (imagen, máscara, alpha)}
+        self._layer_cache = {}
+        self._layer_size = None
+
     # 💥 Método draw actualizado para recibir las dimensiones de la cámara
     def draw(self, frame, cam_width, cam_height):
         """
         Método central de dibujo llamado por GameEngine (Alta Cohesión).
         Recibe las dimensiones reales de la ventana CV2 para el centrado.
+        El contenido del menú se toma de una capa pre-renderizada; por frame solo se
+        oscurece el fondo y se copia la capa a través de su máscara.
         """
-        if self.current_state == "MENU":
-            self.draw_menu(frame, cam_width, cam_height)
-        elif self.current_state == "OPTIONS":
-            self.draw_options_menu(frame, cam_width, cam_height)
-        elif self.current_state == "GAME_OVER":
-            self.draw_game_over(frame, cam_width, cam_height)
-            
+        layer = self._get_layer(cam_width, cam_height)
+        if layer is None:
+            return
+
+        image, mask, alpha = layer
+        self._dim_background(frame, alpha)
+        cv2.copyTo(image, mask, frame)
+
+    def _get_layer(self, cam_width, cam_height):
+        """
+        Retorna (imagen, máscara, alpha) de la pantalla actual, renderizándola solo si cambió
+        el estado, la opción seleccionada, la resolución o (en GAME_OVER) la puntuación.
+        """
+        if self.current_state not in self.LAYER_ALPHA:
+            return None
+
+        score = self.game.score if self.current_state == "GAME_OVER" else None
+        key = (self.current_state, self.selected_option, score)
+
+        # Un cambio de resolución invalida todas las capas
+        if self._layer_size != (cam_width, cam_height):
+            self._layer_cache.clear()
+            self._layer_size = (cam_width, cam_height)
+
+        layer = self._layer_cache.get(key)
+        if layer is None:
+            if len(self._layer_cache) >= self.LAYER_CACHE_SIZE:
+                self._layer_cache.clear()
+
+            image = np.zeros((cam_height, cam_width, 3), dtype=np.uint8)
+            if self.current_state == "MENU":
+                self.draw_menu(image, cam_width, cam_height)
+            elif self.current_state == "OPTIONS":
+                self.draw_options_menu(image, cam_width, cam_height)
+            elif self.current_state == "GAME_OVER":
+                self.draw_game_over(image, cam_width, cam_height)
+
+            # Todos los colores del menú son distintos de negro: cualquier canal > 0 es texto
+            mask = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+            mask[mask > 0] = 255
+            layer = (image, mask, self.LAYER_ALPHA[self.current_state])
+            self._layer_cache[key] = layer
+
+        return layer
+
+    def _dim_background(self, frame, alpha):
+        """
+        Oscurece el frame en el lugar (fondo semi-transparente).
+        Equivale a mezclar un rectángulo negro con peso (1 - alpha), sin copiar el frame.
+        """
+        cv2.addWeighted(frame, alpha, frame, 0, 0, dst=frame)
+
     # 💥 Método draw_menu actualizado para usar cam_width y cam_height
     def draw_menu(self, frame, cam_width, cam_height):
         """
-        Dibuja el menú principal en el frame de la cámara.
+        Dibuja el menú principal sobre la capa del menú (el fondo lo aplica draw()).
         """
-        # Fondo semi-transparente
-        overlay = frame.copy()
-        # 💥 Reemplazar CAM_WIDTH, CAM_HEIGHT por los argumentos
-        cv2.rectangle(overlay, (0, 0), (cam_width, cam_height), (0, 0, 0), -1) 
-        cv2.addWeighted(overlay, 0.7, frame, 0.3, 0, frame)
-        
         # Título del juego
         title_text = "SPACE INVADERS ORIGAMI"
         title_size = cv2.getTextSize(title_text, self.font, 1.5, 3)[0]
@@ -110,13 +162,8 @@ class GameMenu:
     # 💥 Método draw_options_menu actualizado para usar cam_width y cam_height
     def draw_options_menu(self, frame, cam_width, cam_height):
         """
-        Dibuja el submenú de opciones de tamaño de pantalla.
+        Dibuja el submenú de opciones de tamaño de pantalla sobre la capa del menú.
         """
-        overlay = frame.copy()
-        # 💥 Reemplazar CAM_WIDTH, CAM_HEIGHT por los argumentos
-        cv2.rectangle(overlay, (0, 0), (cam_width, cam_height), (0, 0, 0), -1)
-        cv2.addWeighted(overlay, 0.7, frame, 0.3, 0, frame)
-        
         title_text = "SELECCIONAR TAMAÑO DE PANTALLA"
         title_size = cv2.getTextSize(title_text, self.font, 1.0, 2)[0]
         # 💥 Reemplazar CAM_WIDTH por el argumento
@@ -150,14 +197,8 @@ class GameMenu:
     # 💥 Método draw_game_over actualizado para usar cam_width y cam_height
     def draw_game_over(self, frame, cam_width, cam_height):
         """
-        Dibuja la pantalla de Game Over.
+        Dibuja la pantalla de Game Over sobre la capa del menú.
         """
-        # Fondo semi-transparente
-        overlay = frame.copy()
-        # 💥 Reemplazar CAM_WIDTH, CAM_HEIGHT por los argumentos
-        cv2.rectangle(overlay, (0, 0), (cam_width, cam_height), (0, 0, 0), -1)
-        cv2.addWeighted(overlay, 0.8, frame, 0.2, 0, frame)
-        
         # Texto Game Over
         game_over_text = "GAME OVER"
         text_size = cv2.getTextSize(game_over_text, self.font, 2.0, 4)[0]
@@ -201,7 +242,7 @@ class GameMenu:
         if event.type == pygame.KEYDOWN:
             
             # Dejamos el debug aquí, aunque ahora el shim es el que lo activará
-            print(f"DEBUG: Tecla detectada: {pygame.key.name(event.key)}")
+            telemetry.debug('menu.key', "Tecla detectada: {key}", key=pygame.key.name(event.key))
             
         if event.type != pygame.KEYDOWN:
             return None
@@ -288,7 +329,7 @@ class GameMenu:
         self.current_state = "PLAYING"
         self.game.running = True
         self.reset_game_state()
-        print("¡Juego iniciado!")
+        telemetry.info('menu.state', "¡Juego iniciado!")
     
     def restart_game(self):
         """
@@ -297,7 +338,7 @@ class GameMenu:
         self.current_state = "PLAYING"
         self.game.running = True
         self.reset_game_state()
-        print("¡Partida reiniciada!")
+        telemetry.info('menu.state', "¡Partida reiniciada!")
     
     def return_to_menu(self):
         """
@@ -305,7 +346,7 @@ class GameMenu:
         """
         self.current_state = "MENU"
         self.selected_option = 0
-        print("Regresando al menú principal...")
+        telemetry.info('menu.state', "Regresando al menú principal...")
     
     def game_over(self):
         """
@@ -313,7 +354,7 @@ class GameMenu:
         """
         self.current_state = "GAME_OVER"
         self.selected_option = 0
-        print("¡Game Over!")
+        telemetry.info('menu.state', "¡Game Over!")
     
     def reset_game_state(self):
         """
@@ -338,14 +379,14 @@ class GameMenu:
             else:
                 enemy_x = random.randrange(0, SCREEN_WIDTH)
                 enemy_y = random.randrange(50, SCREEN_HEIGHT // 4)
-                enemy = Enemy(enemy_x, enemy_y)
+                enemy = Enemy(enemy_x, enemy_y, now=getattr(self.game, 'sim_time_ms', 0.0))
                 self.game.all_sprites.add(enemy)
                 self.game.enemies.add(enemy)
         
         # Resetear el control de disparo
         self.game.last_shot = 0
         
-        print("Estado del juego reiniciado")
+        telemetry.info('menu.state', "Estado del juego reiniciado")
     
     def is_playing(self):
         """
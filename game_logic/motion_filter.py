@@ -0,0 +1,176 @@
+# game_logic/motion_filter.py
+
+import math
+
+from .settings import (
+    SMOOTHING_ALPHA, MOTION_FILTER, MOTION_MAX_EXTRAPOLATION_S, MOTION_DROPOUT_FILL_S,
+    ONE_EURO_MIN_CUTOFF, ONE_EURO_BETA, ONE_EURO_D_CUTOFF,
+    KALMAN_ACCEL_NOISE, KALMAN_MEASUREMENT_NOISE
+)
+
+
+class MotionFilter:
+    """
+    Etapa entre la detección y el jugador: filtra la X medida y la extrapola al momento
+    de dibujo con su velocidad estimada (compensa la latencia de captura + detección).
+
+    update(x, t) recibe cada medición nueva con el instante de captura de su frame
+    (x = None si el marcador no se detectó). predict(t) retorna la X estimada en t:
+    - la extrapolación se limita a max_extrapolation segundos desde la última medición;
+    - tras una pérdida del marcador se sigue prediciendo durante dropout_fill segundos
+      y después retorna None (el jugador se queda donde está);
+    - si la pérdida fue más larga, la siguiente medición reinicia el filtro.
+    Las subclases implementan _reset(x, t), _correct(x, dt) y _extrapolate(lead).
+    """
+
+    def __init__(self, max_extrapolation=MOTION_MAX_EXTRAPOLATION_S, dropout_fill=MOTION_DROPOUT_FILL_S):
+        self.max_extrapolation = max_extrapolation
+        self.dropout_fill = dropout_fill
+        self._last_valid_time = None  # Instante de la última medición con marcador
+
+    def reset(self):
+        self._last_valid_time = None
+
+    def update(self, x, t):
+        if x is None or t is None:
+            return
+
+        last = self._last_valid_time
+        if last is None or t - last > self.dropout_fill:
+            self._reset(x, t)
+        elif t > last:
+            self._correct(x, t - last)
+        self._last_valid_time = t
+
+    def predict(self, t):
+        last = self._last_valid_time
+        if last is None or t - last > self.dropout_fill:
+            return None
+        lead = min(max(t - last, 0.0), self.max_extrapolation)
+        return int(round(self._extrapolate(lead)))
+
+    def _reset(self, x, t):
+        raise NotImplementedError
+
+    def _correct(self, x, dt):
+        raise NotImplementedError
+
+    def _extrapolate(self, lead):
+        raise NotImplementedError
+
+
+class PassthroughFilter(MotionFilter):
+    """Sin filtrado: la última medición tal cual (solo rellena pérdidas cortas)."""
+
+    def _reset(self, x, t):
+        self.x = x
+
+    def _correct(self, x, dt):
+        self.x = x
+
+    def _extrapolate(self, lead):
+        return self.x
+
+
+class ExponentialFilter(MotionFilter):
+    """Media móvil exponencial con SMOOTHING_ALPHA (peso de la medición nueva). No extrapola."""
+
+    def __init__(self, alpha=SMOOTHING_ALPHA, **kwargs):
+        super().__init__(**kwargs)
+        self.alpha = alpha
+
+    def _reset(self, x, t):
+        self.x = float(x)
+
+    def _correct(self, x, dt):
+        self.x += self.alpha * (x - self.x)
+
+    def _extrapolate(self, lead):
+        return self.x
+
+
+class OneEuroFilter(MotionFilter):
+    """
+    Filtro One Euro (Casiez et al., 2012): paso bajo cuya frecuencia de corte sube con la
+    velocidad, así suaviza el temblor en reposo sin añadir retraso en los movimientos rápidos.
+    La velocidad filtrada (px/s) se usa también para extrapolar.
+    """
+
+    def __init__(self, min_cutoff=ONE_EURO_MIN_CUTOFF, beta=ONE_EURO_BETA,
+                 d_cutoff=ONE_EURO_D_CUTOFF, **kwargs):
+        super().__init__(**kwargs)
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+
+    @staticmethod
+    def _smoothing(cutoff, dt):
+        tau = 1.0 / (2.0 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def _reset(self, x, t):
+        self.x = float(x)
+        self.dx = 0.0
+
+    def _correct(self, x, dt):
+        raw_dx = (x - self.x) / dt
+        self.dx += self._smoothing(self.d_cutoff, dt) * (raw_dx - self.dx)
+        cutoff = self.min_cutoff + self.beta * abs(self.dx)
+        self.x += self._smoothing(cutoff, dt) * (x - self.x)
+
+    def _extrapolate(self, lead):
+        return self.x + self.dx * lead
+
+
+class KalmanFilter(MotionFilter):
+    """
+    Kalman de velocidad constante sobre [posición, velocidad] con aceleración como ruido
+    blanco (accel_noise en px/s², measurement_noise en px). Matrices 2x2 en floats.
+    """
+
+    def __init__(self, accel_noise=KALMAN_ACCEL_NOISE, measurement_noise=KALMAN_MEASUREMENT_NOISE, **kwargs):
+        super().__init__(**kwargs)
+        self.q = accel_noise ** 2
+        self.r = measurement_noise ** 2
+
+    def _reset(self, x, t):
+        self.x = float(x)
+        self.v = 0.0
+        # Velocidad inicial desconocida: varianza grande
+        self.p00, self.p01, self.p11 = self.r, 0.0, 1e6
+
+    def _correct(self, x, dt):
+        # 1. Predicción: x += v*dt, P = F P F' + Q
+        self.x += self.v * dt
+        p00 = self.p00 + dt * (2 * self.p01 + dt * self.p11) + self.q * dt ** 4 / 4
+        p01 = self.p01 + dt * self.p11 + self.q * dt ** 3 / 2
+        p11 = self.p11 + self.q * dt ** 2
+
+        # 2. Corrección con la medición de posición
+        s = p00 + self.r
+        k0, k1 = p00 / s, p01 / s
+        residual = x - self.x
+        self.x += k0 * residual
+        self.v += k1 * residual
+        self.p00 = (1 - k0) * p00
+        self.p01 = (1 - k0) * p01
+        self.p11 = p11 - k1 * p01
+
+    def _extrapolate(self, lead):
+        return self.x + self.v * lead
+
+
+MOTION_FILTERS = {
+    'none': PassthroughFilter,
+    'ema': ExponentialFilter,
+    'one_euro': OneEuroFilter,
+    'kalman': KalmanFilter,
+}
+
+
+def create_motion_filter(name=MOTION_FILTER, **kwargs):
+    """Crea el filtro configurado ('none', 'ema', 'one_euro' o 'kalman')."""
+    try:
+        return MOTION_FILTERS[name](**kwargs)
+    except KeyError:
+        raise ValueError(f"Filtro de movimiento desconocido: {name}") from None
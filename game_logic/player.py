@@ -1,7 +1,6 @@
 import pygame
 # Importamos todas las constantes necesarias
 from .settings import SCREEN_WIDTH, SCREEN_HEIGHT, PLAYER_SPEED, BLUE 
-from .bullet import Bullet 
 
 class Player(pygame.sprite.Sprite):
     
@@ -40,11 +39,10 @@ class Player(pygame.sprite.Sprite):
             
             self.rect.centerx = new_center_x
         
-    def shoot(self, all_sprites, bullets):
+    def shoot(self, bullet_pool):
         """
-        Crea una instancia de Bullet en la posición actual de la nave.
+        Saca una Bullet del pool en la posición actual de la nave.
+        El pool la da de alta en el almacén (all_sprites y bullets la ven sin añadirla).
+        Retorna la bala, o None si se alcanzó el límite de balas vivas.
         """
-        new_bullet = Bullet(self.rect.centerx, self.rect.top) 
-        
-        all_sprites.add(new_bullet)
-        bullets.add(new_bullet)
\ No newline at end of file
+        return bullet_pool.acquire(self.rect.centerx, self.rect.top)
\ No newline at end of file
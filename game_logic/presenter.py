@@ -0,0 +1,97 @@
+# game_logic/presenter.py
+
+import queue
+import threading
+
+import cv2
+
+from .capture import LatestFrameMailbox
+from .settings import PRESENTER_IDLE_POLL_S, PRESENTER_KEY_QUEUE
+from .telemetry import telemetry
+
+
+class PresenterThread(threading.Thread):
+    """
+    Hilo dueño de la ventana de CV2. El bucle del juego compone cada frame directamente en
+    `writable()` y lo entrega con `submit()` sin esperar: el buzón (LatestFrameMailbox sobre
+    los tres búferes FramePool.present, un solo frame pendiente) descarta los frames que el
+    hilo no llegó a mostrar y nunca entrega para componer el que se está mostrando. Las teclas
+    que devuelve waitKey vuelven al bucle por una cola acotada (ver `poll_keys()`).
+
+    `show` muestra un frame y retorna la tecla (CameraHandler.show_frame: imshow + waitKey).
+    Sin frames nuevos el hilo sigue atendiendo la ventana cada PRESENTER_IDLE_POLL_S para
+    no perder teclas (p. ej. en el menú con la cámara parada).
+    """
+
+    def __init__(self, show, buffers):
+        super().__init__(name="PresenterThread", daemon=True)
+        self.show = show
+        self.mailbox = LatestFrameMailbox(buffers)
+        self._dropped_before = 0  # Frames descartados por buzones anteriores (cambios de cámara)
+        self.keys = queue.Queue(PRESENTER_KEY_QUEUE)
+        self._frame_ready = threading.Event()
+        self._stop_event = threading.Event()
+        self.frames_shown = 0
+        self.keys_dropped = 0
+
+    def writable(self):
+        """Búfer donde componer el próximo frame (el hilo nunca lo está mostrando)."""
+        return self.mailbox.writable()
+
+    def set_buffers(self, buffers):
+        """
+        Cambia a los búferes de otra resolución (al instalar una captura nueva). El frame que
+        el hilo esté mostrando sigue en el buzón anterior, que nadie vuelve a escribir.
+        """
+        self._dropped_before += self.mailbox.frames_dropped
+        self.mailbox = LatestFrameMailbox(buffers)
+
+    def submit(self, frame):
+        """Entrega un frame compuesto en writable(); el anterior se descarta si aún no se mostró."""
+        self.mailbox.put(frame, 0.0)
+        self._frame_ready.set()
+
+    def poll_keys(self):
+        """Teclas pulsadas desde la última llamada, en orden (sin bloquear)."""
+        keys = []
+        while True:
+            try:
+                keys.append(self.keys.get_nowait())
+            except queue.Empty:
+                return keys
+
+    def run(self):
+        last_mailbox, last_seq = None, 0
+        while not self._stop_event.is_set():
+            if self._frame_ready.wait(PRESENTER_IDLE_POLL_S):
+                self._frame_ready.clear()
+
+            mailbox = self.mailbox
+            frame, seq, _ = mailbox.get()
+            if frame is not None and (mailbox is not last_mailbox or seq != last_seq):
+                last_mailbox, last_seq = mailbox, seq
+                key = self.show(frame)
+                self.frames_shown += 1
+            elif self.frames_shown:
+                # La ventana ya existe: procesar sus eventos aunque no haya frame nuevo
+                key = cv2.waitKey(1)
+            else:
+                continue
+
+            if key != -1:
+                try:
+                    self.keys.put_nowait(key)
+                except queue.Full:
+                    self.keys_dropped += 1
+
+        cv2.destroyAllWindows()
+
+    def stop(self, timeout=1.0):
+        """Detiene el hilo y cierra la ventana (desde el propio hilo, que es su dueño)."""
+        self._stop_event.set()
+        self._frame_ready.set()
+        if self.is_alive() and threading.current_thread() is not self:
+            self.join(timeout)
+        telemetry.info('presenter.stats', "Ventana: {shown} frames mostrados, {dropped} descartados, "
+                       "{keys} teclas perdidas", shown=self.frames_shown,
+                       dropped=self._dropped_before + self.mailbox.frames_dropped, keys=self.keys_dropped)
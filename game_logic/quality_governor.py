@@ -0,0 +1,160 @@
+# game_logic/quality_governor.py
+
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from .settings import (
+    CAM_RES_SD, QUALITY_TARGET_FRAME_MS, QUALITY_WINDOW_FRAMES, QUALITY_PERCENTILE,
+    QUALITY_DOWN_RATIO, QUALITY_UP_RATIO, QUALITY_UP_HOLD_S, QUALITY_UP_HOLD_MAX_S,
+    QUALITY_COOLDOWN_S, QUALITY_MAX_STRIDE
+)
+from .telemetry import telemetry
+
+# Un escalón de calidad: resolución de captura, niveles de pirámide de la detección y
+# cada cuántos frames nuevos se ejecuta la detección
+QualityLevel = namedtuple('QualityLevel', 'cam_size pyramid_levels stride')
+
+
+def build_quality_ladder(cam_size, pyramid_levels, max_stride=QUALITY_MAX_STRIDE, allow_resize=True):
+    """
+    Escalones de más a menos calidad a partir de la configuración elegida para la pantalla.
+    Primero se reduce la escala de la detección (apenas se nota), después la resolución de
+    captura (abarata también la composición y la ventana) y por último la frecuencia de la
+    detección (el filtro de movimiento predice entre detecciones).
+    Con allow_resize=False no hay escalón de resolución (la cámara no pudo cambiarla).
+    """
+    ladder = [QualityLevel(cam_size, pyramid_levels, 1),
+              QualityLevel(cam_size, pyramid_levels + 1, 1)]
+
+    size, levels = cam_size, pyramid_levels + 1
+    if allow_resize and cam_size[0] * cam_size[1] > CAM_RES_SD[0] * CAM_RES_SD[1]:
+        # A SD la pirámide necesita un nivel menos para la misma escala de detección
+        size, levels = CAM_RES_SD, max(pyramid_levels - 1, 0) + 1
+        ladder.append(QualityLevel(size, levels, 1))
+
+    for stride in range(2, max_stride + 1):
+        ladder.append(QualityLevel(size, levels, stride))
+    return ladder
+
+
+class QualityGovernor:
+    """
+    Ajusta la calidad en tiempo de ejecución según el tiempo de trabajo por frame (sin la
+    espera del reloj). Cada QUALITY_WINDOW_FRAMES frames compara su percentil con el objetivo:
+    - por encima de target * QUALITY_DOWN_RATIO baja un escalón;
+    - por debajo de target * QUALITY_UP_RATIO durante QUALITY_UP_HOLD_S sube uno.
+    Histéresis: tras cada cambio hay QUALITY_COOLDOWN_S sin decisiones, y cada vez que un
+    escalón resulta demasiado lento se duplica la espera para volver a él (hasta
+    QUALITY_UP_HOLD_MAX_S), así no oscila entre dos escalones.
+    """
+
+    def __init__(self, target_ms=QUALITY_TARGET_FRAME_MS, window=QUALITY_WINDOW_FRAMES,
+                 percentile=QUALITY_PERCENTILE, time_source=time.perf_counter):
+        self.target_ms = target_ms
+        self.percentile = percentile
+        self.time_source = time_source
+        self._samples = np.zeros(window, dtype=np.float64)
+        self._count = 0
+        self.ladder = []
+        self.level = 0
+        self.changes = 0
+
+    def reset(self, cam_size, pyramid_levels):
+        """Vuelve al escalón más alto para la configuración de la pantalla actual."""
+        self.ladder = build_quality_ladder(cam_size, pyramid_levels)
+        self.level = 0
+        self._previous_level = None  # Escalón antes del último cambio (ver revert)
+        self._up_hold = [QUALITY_UP_HOLD_S] * len(self.ladder)
+        self._headroom_since = None
+        self.hold()
+        return self.ladder[0]
+
+    def hold(self):
+        """Descarta las muestras y aplaza las decisiones (p. ej. mientras se abre una cámara)."""
+        self._count = 0
+        self._cooldown_until = self.time_source() + QUALITY_COOLDOWN_S
+
+    @property
+    def current(self):
+        return self.ladder[self.level]
+
+    def observe(self, seconds):
+        """
+        Registra el tiempo de trabajo de un frame. Retorna el nuevo QualityLevel si hay que
+        cambiar de escalón, o None.
+        """
+        self._samples[self._count] = seconds
+        self._count += 1
+        if self._count < len(self._samples):
+            return None
+        self._count = 0
+
+        now = self.time_source()
+        if now < self._cooldown_until or not self.ladder:
+            return None
+
+        frame_ms = float(np.percentile(self._samples, self.percentile)) * 1000
+        if frame_ms > self.target_ms * QUALITY_DOWN_RATIO:
+            self._headroom_since = None
+            if self.level == len(self.ladder) - 1:
+                return None
+            # Este escalón no da abasto: tardará más en volver a intentarse
+            self._up_hold[self.level] = min(self._up_hold[self.level] * 2, QUALITY_UP_HOLD_MAX_S)
+            return self._change(self.level + 1, frame_ms, now)
+
+        if frame_ms < self.target_ms * QUALITY_UP_RATIO and self.level > 0:
+            if self._headroom_since is None:
+                self._headroom_since = now
+            elif now - self._headroom_since >= self._up_hold[self.level - 1]:
+                self._headroom_since = None
+                return self._change(self.level - 1, frame_ms, now)
+        else:
+            self._headroom_since = None
+        return None
+
+    def revert(self, cam_size):
+        """
+        El último cambio pedía otra resolución y la cámara nueva no llegó a instalarse: vuelve
+        al escalón anterior si es el de la captura real (`cam_size`). Tras un descenso fallido
+        el escalonado se rehace sin cambio de resolución (no se vuelve a intentar); tras un
+        ascenso fallido se espera QUALITY_UP_HOLD_MAX_S antes de reintentarlo.
+        Retorna False si no hay un escalón al que volver (el llamador debe usar reset()).
+        """
+        previous = self._previous_level
+        if previous is None or self.ladder[previous].cam_size != cam_size:
+            return False
+
+        failed, self.level = self.level, previous
+        self._previous_level = None
+        if failed > previous:
+            base = self.ladder[0]
+            self.ladder = build_quality_ladder(base.cam_size, base.pyramid_levels, allow_resize=False)
+            self._up_hold = (self._up_hold[:previous + 1] +
+                             [QUALITY_UP_HOLD_S] * (len(self.ladder) - previous - 1))
+        else:
+            self._up_hold[failed] = QUALITY_UP_HOLD_MAX_S
+        self._headroom_since = None
+        self.hold()
+
+        telemetry.warning('quality.level', "Calidad {level}/{last}: la cámara no cambió de resolución, "
+                          "se vuelve a {width}x{height}", level=self.level, last=len(self.ladder) - 1,
+                          width=cam_size[0], height=cam_size[1])
+        return True
+
+    def _change(self, level, frame_ms, now):
+        self._previous_level = self.level
+        self.level = level
+        self.changes += 1
+        self._cooldown_until = now + QUALITY_COOLDOWN_S
+        q = self.ladder[level]
+        telemetry.info('quality.level', "Calidad {level}/{last}: cámara {width}x{height}, pirámide {levels}, "
+                       "detección cada {stride} frames (p{pct} {ms:.1f} ms, objetivo {target:.1f} ms)",
+                       level=level, last=len(self.ladder) - 1, width=q.cam_size[0], height=q.cam_size[1],
+                       levels=q.pyramid_levels, stride=q.stride, pct=self.percentile, ms=frame_ms,
+                       target=self.target_ms)
+        return q
+
+    def get_stats(self):
+        return {'level': self.level, 'last': len(self.ladder) - 1, 'changes': self.changes}
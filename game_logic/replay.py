@@ -0,0 +1,131 @@
+# game_logic/replay.py
+"""
+Repetición determinista y sin cabeza del motor: sin cámara, sin ventana y sin esperar al reloj.
+Cada tick aplica una posición X grabada del jugador y avanza un paso fijo de simulación;
+la huella de estado por tick permite detectar en qué tick diverge un cambio.
+
+Uso (desde la raíz del repositorio):
+    python -m game_logic.replay --ticks 20000 --seed 0 --save-hashes base.txt
+    python -m game_logic.replay --ticks 20000 --seed 0 --compare base.txt
+    python -m game_logic.replay --positions sesion.npy --seed 3
+"""
+
+import argparse
+import os
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import numpy as np
+
+from .settings import SCREEN_WIDTH, SIM_HZ
+
+
+def load_positions(path):
+    """
+    Carga las posiciones X por tick: .npy, texto (una por línea) o los ticks de una sesión
+    grabada (<prefijo>.ticks.npy de SessionRecorder; solo los ticks de partida).
+    NaN (o un valor negativo) significa que la cámara no detectó el marcador en ese tick.
+    """
+    if path.endswith('.npy'):
+        positions = np.load(path)
+        if positions.dtype.names and 'player_x' in positions.dtype.names:
+            positions = positions['player_x'][positions['playing'] != 0]
+    else:
+        positions = np.loadtxt(path, dtype=np.float64, ndmin=1)
+    positions = np.asarray(positions, dtype=np.float64).ravel()
+    positions[positions < 0] = np.nan
+    return positions
+
+
+def synthetic_positions(ticks, seed=0):
+    """Barrido suave de lado a lado con ruido y algunas pérdidas del marcador (reproducible)."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(ticks) / SIM_HZ
+    positions = SCREEN_WIDTH / 2 + SCREEN_WIDTH / 2.2 * np.sin(t * 1.7) * np.cos(t * 0.23)
+    positions += rng.normal(0.0, 4.0, ticks)
+    positions[rng.random(ticks) < 0.02] = np.nan
+    return positions
+
+
+def run_replay(positions, seed=0, restart_on_game_over=True):
+    """
+    Ejecuta la simulación sobre `positions` (una por tick) lo más rápido posible.
+    Retorna (huellas por tick, resumen con ticks, segundos, ticks/s, puntuación y game overs).
+    """
+    from .game_engine import GameEngine
+
+    engine = GameEngine(headless=True, seed=seed)
+    engine.menu.start_game()
+
+    hashes = []
+    game_overs = 0
+    start = time.perf_counter()
+    for x in positions:
+        if not engine.menu.is_playing():
+            if not restart_on_game_over:
+                break
+            game_overs += 1
+            engine.menu.restart_game()
+
+        engine.player.set_position_from_camera(None if np.isnan(x) else int(x))
+        engine._simulation_step()
+        hashes.append(engine.state_hash())
+    elapsed = time.perf_counter() - start
+
+    summary = {
+        'ticks': len(hashes),
+        'seconds': elapsed,
+        'ticks_per_second': len(hashes) / elapsed if elapsed > 0 else float('inf'),
+        'score': engine.score,
+        'game_overs': game_overs,
+    }
+    return hashes, summary
+
+
+def first_divergence(hashes, baseline):
+    """Índice del primer tick distinto (o donde una secuencia termina antes), o None si coinciden."""
+    for tick, (current, expected) in enumerate(zip(hashes, baseline)):
+        if current != expected:
+            return tick
+    if len(hashes) != len(baseline):
+        return min(len(hashes), len(baseline))
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Repetición determinista del motor sin cámara ni ventana.")
+    parser.add_argument('--positions', help="Posiciones X por tick (.npy o texto); por defecto, sintéticas")
+    parser.add_argument('--ticks', type=int, default=10000, help="Ticks sintéticos si no se da --positions")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--save-hashes', help="Guarda la huella de cada tick (una por línea)")
+    parser.add_argument('--compare', help="Compara con huellas guardadas y muestra el primer tick distinto")
+    args = parser.parse_args()
+
+    if args.positions:
+        positions = load_positions(args.positions)
+    else:
+        positions = synthetic_positions(args.ticks, args.seed)
+
+    hashes, summary = run_replay(positions, seed=args.seed)
+    print(f"{summary['ticks']} ticks en {summary['seconds']:.2f} s "
+          f"({summary['ticks_per_second']:.0f} ticks/s), puntuación {summary['score']}, "
+          f"game overs {summary['game_overs']}, huella final {hashes[-1] if hashes else '-'}")
+
+    if args.save_hashes:
+        with open(args.save_hashes, 'w') as f:
+            f.write('\n'.join(hashes) + '\n')
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = f.read().split()
+        tick = first_divergence(hashes, baseline)
+        if tick is None:
+            print(f"Sin divergencias respecto a {args.compare}")
+        else:
+            print(f"Divergencia en el tick {tick}")
+            raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
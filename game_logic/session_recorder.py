@@ -0,0 +1,212 @@
+# game_logic/session_recorder.py
+
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+from .settings import (
+    RECORDER_PATH_PREFIX, RECORDER_MAX_FRAMES, RECORDER_MAX_TICKS, RECORDER_CLOSE_TIMEOUT_S, SIM_HZ
+)
+from .telemetry import telemetry
+
+# Una fila por tick de simulación en <prefijo>.ticks.npy
+TICK_DTYPE = np.dtype([
+    ('tick', '<u4'),
+    ('sim_time_ms', '<f8'),
+    ('playing', 'u1'),
+    ('player_x', '<i4'),
+    ('rng', '<i8'),  # Huella del estado del generador de enemigos (hash de getstate())
+])
+
+
+def _shrink_npy(path, count):
+    """
+    Deja un .npy preasignado con solo sus `count` primeras filas: reescribe la forma en la
+    cabecera (mismo tamaño, rellena con espacios) y recorta el archivo. Así el resultado es
+    un .npy normal que np.load lee sin ningún índice.
+    Retorna False si el sistema no permite recortarlo (p. ej. Windows con el archivo aún
+    mapeado): queda con su capacidad y los huecos sin grabar tienen momento 0.
+    """
+    try:
+        _rewrite_npy_rows(path, count)
+    except OSError as error:
+        telemetry.warning('recorder.close', "No se pudo recortar {path}: {error}", path=path, error=error)
+        return False
+    return True
+
+
+def _rewrite_npy_rows(path, count):
+    with open(path, 'r+b') as f:
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+        data_offset = f.tell()
+        header_start = 10 if version == (1, 0) else 12  # Magia (6) + versión (2) + longitud (2 o 4)
+
+        new_shape = (count,) + tuple(shape[1:])
+        header = repr({'descr': np.lib.format.dtype_to_descr(dtype), 'fortran_order': fortran_order,
+                       'shape': new_shape})
+        header = header.ljust(data_offset - header_start - 1) + '\n'
+        f.seek(header_start)
+        f.write(header.encode('latin1'))
+
+        row_bytes = dtype.itemsize * int(np.prod(shape[1:], dtype=np.int64))
+        f.truncate(data_offset + count * row_bytes)
+
+
+class FrameRecorder:
+    """
+    Frames volteados y sus momentos de captura en dos .npy preasignados y mapeados en memoria:
+        <prefijo>.frames.npy   (capacidad, alto, ancho, 3) uint8
+        <prefijo>.times.npy    (capacidad,) float64 (perf_counter)
+
+    El hilo de captura escribe cada frame directamente en `slot()` (el volteo usa esa vista del
+    archivo como destino) y la publica tal cual en el buzón: grabar no añade copias. Al cerrar,
+    los archivos se recortan a los frames grabados y quedan listos para RawFileSource.
+
+    Mientras su hilo de captura (`writer`) esté vivo solo él debe cerrarlo: slot() entrega una
+    vista del archivo que se escribe fuera del cerrojo, y recortarlo a la vez sería un SIGBUS.
+    """
+
+    def __init__(self, path_prefix, width, height, capacity=RECORDER_MAX_FRAMES):
+        self.frames_path = f"{path_prefix}.frames.npy"
+        self.times_path = f"{path_prefix}.times.npy"
+        self.width = width
+        self.height = height
+        self.capacity = capacity
+        self.count = 0
+        # El archivo se crea disperso: solo ocupa disco lo que se escribe
+        self.frames = np.lib.format.open_memmap(self.frames_path, mode='w+', dtype=np.uint8,
+                                                shape=(capacity, height, width, 3))
+        self.times = np.lib.format.open_memmap(self.times_path, mode='w+', dtype=np.float64,
+                                               shape=(capacity,))
+        self._lock = threading.Lock()  # close() lo pueden llamar el hilo de captura y SessionRecorder
+        self.closed = False
+        self.writer = None  # Hilo de captura que escribe los frames (lo asigna CaptureThread)
+
+    def slot(self):
+        """Vista (escribible) del siguiente frame dentro del archivo, o None si está lleno o cerrado."""
+        with self._lock:
+            if self.closed or self.count >= self.capacity:
+                return None
+            return self.frames[self.count]
+
+    def commit(self, timestamp):
+        """Da por grabado el frame escrito en slot(). Retorna False si el archivo ya se cerró."""
+        with self._lock:
+            if self.closed:
+                return False
+            self.times[self.count] = timestamp
+            self.count += 1
+            return True
+
+    def owns(self, buffer):
+        """True si `buffer` es una vista del archivo de frames."""
+        return np.may_share_memory(buffer, self.frames)
+
+    def close(self):
+        """Vuelca y recorta los archivos (o los borra si no se grabó nada). Idempotente."""
+        with self._lock:
+            if self.closed:
+                return
+            self.closed = True
+            # Las vistas que sigan en el buzón mantienen vivo el mapeo; se conserva la referencia
+            # para owns() y el recorte solo quita filas que nadie ha escrito
+            self.frames.flush()
+            self.times.flush()
+            self.times = None
+            for path in (self.frames_path, self.times_path):
+                if self.count:
+                    _shrink_npy(path, self.count)
+                else:
+                    os.remove(path)
+
+    def describe(self):
+        return {'frames': os.path.basename(self.frames_path), 'times': os.path.basename(self.times_path),
+                'count': self.count, 'width': self.width, 'height': self.height}
+
+
+class SessionRecorder:
+    """
+    Graba una sesión de juego para repetirla o ajustar la detección después:
+        <prefijo>.frames.npy / .times.npy   frames de la cámara (FrameRecorder; uno por
+                                             resolución: <prefijo>-1, -2... tras cada cambio)
+        <prefijo>.ticks.npy                 X del jugador y huella del generador por tick
+        <prefijo>.index.json                semilla, SIM_HZ y archivos con su número de filas
+    Todo se escribe en archivos preasignados y mapeados en memoria (sin E/S explícita en el
+    bucle); el índice se escribe al cerrar.
+    """
+
+    def __init__(self, path_prefix=RECORDER_PATH_PREFIX, seed=None,
+                 max_frames=RECORDER_MAX_FRAMES, max_ticks=RECORDER_MAX_TICKS):
+        self.prefix = f"{path_prefix}-{time.strftime('%Y%m%d-%H%M%S')}"
+        directory = os.path.dirname(self.prefix)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.seed = seed
+        self.max_frames = max_frames
+        self.segments = []
+
+        self.ticks_path = f"{self.prefix}.ticks.npy"
+        self.ticks = np.lib.format.open_memmap(self.ticks_path, mode='w+', dtype=TICK_DTYPE,
+                                               shape=(max_ticks,))
+        self.tick_count = 0
+        self.closed = False
+
+    def frame_recorder(self, width, height):
+        """FrameRecorder para una captura nueva (cada resolución va en su propio archivo)."""
+        n = len(self.segments)
+        prefix = self.prefix if n == 0 else f"{self.prefix}-{n}"
+        recorder = FrameRecorder(prefix, width, height, self.max_frames)
+        self.segments.append(recorder)
+        return recorder
+
+    def record_tick(self, tick, sim_time_ms, playing, player_x, rng_fingerprint):
+        """Escribe la fila del tick en el archivo mapeado (se ignora si ya está lleno)."""
+        i = self.tick_count
+        if i >= len(self.ticks):
+            return
+        self.ticks[i] = (tick, sim_time_ms, playing, player_x, rng_fingerprint)
+        self.tick_count = i + 1
+
+    def close(self):
+        """Cierra los archivos y escribe el índice. Llamar después de detener la captura."""
+        if self.closed:
+            return
+        self.closed = True
+
+        self.ticks.flush()
+        self.ticks = None
+        _shrink_npy(self.ticks_path, self.tick_count)
+
+        for recorder in self.segments:
+            writer = recorder.writer
+            if writer is not None and writer.is_alive():
+                # Las capturas ya están detenidas (o se les pidió): el hilo cierra su archivo al salir
+                writer.join(RECORDER_CLOSE_TIMEOUT_S)
+            if writer is not None and writer.is_alive():
+                telemetry.warning('recorder.close', "El hilo de captura de {frames} sigue vivo; "
+                                  "cerrará el archivo al terminar", frames=recorder.frames_path)
+                continue
+            recorder.close()
+
+        index_path = f"{self.prefix}.index.json"
+        index = {
+            'seed': self.seed,
+            'sim_hz': SIM_HZ,
+            'ticks': {'file': os.path.basename(self.ticks_path), 'count': self.tick_count},
+            'segments': [recorder.describe() for recorder in self.segments if recorder.count],
+        }
+        with open(index_path, 'w') as f:
+            json.dump(index, f, indent=2)
+
+        frames = sum(recorder.count for recorder in self.segments)
+        telemetry.info('recorder.stats', "Sesión grabada en {index}: {frames} frames, {ticks} ticks",
+                       index=index_path, frames=frames, ticks=self.tick_count)
+        return index_path
@@ -1,13 +1,16 @@
 # game_logic/settings.py
 
+import sys
+
 import pygame
 
 # -----------------------------------------------------------------
 # 1. CONFIGURACIÓN INICIAL DE DIMENSIONES (SCREEN & CAMERA)
 # -----------------------------------------------------------------
 
-# 1.1. Inicialización para obtener datos del monitor
-pygame.init()
+# 1.1. Datos del monitor: solo se inicia el subsistema de video (pygame.init() también
+# arrancaría audio, joystick, etc.; GameEngine inicia lo que necesita más tarde).
+pygame.display.init()
 info = pygame.display.Info()
 
 # 1.2. Dimensiones Iniciales (Usadas para Pygame en el primer arranque)
@@ -48,12 +51,40 @@ CAM_OPTIONS = {
         # Pantalla 4:3 (1.33), se mapea a la cámara SD (4:3) para proporción y rendimiento.
         CAM_RES_SD if MONITOR_NATIVE_WIDTH / MONITOR_NATIVE_HEIGHT > 1.0 else CAM_RES_HD
 }
+
+# Niveles de pirámide (pyrDown) para la detección por cada entrada de CAM_OPTIONS:
+# 0 = resolución completa, 1 = mitad, 2 = cuarto. El centro se refina siempre a resolución completa.
+CAM_DETECTION_LEVELS = {
+    (MONITOR_NATIVE_WIDTH, MONITOR_NATIVE_HEIGHT):
+        2 if CAM_OPTIONS[(MONITOR_NATIVE_WIDTH, MONITOR_NATIVE_HEIGHT)] == CAM_RES_HD else 1,
+
+    (800, 600):
+        2 if CAM_OPTIONS[(800, 600)] == CAM_RES_HD else 1
+}
+CAM_BASE_DETECTION_LEVELS = 1 # Valor para resoluciones que no estén en CAM_DETECTION_LEVELS
     
 
 # -----------------------------------------------------------------
 # 2. CONFIGURACIÓN DEL JUEGO (Pygame)
 # -----------------------------------------------------------------
-FPS = 100 
+FPS = 100 # Límite de frames dibujados por segundo (captura + ventana)
+
+# BUCLE PRINCIPAL: "loop" (secuencial) o "asyncio" (ver async_runner.py: captura, detección,
+# simulación y ventana como tareas con su propio ritmo, comunicadas por colas acotadas)
+ENGINE_RUNNER = "loop"
+ASYNC_CAPTURE_HZ = 200          # Consultas por segundo al buzón de la captura (no bloquean)
+ASYNC_EVENTS_HZ = 60            # Lecturas por segundo de los eventos de Pygame
+ASYNC_PRESENT_HZ = FPS          # Límite de frames mostrados por segundo
+ASYNC_DETECTION_QUEUE = 1       # Frames esperando a la detección (los más viejos se descartan)
+ASYNC_SHUTDOWN_TIMEOUT_S = 2.0  # Espera máxima a las tareas y ejecutores al salir
+
+# SIMULACIÓN DE PASO FIJO (independiente de la cámara y del dibujo)
+SIM_HZ = 100                    # Ticks de simulación por segundo
+SIM_MAX_CATCHUP_STEPS = 5       # Máximo de ticks por frame; el retraso restante se descarta
+SIM_RENDER_INTERPOLATION = True # Dibuja las entidades interpoladas entre los dos últimos ticks
+# Las velocidades (*_SPEED) están en px por tick a SPEED_REFERENCE_HZ; se escalan a SIM_HZ
+SPEED_REFERENCE_HZ = 100
+SIM_SPEED_SCALE = SPEED_REFERENCE_HZ / SIM_HZ
 
 # COLORES (Pygame)
 BLACK = (0, 0, 0)
@@ -79,11 +110,20 @@ ENEMY_SHOOT_DELAY = 3500
 BULLET_SPEED = 10       
 BULLET_PLAYER_COOLDOWN = 500 
 BULLET_DAMAGE_ENEMY = 30 
+BULLET_POOL_SIZE = 32        # Máximo de balas del jugador vivas a la vez (pool de reutilización)
+ENEMY_BULLET_POOL_SIZE = 64  # Máximo de balas enemigas vivas a la vez
 
 # DAÑOS DE COLISIÓN
 PLAYER_ENEMY_COLLISION_DAMAGE = 25 
 PLAYER_ENEMY_BULLET_DAMAGE = 10    
 
+# ALMACÉN DE ENTIDADES (balas y enemigos en columnas de NumPy)
+ENTITY_STORE_CAPACITY = 256 # Filas iniciales; se duplica si hace falta
+
+# BROADPHASE DE COLISIONES (rejilla uniforme)
+COLLISION_GRID_CELL_SIZE = 64   # Lado de la celda en px de pantalla (>= tamaño de un enemigo)
+COLLISION_GRID_MIN_PAIRS = 50000 # Pares posibles (balas x enemigos) a partir de los que se usa la rejilla (ver bench_collisions)
+
 
 # 4. CONFIGURACIÓN DE VISIÓN POR COMPUTADORA (CV)
 # RANGO ROJO (Doble Rango necesario para el color rojo)
@@ -94,5 +134,109 @@ RED_UPPER_H1 = (10, 255, 255)
 RED_LOWER_H2 = (170, 100, 100) 
 RED_UPPER_H2 = (180, 255, 255)
 
+# Lista de rangos HSV que forman la máscara del marcador
+RED_HSV_RANGES = (
+    (RED_LOWER_H1, RED_UPPER_H1),
+    (RED_LOWER_H2, RED_UPPER_H2),
+)
+
+# Otros colores de marcador disponibles para el modo multimarcador
+BLUE_HSV_RANGES = (((100, 150, 80), (130, 255, 255)),)
+GREEN_HSV_RANGES = (((45, 120, 80), (80, 255, 255)),)
+
+# Clasificación por tabla precalculada (BGR565 -> máscara) en lugar de cvtColor + inRange
+CV_USE_COLOR_LUT = True
+
+# Área mínima (px de cámara) para aceptar un contorno como marcador
+CV_MIN_CONTOUR_AREA = 100
+
+# MODO MULTIMARCADOR (ver MultiMarkerDetector en detection.py)
+# Una sola pasada por frame: clasificación de color + componentes conectadas por color.
+# El jugador sigue al marcador más grande del primer color; el resto queda en CameraHandler.markers.
+CV_MULTI_MARKER = False
+CV_MAX_MARKERS = 2              # Marcadores por color como mucho (los de mayor área)
+CV_MARKER_COLORS = (            # (nombre, rangos HSV); se pueden añadir BLUE/GREEN_HSV_RANGES
+    ("rojo", RED_HSV_RANGES),
+)
+
+# SEGUIMIENTO POR REGIÓN DE INTERÉS (ROI)
+# Busca solo en una ventana alrededor del último centro; si lo pierde, vuelve al frame completo.
+CV_ROI_TRACKING = True
+CV_ROI_MIN_HALF_SIZE = 60   # Semi-ancho mínimo de la ventana (px de cámara)
+CV_ROI_BLOB_MARGIN = 1.5    # Margen sobre el tamaño del último blob
+CV_ROI_MOTION_GAIN = 3.0    # Px extra de ventana por px de movimiento reciente
+
 # CONFIGURACIÓN DE SUAVIZADO 
-SMOOTHING_ALPHA = 0.1
\ No newline at end of file
+SMOOTHING_ALPHA = 0.1  # Peso de la medición nueva en el filtro "ema"
+
+# FILTRO Y PREDICCIÓN DE LA POSICIÓN DEL JUGADOR (entre la detección y el jugador)
+MOTION_FILTER = "one_euro"        # "none", "ema", "one_euro" o "kalman"
+MOTION_PREDICTION_LEAD_S = 0.0    # Adelanto extra sobre el momento de dibujo (latencia de la pantalla)
+MOTION_MAX_EXTRAPOLATION_S = 0.1  # Máximo que se extrapola desde la última medición
+MOTION_DROPOUT_FILL_S = 0.25      # Tiempo que se sigue prediciendo si se pierde el marcador
+ONE_EURO_MIN_CUTOFF = 1.0         # Hz: suavizado en reposo (menor = más suave)
+ONE_EURO_BETA = 0.02              # Subida del corte con la velocidad (mayor = menos retraso)
+ONE_EURO_D_CUTOFF = 1.0           # Hz: suavizado de la velocidad estimada
+KALMAN_ACCEL_NOISE = 1000.0       # px/s²: cuánto puede cambiar la velocidad
+KALMAN_MEASUREMENT_NOISE = 4.0    # px: ruido de la detección
+
+# CAPTURA EN SEGUNDO PLANO
+CAM_DEVICE_INDEX = 0  # Índice de dispositivo para cv2.VideoCapture
+CAM_SWAP_TIMEOUT_S = 5.0  # Espera máxima al primer frame de la captura nueva al cambiar de resolución
+
+# FUENTE DE FRAMES (ver frame_source.py)
+# "webcam", "video" (archivo de vídeo), "synthetic" (escena generada) o "raw" (.npy sin comprimir)
+FRAME_SOURCE = "webcam"
+FRAME_SOURCE_PATH = None        # Archivo de las fuentes "video" y "raw"
+FRAME_SOURCE_FPS = None         # Ritmo de las fuentes sin cámara (None = el propio de la fuente, 0 = sin límite)
+FRAME_SOURCE_LOOP = True        # Volver al principio al terminar el archivo
+SYNTHETIC_SCENARIO = "blob"     # Escenario de SyntheticScene para la fuente "synthetic"
+
+# REGULADOR DE CALIDAD (ver quality_governor.py)
+# Baja la escala de la detección, la resolución de captura o la frecuencia de la detección
+# cuando el tiempo de trabajo por frame supera el objetivo, y las recupera si sobra margen.
+QUALITY_GOVERNOR_ENABLED = True
+QUALITY_TARGET_FRAME_MS = 1000 / FPS  # Tiempo de trabajo por frame (sin la espera del reloj)
+QUALITY_WINDOW_FRAMES = 60      # Frames por decisión
+QUALITY_PERCENTILE = 90         # Percentil del tiempo de frame que se compara con el objetivo
+QUALITY_DOWN_RATIO = 1.0        # Bajar si el percentil supera objetivo * este factor
+QUALITY_UP_RATIO = 0.6          # Subir si se mantiene por debajo de objetivo * este factor...
+QUALITY_UP_HOLD_S = 5.0         # ...durante este tiempo (se duplica por cada fallo del escalón)
+QUALITY_UP_HOLD_MAX_S = 80.0
+QUALITY_COOLDOWN_S = 2.0        # Sin decisiones tras un cambio
+QUALITY_MAX_STRIDE = 3          # Como mucho, detectar uno de cada N frames nuevos
+
+# GRABACIÓN DE SESIONES (ver session_recorder.py)
+# Frames de la cámara y X del jugador por tick en archivos .npy mapeados en memoria;
+# <prefijo>.frames.npy sirve directamente como FRAME_SOURCE_PATH de la fuente "raw".
+RECORDER_ENABLED = False
+RECORDER_PATH_PREFIX = "sessions/session"  # Se le añade la fecha y hora de inicio
+RECORDER_MAX_FRAMES = 9000      # Frames por archivo (~5 min a 30 fps; el archivo se crea disperso)
+RECORDER_MAX_TICKS = 60000      # Ticks de simulación (~10 min a SIM_HZ = 100)
+RECORDER_CLOSE_TIMEOUT_S = 1.0  # Espera al cerrar a que cada hilo de captura cierre su archivo
+
+# DETECCIÓN EN UN PROCESO SEPARADO (opcional)
+# Los frames se pasan por un anillo de búferes en memoria compartida.
+CV_DETECTION_WORKER = False
+CV_WORKER_RING_SLOTS = 3
+
+# VENTANA EN UN HILO PROPIO (ver presenter.py)
+# imshow/waitKey corren en un hilo dedicado; el bucle solo deja el frame compuesto en un buzón
+# y lee las teclas de una cola. En macOS HighGUI solo funciona desde el hilo principal.
+CV_PRESENTER_THREAD = sys.platform != "darwin"
+PRESENTER_IDLE_POLL_S = 0.01    # Sin frames nuevos, cada cuánto se atiende la ventana (teclas)
+PRESENTER_KEY_QUEUE = 32        # Teclas pendientes de leer por el bucle; si se llena se descartan
+
+# 5. INSTRUMENTACIÓN (tiempos por etapa del bucle principal)
+FRAME_TIMING_ENABLED = True             # Registrar la duración de cada etapa en búferes circulares
+FRAME_TIMING_WINDOW = 512               # Muestras por etapa (las más recientes)
+FRAME_TIMING_HUD = False                # Mostrar p50/p95/p99 sobre el frame (tecla 't' para alternar)
+FRAME_TIMING_HUD_REFRESH = 30           # Frames entre recálculos de los percentiles del HUD
+FRAME_TIMING_DUMP_PATH = "frame_timings" # Prefijo de los .csv/.json al salir (None = no volcar)
+
+# TELEMETRÍA (mensajes del juego escritos por un hilo en segundo plano)
+TELEMETRY_LEVEL = "INFO"          # DEBUG, INFO, WARNING o ERROR
+TELEMETRY_RATE_LIMIT_S = 0.0      # Intervalo mínimo por defecto entre mensajes con la misma clave (0 = sin límite)
+TELEMETRY_QUEUE_SIZE = 4096       # Registros pendientes; si se llena se descartan los más antiguos
+TELEMETRY_FLUSH_INTERVAL_S = 0.05 # Cada cuánto escribe el hilo en la terminal
+TELEMETRY_FORMAT = "text"         # "text" o "json" (una línea JSON por registro)
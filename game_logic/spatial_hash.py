@@ -0,0 +1,85 @@
+# game_logic/spatial_hash.py
+
+import numpy as np
+
+# Las celdas (cx, cy) se combinan en una sola clave entera: cy * _KEY_STRIDE + cx
+_KEY_STRIDE = 1 << 20
+
+
+def _covered_cells(x, y, w, h, cell_size):
+    """
+    Expande cada rectángulo a las celdas de la rejilla que cubre.
+    Retorna (claves de celda, índice del rectángulo dueño) con una entrada por par celda-rectángulo.
+    """
+    cx0 = np.floor_divide(x, cell_size).astype(np.int64)
+    cy0 = np.floor_divide(y, cell_size).astype(np.int64)
+    # Conservador: el borde derecho/inferior puede sumar una celda de más (solo añade candidatos)
+    cx1 = np.floor_divide(x + w, cell_size).astype(np.int64)
+    cy1 = np.floor_divide(y + h, cell_size).astype(np.int64)
+
+    nx = cx1 - cx0 + 1
+    counts = nx * (cy1 - cy0 + 1)
+
+    owner = np.repeat(np.arange(len(x)), counts)
+    local = np.arange(len(owner)) - np.repeat(np.cumsum(counts) - counts, counts)
+
+    cell_x = cx0[owner] + local % nx[owner]
+    cell_y = cy0[owner] + local // nx[owner]
+    return cell_y * _KEY_STRIDE + cell_x, owner
+
+
+class SpatialHash:
+    """
+    Broadphase de rejilla uniforme, reconstruida de forma vectorizada en cada tick.
+    build() indexa un conjunto de rectángulos (p. ej. los enemigos) por celda y
+    query_pairs() devuelve los pares candidatos que comparten al menos una celda con
+    otro conjunto (p. ej. las balas). La prueba exacta de rectángulos se hace después,
+    solo sobre esos candidatos.
+    """
+
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self._cell_keys = np.empty(0, dtype=np.int64)  # Claves de celda ocupadas (ordenadas)
+        self._cell_start = np.empty(0, dtype=np.int64)
+        self._cell_count = np.empty(0, dtype=np.int64)
+        self._members = np.empty(0, dtype=np.int64)    # Rectángulos agrupados por celda
+        self._size = 0                                  # Número de rectángulos indexados
+
+    def build(self, x, y, w, h):
+        """Indexa los rectángulos (arrays de igual longitud) en la rejilla."""
+        self._size = len(x)
+        keys, owner = _covered_cells(x, y, w, h, self.cell_size)
+
+        order = np.argsort(keys, kind='stable')
+        keys = keys[order]
+        self._members = owner[order]
+
+        self._cell_keys, self._cell_start, self._cell_count = np.unique(
+            keys, return_index=True, return_counts=True)
+
+    def query_pairs(self, x, y, w, h):
+        """
+        Retorna (índices en la consulta, índices en lo indexado) de los pares que comparten celda.
+        Cada par aparece una sola vez aunque compartan varias celdas.
+        """
+        empty = np.empty(0, dtype=np.int64)
+        if len(self._cell_keys) == 0 or len(x) == 0:
+            return empty, empty
+
+        keys, owner = _covered_cells(x, y, w, h, self.cell_size)
+
+        slot = np.searchsorted(self._cell_keys, keys)
+        slot[slot == len(self._cell_keys)] = 0
+        found = self._cell_keys[slot] == keys
+        if not found.any():
+            return empty, empty
+
+        slot = slot[found]
+        counts = self._cell_count[slot]
+        query = np.repeat(owner[found], counts)
+        offsets = np.arange(len(query)) - np.repeat(np.cumsum(counts) - counts, counts)
+        indexed = self._members[np.repeat(self._cell_start[slot], counts) + offsets]
+
+        # Quitar pares repetidos (rectángulos que comparten más de una celda)
+        pair_codes = np.unique(query * self._size + indexed)
+        return pair_codes // self._size, pair_codes % self._size
@@ -0,0 +1,89 @@
+# game_logic/synthetic_frames.py
+
+import cv2
+import numpy as np
+
+# Color BGR del marcador y de los distractores (rojo saturado, dentro de RED_HSV_RANGES)
+MARKER_BGR = (20, 20, 220)
+
+
+class SyntheticScene:
+    """
+    Generador reproducible de frames BGR con verdad conocida, para medir y probar la detección
+    sin cámara. Escenarios:
+        'blob'         marcador rojo que se mueve de lado a lado sobre un fondo suave
+        'ruido'        lo mismo con ruido fuerte distinto en cada frame
+        'distractores' el marcador más varias manchas rojas pequeñas fijas (gana el blob mayor)
+        'vacio'        solo fondo y ruido: no hay marcador
+    render(i) dibuja el frame i en un búfer propio (o en `out`) y retorna (frame, centro X real o None).
+    """
+
+    SCENARIOS = ('blob', 'ruido', 'distractores', 'vacio')
+
+    NOISE_LAYERS = 8  # Capas de ruido precalculadas que se alternan por frame
+
+    def __init__(self, width, height, scenario='blob', seed=0, period=240):
+        if scenario not in self.SCENARIOS:
+            raise ValueError(f"Escenario desconocido: {scenario}")
+
+        self.width = width
+        self.height = height
+        self.scenario = scenario
+        self.period = period  # Frames de un barrido completo (ida y vuelta)
+        self.radius = max(8, height // 12)
+
+        rng = np.random.default_rng(seed)
+
+        # 1. Fondo suave y poco saturado (no debe pasar por rojo)
+        noise = rng.integers(40, 120, (height, width, 3), dtype=np.uint8)
+        self.background = cv2.GaussianBlur(noise, (0, 0), max(4, height // 30))
+
+        # 2. Ruido por frame (solo en 'ruido' y 'vacio')
+        self.noise_layers = []
+        if scenario in ('ruido', 'vacio'):
+            self.noise_layers = [rng.integers(0, 40, (height, width, 3), dtype=np.uint8)
+                                 for _ in range(self.NOISE_LAYERS)]
+
+        # 3. Distractores: manchas rojas fijas, bastante más pequeñas que el marcador y
+        # fuera de la franja por la que se mueve (arriba o abajo), para no fusionarse con él
+        self.distractors = []
+        if scenario == 'distractores':
+            small = max(3, self.radius // 3)
+            band = height // 3 - self.radius - small - 2
+            for i in range(6):
+                y = int(rng.integers(small, small + band))
+                if i % 2:
+                    y = height - 1 - y
+                self.distractors.append((int(rng.integers(small, width - small)), y, small))
+
+        self._frame = np.empty((height, width, 3), dtype=np.uint8)
+
+    def marker_center(self, index):
+        """Centro (x, y) del marcador en el frame `index`, o None si el escenario no lo tiene."""
+        if self.scenario == 'vacio':
+            return None
+        # Onda triangular entre los márgenes: sin saltos al volver a empezar
+        phase = (index % self.period) / self.period
+        travel = 1.0 - abs(2.0 * phase - 1.0)
+        margin = self.radius + 2
+        x = margin + travel * (self.width - 2 * margin)
+        y = self.height / 2 + self.height / 6 * np.sin(2 * np.pi * phase)
+        return int(round(x)), int(round(y))
+
+    def render(self, index, out=None):
+        """Dibuja el frame `index` y retorna (frame, centro X real del marcador o None)."""
+        frame = self._frame if out is None else out
+        np.copyto(frame, self.background)
+
+        if self.noise_layers:
+            cv2.add(frame, self.noise_layers[index % len(self.noise_layers)], dst=frame)
+
+        for x, y, r in self.distractors:
+            cv2.circle(frame, (x, y), r, MARKER_BGR, -1)
+
+        center = self.marker_center(index)
+        if center is None:
+            return frame, None
+
+        cv2.circle(frame, center, self.radius, MARKER_BGR, -1)
+        return frame, center[0]
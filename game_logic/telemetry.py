@@ -0,0 +1,185 @@
+# game_logic/telemetry.py
+
+import atexit
+import json
+import sys
+import threading
+import time
+from collections import deque
+
+from .settings import (
+    TELEMETRY_LEVEL, TELEMETRY_RATE_LIMIT_S, TELEMETRY_QUEUE_SIZE,
+    TELEMETRY_FLUSH_INTERVAL_S, TELEMETRY_FORMAT
+)
+
+# Niveles (mismos valores que el módulo logging)
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+
+LEVEL_NAMES = {DEBUG: 'DEBUG', INFO: 'INFO', WARNING: 'WARNING', ERROR: 'ERROR'}
+LEVELS = {name: level for level, name in LEVEL_NAMES.items()}
+
+
+class Telemetry:
+    """
+    Canal de mensajes del juego que nunca bloquea el bucle principal.
+    emit() solo filtra por nivel y por frecuencia y encola el registro
+    (momento, nivel, clave, plantilla, campos); el formateo y la escritura en la terminal
+    los hace un hilo en segundo plano, en lotes.
+
+    - Cada mensaje tiene una clave (p. ej. 'menu.state'). Con `every` > 0 la clave se emite
+      como mucho una vez por intervalo y el siguiente registro indica cuántos se suprimieron.
+    - La cola es acotada: si el escritor no da abasto se descartan los registros más antiguos.
+    - Formato 'text' (una línea legible) o 'json' (una línea JSON por registro).
+    """
+
+    def __init__(self, level=INFO, rate_limit=0.0, queue_size=4096,
+                 flush_interval=0.05, fmt='text', stream=None):
+        self.level = level
+        self.rate_limit = rate_limit  # Intervalo mínimo por defecto entre mensajes con la misma clave (s)
+        self.flush_interval = flush_interval
+        self.fmt = fmt
+        self.stream = stream
+
+        self._queue = deque(maxlen=queue_size)
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()  # Solo para arrancar el hilo una vez
+
+        self._last_emit = {}   # clave -> momento del último registro encolado
+        self._suppressed = {}  # clave -> registros suprimidos desde entonces
+        self._start_time = time.perf_counter()
+
+        # Métricas del canal
+        self.emitted = 0
+        self.suppressed = 0
+        self.dropped = 0
+
+    # ----------------------------------------------------
+    # EMISIÓN (hilo que llama, sin E/S)
+    # ----------------------------------------------------
+
+    def emit(self, level, key, template, /, every=None, **fields):
+        """
+        Encola `template.format(**fields)` con la clave `key` si supera el nivel y el
+        límite de frecuencia (`every` segundos; None = rate_limit del canal).
+        """
+        if level < self.level:
+            return
+
+        now = time.perf_counter()
+        interval = self.rate_limit if every is None else every
+        if interval > 0:
+            last = self._last_emit.get(key)
+            if last is not None and now - last < interval:
+                self._suppressed[key] = self._suppressed.get(key, 0) + 1
+                self.suppressed += 1
+                return
+            self._last_emit[key] = now
+
+        skipped = self._suppressed.pop(key, 0)
+
+        if len(self._queue) == self._queue.maxlen:
+            self.dropped += 1
+        self._queue.append((now - self._start_time, level, key, template, fields, skipped))
+        self.emitted += 1
+
+        if self._thread is None:
+            self._start()
+
+    def debug(self, key, template, /, every=None, **fields):
+        self.emit(DEBUG, key, template, every, **fields)
+
+    def info(self, key, template, /, every=None, **fields):
+        self.emit(INFO, key, template, every, **fields)
+
+    def warning(self, key, template, /, every=None, **fields):
+        self.emit(WARNING, key, template, every, **fields)
+
+    def error(self, key, template, /, every=None, **fields):
+        self.emit(ERROR, key, template, every, **fields)
+
+    # ----------------------------------------------------
+    # ESCRITOR EN SEGUNDO PLANO
+    # ----------------------------------------------------
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="TelemetryWriter", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self._flush()
+        self._flush()
+
+    def _format(self, record):
+        elapsed, level, key, template, fields, skipped = record
+        try:
+            message = template.format(**fields)
+        except (KeyError, IndexError, ValueError) as error:
+            message = f"{template} (formato inválido: {error!r})"
+
+        if self.fmt == 'json':
+            entry = {'t': round(elapsed, 4), 'level': LEVEL_NAMES.get(level, level), 'key': key,
+                     'msg': message, **fields}
+            if skipped:
+                entry['suppressed'] = skipped
+            return json.dumps(entry, ensure_ascii=False, default=str)
+
+        line = f"[{elapsed:9.3f} {LEVEL_NAMES.get(level, level):<7} {key}] {message}"
+        if skipped:
+            line += f" (+{skipped} suprimidos)"
+        return line
+
+    def _flush(self):
+        """Escribe en un solo write() todo lo que haya en la cola."""
+        lines = []
+        while self._queue:
+            try:
+                lines.append(self._format(self._queue.popleft()))
+            except IndexError:
+                break
+        if not lines:
+            return
+
+        stream = self.stream or sys.stdout
+        try:
+            stream.write('\n'.join(lines) + '\n')
+            stream.flush()
+        except (OSError, ValueError):
+            pass  # Terminal cerrada: la telemetría nunca debe tumbar el juego
+
+    def flush(self):
+        """Pide al escritor que vacíe la cola ya (sin esperar)."""
+        self._wakeup.set()
+
+    def close(self, timeout=1.0):
+        """Detiene el escritor tras vaciar la cola. Se llama al salir del juego (y en atexit)."""
+        if self._thread is None:
+            self._flush()
+            return
+        self._stop.set()
+        self._wakeup.set()
+        self._thread.join(timeout)
+        self._flush()  # Registros encolados después de que el hilo terminara
+
+    def get_stats(self):
+        return {'emitted': self.emitted, 'suppressed': self.suppressed, 'dropped': self.dropped}
+
+
+# Canal compartido por todo el juego
+telemetry = Telemetry(
+    level=LEVELS.get(TELEMETRY_LEVEL, INFO),
+    rate_limit=TELEMETRY_RATE_LIMIT_S,
+    queue_size=TELEMETRY_QUEUE_SIZE,
+    flush_interval=TELEMETRY_FLUSH_INTERVAL_S,
+    fmt=TELEMETRY_FORMAT,
+)
+atexit.register(telemetry.close)